@@ -5,11 +5,13 @@ import re
 from datetime import datetime
 import os
 import configparser
+from adb_session import ADBShellSession
 
 class ADBCoupangRankChecker:
     def __init__(self):
         self.adb_path = "adb.exe"  # ADB 경로
         self.device_id = None
+        self.shell_session = None  # 디바이스 셸 명령용 장기 세션
         self.coupang_package = "com.coupang.mobile"
         self.config = self.load_config()
         
@@ -47,6 +49,16 @@ class ADBCoupangRankChecker:
         except Exception as e:
             return False, "", str(e)
     
+    def run_shell(self, command, timeout=30):
+        """디바이스 셸 명령 실행 (adb shell 프로세스를 계속 재사용)"""
+        if self.shell_session is None:
+            self.shell_session = ADBShellSession(self.adb_path, self.device_id, timeout=timeout)
+        
+        success, stdout, stderr = self.shell_session.run(command, timeout=timeout)
+        if not success:
+            print(f"ADB shell command failed: {command}: {stderr.strip()}")
+        return success, stdout, stderr
+    
     def check_device_connection(self):
         """디바이스 연결 확인"""
         print("Checking device connection...")
@@ -65,6 +77,9 @@ class ADBCoupangRankChecker:
                 devices.append(device_id)
         
         if devices:
+            if self.shell_session and self.device_id != devices[0]:
+                self.shell_session.close()
+                self.shell_session = None
             self.device_id = devices[0]
             print(f"Device connected: {self.device_id}")
             return True
@@ -75,7 +90,7 @@ class ADBCoupangRankChecker:
     def check_coupang_app(self):
         """쿠팡 앱 설치 확인"""
         print("Checking Coupang app...")
-        success, stdout, stderr = self.run_adb_command(f"shell pm list packages | findstr {self.coupang_package}")
+        success, stdout, stderr = self.run_shell(f"pm list packages | grep {self.coupang_package}")
         
         if success and self.coupang_package in stdout:
             print(f"Coupang app found: {self.coupang_package}")
@@ -87,7 +102,7 @@ class ADBCoupangRankChecker:
     def launch_coupang_app(self):
         """쿠팡 앱 실행"""
         print("Launching Coupang app...")
-        success, stdout, stderr = self.run_adb_command(f"shell monkey -p {self.coupang_package} -c android.intent.category.LAUNCHER 1")
+        success, stdout, stderr = self.run_shell(f"monkey -p {self.coupang_package} -c android.intent.category.LAUNCHER 1")
         
         if success:
             print("Coupang app launched successfully")
@@ -99,7 +114,7 @@ class ADBCoupangRankChecker:
     
     def get_screen_info(self):
         """화면 정보 가져오기"""
-        success, stdout, stderr = self.run_adb_command("shell wm size")
+        success, stdout, stderr = self.run_shell("wm size")
         if success:
             print(f"Screen size: {stdout.strip()}")
             return stdout.strip()
@@ -121,7 +136,7 @@ class ADBCoupangRankChecker:
     
     def tap_screen(self, x, y):
         """화면 탭"""
-        success, stdout, stderr = self.run_adb_command(f"shell input tap {x} {y}")
+        success, stdout, stderr = self.run_shell(f"input tap {x} {y}")
         if success:
             print(f"Tapped at ({x}, {y})")
             return True
@@ -131,7 +146,7 @@ class ADBCoupangRankChecker:
     
     def swipe_screen(self, x1, y1, x2, y2, duration=300):
         """화면 스와이프"""
-        success, stdout, stderr = self.run_adb_command(f"shell input swipe {x1} {y1} {x2} {y2} {duration}")
+        success, stdout, stderr = self.run_shell(f"input swipe {x1} {y1} {x2} {y2} {duration}")
         if success:
             print(f"Swiped from ({x1}, {y1}) to ({x2}, {y2})")
             return True
@@ -143,7 +158,7 @@ class ADBCoupangRankChecker:
         """텍스트 입력"""
         # 특수문자 이스케이프
         escaped_text = text.replace(' ', '%s').replace('&', '\\&')
-        success, stdout, stderr = self.run_adb_command(f'shell input text "{escaped_text}"')
+        success, stdout, stderr = self.run_shell(f'input text "{escaped_text}"')
         if success:
             print(f"Text input: {text}")
             return True
@@ -153,7 +168,7 @@ class ADBCoupangRankChecker:
     
     def press_back(self):
         """뒤로가기 버튼"""
-        success, stdout, stderr = self.run_adb_command("shell input keyevent KEYCODE_BACK")
+        success, stdout, stderr = self.run_shell("input keyevent KEYCODE_BACK")
         if success:
             print("Back button pressed")
             return True
@@ -163,7 +178,7 @@ class ADBCoupangRankChecker:
     
     def press_home(self):
         """홈 버튼"""
-        success, stdout, stderr = self.run_adb_command("shell input keyevent KEYCODE_HOME")
+        success, stdout, stderr = self.run_shell("input keyevent KEYCODE_HOME")
         if success:
             print("Home button pressed")
             return True
@@ -173,7 +188,7 @@ class ADBCoupangRankChecker:
     
     def get_current_activity(self):
         """현재 액티비티 정보"""
-        success, stdout, stderr = self.run_adb_command("shell dumpsys activity activities | grep mResumedActivity")
+        success, stdout, stderr = self.run_shell("dumpsys activity activities | grep mResumedActivity")
         if success:
             print(f"Current activity: {stdout.strip()}")
             return stdout.strip()
@@ -213,7 +228,7 @@ class ADBCoupangRankChecker:
             time.sleep(1)
             
             # 6. 검색 실행 (엔터키)
-            success, stdout, stderr = self.run_adb_command("shell input keyevent KEYCODE_ENTER")
+            success, stdout, stderr = self.run_shell("input keyevent KEYCODE_ENTER")
             time.sleep(3)
             
             # 7. 검색 결과 페이지 대기
@@ -333,7 +348,10 @@ class ADBCoupangRankChecker:
         """정리 작업"""
         print("Cleaning up...")
         # 앱 종료
-        self.run_adb_command(f"shell am force-stop {self.coupang_package}")
+        self.run_shell(f"am force-stop {self.coupang_package}")
+        if self.shell_session:
+            self.shell_session.close()
+            self.shell_session = None
         print("ADB rank checker closed")
 
 def main():
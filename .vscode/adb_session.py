@@ -0,0 +1,297 @@
+import re
+import subprocess
+import sys
+import threading
+import time
+import uuid
+
+
+class ADBShellSession:
+    """디바이스당 하나의 `adb shell` 프로세스를 띄워 두고 명령을 이어서 보내는 세션
+
+    명령마다 끝에 고유한 구분 문자열과 종료 코드를 출력하게 해서, 표준 출력에서
+    각 명령의 결과를 잘라낸다. 여러 명령은 run_many()로 한 번에 보내고
+    결과를 순서대로 받는다. 세션이 끊기거나 시간 초과되면 다음 명령에서 다시 연결한다.
+    """
+
+    def __init__(self, adb_path='adb', device_id=None, timeout=30, log=print):
+        self.adb_args = list(adb_path) if isinstance(adb_path, (list, tuple)) else [adb_path]
+        self.device_id = device_id
+        self.timeout = timeout
+        self.log = log
+
+        self.process = None
+        self.reader_thread = None
+        self.buffer = b''
+        self.buffer_cond = threading.Condition()
+        self.lock = threading.Lock()
+        self.token = uuid.uuid4().hex[:12]
+        self.counter = 0
+        self.command_count = 0
+
+    def start(self):
+        """adb shell 프로세스 시작"""
+        args = list(self.adb_args)
+        if self.device_id:
+            args += ['-s', self.device_id]
+        args.append('shell')
+
+        self.process = subprocess.Popen(
+            args,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            bufsize=0
+        )
+        self.buffer = b''
+        self.reader_thread = threading.Thread(target=self._read_loop, args=(self.process,), daemon=True)
+        self.reader_thread.start()
+
+    def _read_loop(self, process):
+        """표준 출력을 계속 읽어 버퍼에 쌓음"""
+        while True:
+            chunk = process.stdout.read1(65536) if hasattr(process.stdout, 'read1') else process.stdout.read(4096)
+            with self.buffer_cond:
+                if not chunk:
+                    self.buffer_cond.notify_all()
+                    return
+                self.buffer += chunk
+                self.buffer_cond.notify_all()
+
+    def is_alive(self):
+        """세션 프로세스가 살아 있는지"""
+        return self.process is not None and self.process.poll() is None
+
+    def next_sentinel(self):
+        """명령 결과 끝을 표시할 고유 문자열"""
+        self.counter += 1
+        return f"__ADB_DONE_{self.token}_{self.counter}__"
+
+    def wrap(self, command, sentinel):
+        """명령 출력(표준 오류 포함) 뒤에 구분 문자열과 종료 코드를 출력하도록 감쌈"""
+        return f"{{ {command}\n}} 2>&1 </dev/null; printf '\\n{sentinel} %d\\n' $?\n"
+
+    def read_result(self, sentinel, deadline):
+        """구분 문자열이 나올 때까지 읽기 (출력, 종료 코드)"""
+        marker = b'\n' + sentinel.encode() + b' '
+        pattern = re.compile(re.escape(marker) + rb'(-?\d+)\n')
+
+        with self.buffer_cond:
+            while True:
+                match = pattern.search(self.buffer)
+                if match:
+                    output = self.buffer[:match.start()]
+                    self.buffer = self.buffer[match.end():]
+                    return output.decode('utf-8', errors='replace'), int(match.group(1))
+
+                if not self.is_alive():
+                    raise ConnectionError("adb shell 세션이 종료되었습니다")
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError("Command timeout")
+                self.buffer_cond.wait(remaining)
+
+    def run_many(self, commands, timeout=None):
+        """여러 명령을 한 번에 보내고 순서대로 (success, stdout, stderr) 목록 반환"""
+        timeout = timeout or self.timeout
+
+        with self.lock:
+            for attempt in range(2):
+                try:
+                    if not self.is_alive():
+                        self.start()
+
+                    sentinels = [self.next_sentinel() for _ in commands]
+                    script = ''.join(self.wrap(command, sentinel) for command, sentinel in zip(commands, sentinels))
+                    self.process.stdin.write(script.encode('utf-8'))
+                    self.process.stdin.flush()
+
+                    deadline = time.monotonic() + timeout
+                    results = []
+                    for sentinel in sentinels:
+                        output, returncode = self.read_result(sentinel, deadline)
+                        # 표준 오류는 표준 출력에 합쳐져 있으므로 실패 시 같은 내용을 stderr로도 전달
+                        results.append((returncode == 0, output, output if returncode else ''))
+
+                    self.command_count += len(commands)
+                    return results
+
+                except TimeoutError:
+                    # 진행 중인 명령의 출력이 섞이지 않도록 세션을 새로 시작
+                    self.close()
+                    return [(False, "", "Command timeout") for _ in commands]
+                except (ConnectionError, BrokenPipeError, OSError) as e:
+                    self.close()
+                    if attempt == 0:
+                        self.log(f"ADB shell session reconnecting: {e}")
+                        continue
+                    return [(False, "", str(e)) for _ in commands]
+
+    def run(self, command, timeout=None):
+        """명령 하나 실행 (success, stdout, stderr)"""
+        return self.run_many([command], timeout=timeout)[0]
+
+    def close(self):
+        """세션 종료"""
+        process, self.process = self.process, None
+        if process is None:
+            return
+
+        try:
+            process.stdin.close()
+        except OSError:
+            pass
+        try:
+            process.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+
+def parse_devices(output):
+    """`adb devices` 출력에서 사용 가능한(device 상태) 시리얼 목록"""
+    devices = []
+    for line in output.strip().split('\n')[1:]:  # 첫 줄 "List of devices attached" 제외
+        parts = line.split('\t')
+        if len(parts) >= 2 and parts[1].strip() == 'device':
+            devices.append(parts[0].strip())
+    return devices
+
+
+def list_devices(adb_path='adb', timeout=10):
+    """연결된 디바이스 시리얼 목록 (adb 실행 실패면 빈 목록)"""
+    adb_args = list(adb_path) if isinstance(adb_path, (list, tuple)) else [adb_path]
+    try:
+        result = subprocess.run(adb_args + ['devices'], capture_output=True, text=True,
+                                timeout=timeout, encoding='utf-8', errors='replace')
+    except (OSError, subprocess.TimeoutExpired) as e:
+        print(f"adb devices failed: {e}")
+        return []
+
+    if result.returncode != 0:
+        return []
+    return parse_devices(result.stdout)
+
+
+# 가짜 ADB 응답 (명령 앞부분 → 출력)
+FAKE_RESPONSES = {
+    'wm size': 'Physical size: 1080x1920',
+    'dumpsys display': 'mDisplayState=ON',
+    'dumpsys activity activities': '  mResumedActivity: ActivityRecord{1 u0 com.coupang.mobile/.SearchActivity t1}',
+    'pm list packages': 'package:com.coupang.mobile',
+    'input ': '',
+    'monkey ': 'Events injected: 1',
+    'am force-stop': '',
+    'echo ': None
+}
+
+FAKE_COMMAND_RE = re.compile(r"^\{ (.*)$")
+FAKE_SENTINEL_RE = re.compile(r"printf '\\n(\S+) %d\\n' \$\?$")
+
+
+def fake_command_output(command):
+    """가짜 디바이스에서 명령 하나 실행 (출력, 종료 코드)"""
+    command = command.strip()
+    for prefix, output in FAKE_RESPONSES.items():
+        if command.startswith(prefix):
+            if output is None:
+                return command[len(prefix):].strip().strip('"\'') + '\n', 0
+            return (output + '\n' if output else ''), 0
+    return f"/system/bin/sh: {command.split()[0] if command else ''}: not found\n", 127
+
+
+def run_fake_adb(args):
+    """테스트용 가짜 adb (devices, shell [명령], 대화형 shell 세션)"""
+    if args[:1] == ['-s']:
+        args = args[2:]
+
+    if args[:1] == ['devices']:
+        sys.stdout.write("List of devices attached\nFAKE0001\tdevice\nFAKE0002\tdevice\n\n")
+        return 0
+
+    if args[:1] != ['shell']:
+        sys.stderr.write(f"fake adb: unsupported command {args}\n")
+        return 1
+
+    if len(args) > 1:
+        output, returncode = fake_command_output(' '.join(args[1:]))
+        sys.stdout.write(output)
+        return returncode
+
+    # 대화형 세션: ADBShellSession.wrap() 형식의 명령을 읽어 응답
+    out = sys.stdout.buffer
+    command = None
+    for line in sys.stdin.buffer:
+        line = line.decode('utf-8', errors='replace').rstrip('\n')
+        command_match = FAKE_COMMAND_RE.match(line)
+        if command_match:
+            command = command_match.group(1)
+            continue
+
+        sentinel_match = FAKE_SENTINEL_RE.search(line)
+        if sentinel_match and command is not None:
+            output, returncode = fake_command_output(command)
+            out.write(f"{output}\n{sentinel_match.group(1)} {returncode}\n".encode('utf-8'))
+            out.flush()
+            command = None
+
+    return 0
+
+
+def fake_adb_path():
+    """가짜 adb를 실행하는 명령 (ADBShellSession(adb_path=...)에 전달)"""
+    return [sys.executable, __file__, '--fake-adb']
+
+
+def benchmark(adb_path, commands, log=print):
+    """명령마다 adb 프로세스 실행 vs 세션 재사용 비교"""
+    adb_args = list(adb_path) if isinstance(adb_path, (list, tuple)) else [adb_path]
+
+    start_time = time.perf_counter()
+    for command in commands:
+        subprocess.run(adb_args + ['shell', command], capture_output=True)
+    spawn_seconds = time.perf_counter() - start_time
+
+    session = ADBShellSession(adb_path=adb_path)
+    try:
+        start_time = time.perf_counter()
+        for command in commands:
+            session.run(command)
+        session_seconds = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        session.run_many(commands)
+        pipelined_seconds = time.perf_counter() - start_time
+    finally:
+        session.close()
+
+    log(f"📊 명령 {len(commands)}개: 프로세스 실행 {spawn_seconds * 1000:.0f}ms, "
+        f"세션 {session_seconds * 1000:.0f}ms, 세션 일괄 {pipelined_seconds * 1000:.0f}ms")
+    return spawn_seconds, session_seconds, pipelined_seconds
+
+
+def main():
+    """가짜 adb로 세션 동작과 속도 확인 (실제 adb: python adb_session.py --adb adb.exe)"""
+    if sys.argv[1:2] == ['--fake-adb']:
+        sys.exit(run_fake_adb(sys.argv[2:]))
+
+    adb_path = sys.argv[2] if sys.argv[1:2] == ['--adb'] else fake_adb_path()
+
+    print("ADB Shell Session Check")
+    print("=" * 50)
+
+    session = ADBShellSession(adb_path=adb_path)
+    try:
+        for command in ['wm size', 'echo "한글 텍스트"', 'dumpsys activity activities | grep mResumedActivity', 'no_such_command']:
+            success, stdout, stderr = session.run(command)
+            print(f"  {'✅' if success else '❌'} {command} -> {stdout.strip()}")
+    finally:
+        session.close()
+
+    commands = ['input tap 540 200', 'input swipe 540 1500 540 400 300', 'input keyevent KEYCODE_BACK', 'wm size'] * 10
+    benchmark(adb_path, commands)
+
+
+if __name__ == "__main__":
+    main()
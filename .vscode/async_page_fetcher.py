@@ -0,0 +1,225 @@
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+from search_result_parser import parse_search_results
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+
+class TokenBucket:
+    """요청 간격 조절용 토큰 버킷 (초당 rate개, 최대 capacity개까지 몰아서 허용)"""
+
+    def __init__(self, rate=1.0, capacity=2):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        """토큰 하나를 얻을 때까지 대기"""
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class AsyncPageFetcher:
+    """검색 결과 여러 페이지를 동시에 가져오는 비동기 페처
+
+    기본은 {base_url}/np/search?q=&page= 의 HTML을 파싱한다. 캡처한 API처럼 다른 주소/메서드를 쓰면
+    search_url, method, params(모든 페이지에 붙일 값), param_names(API가 받는 파라미터)와
+    parse(응답 본문, 페이지 → 전체 순위가 매겨진 상품 목록)를 지정한다.
+    """
+
+    def __init__(self, base_url="https://www.coupang.com", headers=None, cookies=None,
+                 max_concurrency=3, rate=1.0, burst=2, timeout=30, search_url=None, method='GET',
+                 params=None, param_names=None, parse=None):
+        if aiohttp is None:
+            raise ImportError("aiohttp가 설치되지 않았습니다. pip install aiohttp")
+
+        self.search_url = search_url or f"{base_url.rstrip('/')}/np/search"
+        self.method = method.upper()
+        self.params = dict(params or {})
+        self.param_names = param_names
+        self.parse = parse or (lambda html_content, page: parse_search_results(html_content, page=page))
+        self.headers = dict(headers or {})
+        self.cookies = dict(cookies or {})
+        self.max_concurrency = max_concurrency
+        self.rate = rate
+        self.burst = burst
+        self.timeout = timeout
+
+    def create_session(self):
+        """호스트당 동시 연결 수를 제한한 세션 생성"""
+        connector = aiohttp.TCPConnector(limit_per_host=self.max_concurrency)
+        return aiohttp.ClientSession(
+            connector=connector,
+            headers=self.headers,
+            cookies=self.cookies,
+            timeout=aiohttp.ClientTimeout(total=self.timeout)
+        )
+
+    async def fetch_page(self, session, bucket, keyword, page):
+        """한 페이지를 가져와 상품 목록으로 변환"""
+        await bucket.acquire()
+
+        params = dict(self.params, q=keyword, page=page)
+        if self.param_names is not None:
+            params = {key: value for key, value in params.items() if key in self.param_names}
+        request_args = {'params': params} if self.method == 'GET' else {'json': params}
+
+        start_time = time.time()
+        async with session.request(self.method, self.search_url, **request_args) as response:
+            html_content = await response.text()
+        response_time = round((time.time() - start_time) * 1000, 2)
+
+        if response.status != 200:
+            print(f"  ❌ 페이지 {page} 실패: {response.status} ({response_time}ms)")
+            return []
+
+        products = self.parse(html_content, page)
+        print(f"  ✅ 페이지 {page}: 상품 {len(products)}개 ({response_time}ms)")
+        return products
+
+    async def _fetch_page_safely(self, session, bucket, keyword, page):
+        """오류가 나도 다른 페이지에 영향이 없도록 빈 목록 반환"""
+        try:
+            return await self.fetch_page(session, bucket, keyword, page)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"  ❌ 페이지 {page} 오류: {e}")
+            return []
+
+    async def fetch_pages(self, keyword, max_pages=3):
+        """1..max_pages 페이지를 동시에 가져와 순위 순서대로 합침"""
+        bucket = TokenBucket(self.rate, self.burst)
+
+        async with self.create_session() as session:
+            results = await asyncio.gather(*[
+                self._fetch_page_safely(session, bucket, keyword, page)
+                for page in range(1, max_pages + 1)
+            ])
+
+        return [product for products in results for product in products]
+
+    async def find_product_rank(self, keyword, product_id, max_pages=5):
+        """페이지를 미리 동시에 요청하고 타겟을 찾으면 뒤 페이지 요청은 취소"""
+        product_id = str(product_id)
+        bucket = TokenBucket(self.rate, self.burst)
+        found = None
+
+        async with self.create_session() as session:
+            tasks = {
+                asyncio.create_task(self._fetch_page_safely(session, bucket, keyword, page)): page
+                for page in range(1, max_pages + 1)
+            }
+            pending = set(tasks)
+
+            try:
+                while pending:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+
+                    for task in done:
+                        page = tasks[task]
+                        if found and page > found['page']:
+                            continue
+
+                        for product in task.result():
+                            if product['product_id'] == product_id:
+                                found = {'rank': product['rank'], 'page': page, 'product': product}
+                                break
+
+                    if found:
+                        # 타겟보다 앞 페이지만 계속 기다린다 (더 높은 순위가 있을 수 있음)
+                        for task in list(pending):
+                            if tasks[task] > found['page']:
+                                task.cancel()
+                                pending.discard(task)
+            finally:
+                for task in pending:
+                    task.cancel()
+
+        return found
+
+
+class _FixtureHandler(BaseHTTPRequestHandler):
+    """저장된 HTML을 /np/search?page=N 으로 돌려주는 스텁 핸들러"""
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        page = int(query.get('page', ['1'])[0])
+        html_content = self.server.pages.get(page)
+
+        if self.server.delay:
+            time.sleep(self.server.delay)
+
+        if html_content is None:
+            self.send_response(404)
+            self.end_headers()
+            return
+
+        body = html_content.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_fixture_pages(pages, delay=0):
+    """페이지 번호별 HTML을 제공하는 로컬 스텁 서버 시작 (server, base_url 반환)"""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _FixtureHandler)
+    server.pages = pages
+    server.delay = delay
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def main():
+    """로컬 스텁 서버로 동시 페이지 조회 확인"""
+    from search_result_parser import build_sample_page
+
+    print("Async Page Fetcher (local stub server)")
+    print("=" * 50)
+
+    # 페이지마다 다른 상품 ID를 갖도록 생성
+    pages = {
+        page: build_sample_page().replace('70000000', f'7{page}000000')
+        for page in range(1, 6)
+    }
+    server, base_url = serve_fixture_pages(pages, delay=1)
+
+    try:
+        fetcher = AsyncPageFetcher(base_url=base_url, max_concurrency=3, rate=5, burst=3)
+
+        start_time = time.time()
+        result = asyncio.run(fetcher.find_product_rank('트롤리', '7300000010', max_pages=5))
+        elapsed = round(time.time() - start_time, 2)
+
+        if result:
+            print(f"🎉 상품 발견! 순위: {result['rank']}위 ({elapsed}s)")
+        else:
+            print(f"❌ 상품을 찾을 수 없습니다 ({elapsed}s)")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+import json
+import time
+from selenium.common.exceptions import JavascriptException, TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+from wait_stats import WaitStats
+
+# 상품 목록이 들어 있는 요소
+PRODUCT_LIST_SELECTOR = '#productList, #product-list, ul.search-product-list, li[data-product-id]'
+
+# 상품 카드
+PRODUCT_ITEM_SELECTOR = 'li.search-product, #productList > li, #product-list > li, ul.search-product-list > li'
+
+
+def enable_network_log(chrome_options):
+    """Chrome/Whale 옵션: NetworkIdle이 CDP 네트워크 이벤트를 읽을 수 있도록 성능 로그 켜기"""
+    chrome_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+
+
+def document_ready(states=('interactive', 'complete')):
+    """조건: document.readyState가 states 중 하나"""
+    def condition(driver):
+        return driver.execute_script("return document.readyState") in states
+    return condition
+
+
+def product_list_present(selector=PRODUCT_LIST_SELECTOR):
+    """조건: 상품 목록 요소가 DOM에 있음"""
+    def condition(driver):
+        return driver.execute_script("return document.querySelector(arguments[0]) !== null", selector)
+    return condition
+
+
+class ItemCountStable:
+    """조건: 항목 수가 min_count개 이상이고 stable_ms 동안 변하지 않음 (지연 로딩이 끝났는지)"""
+
+    def __init__(self, selector=PRODUCT_ITEM_SELECTOR, stable_ms=500, min_count=1):
+        self.selector = selector
+        self.stable_ms = stable_ms
+        self.min_count = min_count
+        self.count = None
+        self.changed_at = None
+
+    def __call__(self, driver):
+        count = driver.execute_script("return document.querySelectorAll(arguments[0]).length", self.selector)
+        now = time.monotonic()
+        if count != self.count:
+            self.count = count
+            self.changed_at = now
+            return False
+        return count >= self.min_count and (now - self.changed_at) * 1000 >= self.stable_ms
+
+
+class NetworkIdle:
+    """조건: 진행 중인 요청이 없고 idle_ms 동안 새 요청도 없음
+
+    Chromium은 CDP 네트워크 이벤트(enable_network_log로 켠 성능 로그)로 진행 중인 요청을 세고,
+    성능 로그를 읽을 수 없으면(Firefox 등) Resource Timing 항목 수가 그대로인지로 판단한다.
+    """
+
+    REQUEST_START = 'Network.requestWillBeSent'
+    REQUEST_END = ('Network.loadingFinished', 'Network.loadingFailed')
+    # 끝나지 않는 연결은 기다리지 않음
+    LONG_LIVED_TYPES = ('WebSocket', 'EventSource')
+
+    def __init__(self, idle_ms=500):
+        self.idle_ms = idle_ms
+        self.pending = set()
+        self.resource_count = None
+        self.last_activity = None
+        self.use_log = True
+
+    def read_events(self, driver):
+        """쌓인 CDP 네트워크 이벤트 (성능 로그를 못 읽으면 None)"""
+        if not self.use_log:
+            return None
+        try:
+            entries = driver.get_log('performance')
+        except Exception:
+            self.use_log = False
+            return None
+
+        events = []
+        for entry in entries:
+            try:
+                events.append(json.loads(entry['message'])['message'])
+            except (KeyError, TypeError, ValueError):
+                continue
+        return events
+
+    def __call__(self, driver):
+        now = time.monotonic()
+        if self.last_activity is None:
+            self.last_activity = now
+
+        events = self.read_events(driver)
+        if events is not None:
+            for event in events:
+                method = event.get('method')
+                params = event.get('params', {})
+                request_id = params.get('requestId')
+                if method == self.REQUEST_START and params.get('type') not in self.LONG_LIVED_TYPES:
+                    self.pending.add(request_id)
+                    self.last_activity = now
+                elif method in self.REQUEST_END:
+                    self.pending.discard(request_id)
+                    self.last_activity = now
+        else:
+            count = driver.execute_script("return performance.getEntriesByType('resource').length")
+            if count != self.resource_count:
+                self.resource_count = count
+                self.last_activity = now
+
+        return not self.pending and (now - self.last_activity) * 1000 >= self.idle_ms
+
+
+def all_of(*conditions):
+    """조건: 모든 조건이 참 (앞의 조건이 참이 된 뒤에야 다음 조건을 확인)"""
+    def condition(driver):
+        for item in conditions:
+            if not item(driver):
+                return False
+        return True
+    return condition
+
+
+class BrowserWaiter:
+    """고정 sleep 대신 WebDriverWait 조건이 참이 되면 바로 반환하고 대기 시간을 기록하는 도구"""
+
+    def __init__(self, stats=None, poll_interval=0.1, log=print):
+        self.stats = stats or WaitStats()
+        self.poll_interval = poll_interval
+        self.log = log
+
+    def wait(self, driver, name, condition, timeout):
+        """condition(driver)가 참이 될 때까지 대기 (준비되면 True, 시간 초과면 False)"""
+        start_time = time.monotonic()
+        try:
+            # 페이지 이동 중 스크립트 오류는 다음 확인에서 다시 시도
+            WebDriverWait(driver, timeout, poll_frequency=self.poll_interval,
+                          ignored_exceptions=(JavascriptException,)).until(condition)
+            ready = True
+        except TimeoutException:
+            ready = False
+
+        elapsed = time.monotonic() - start_time
+        self.stats.record(name, elapsed, ready)
+        if not ready:
+            self.log(f"Wait timeout: {name} ({elapsed:.1f}s)")
+        return ready
+
+    def wait_for_page(self, driver, name='page_ready', timeout=10):
+        """DOM을 읽을 수 있을 때까지 대기 (DOMContentLoaded)"""
+        return self.wait(driver, name, document_ready(), timeout)
+
+    def wait_for_search_results(self, driver, name='search_results', timeout=15, stable_ms=500,
+                                network_idle=False):
+        """상품 목록이 나타나고 상품 수가 stable_ms 동안 그대로일 때까지 대기 (network_idle이면 요청도 끝날 때까지)"""
+        conditions = [product_list_present(), ItemCountStable(stable_ms=stable_ms)]
+        if network_idle:
+            conditions.append(NetworkIdle())
+        return self.wait(driver, name, all_of(*conditions), timeout)
+
+    def wait_for_items_settled(self, driver, name='items_settled', timeout=5, stable_ms=300, network_idle=False):
+        """스크롤 후 지연 로딩된 상품 수가 더 늘지 않을 때까지 대기 (network_idle이면 요청도 끝날 때까지)"""
+        conditions = [ItemCountStable(stable_ms=stable_ms, min_count=0)]
+        if network_idle:
+            conditions.append(NetworkIdle())
+        return self.wait(driver, name, all_of(*conditions), timeout)
+
+
+def main():
+    """상품이 조금씩 그려지는 가짜 페이지로 고정 sleep과 조건 대기 비교"""
+    print("Browser Wait Check")
+    print("=" * 50)
+
+    class FakeDriver:
+        """load_seconds에 걸쳐 상품 60개가 나누어 그려지는 페이지"""
+
+        def __init__(self, load_seconds):
+            self.load_seconds = load_seconds
+            self.opened_at = time.monotonic()
+
+        def execute_script(self, script, *args):
+            progress = (time.monotonic() - self.opened_at) / self.load_seconds
+            if 'readyState' in script:
+                return 'complete' if progress >= 1 else 'interactive' if progress >= 0.3 else 'loading'
+            if 'querySelectorAll' in script:
+                return 0 if progress < 0.3 else min(60, int(60 * progress))
+            return progress >= 0.3
+
+        def get_log(self, log_type):
+            raise ValueError("performance log not enabled")
+
+    waiter = BrowserWaiter(log=lambda message: None)
+    for load_seconds in [0.4, 1.2, 6.0]:
+        driver = FakeDriver(load_seconds)
+        start_time = time.monotonic()
+        ready = waiter.wait_for_search_results(driver, timeout=10, stable_ms=300)
+        elapsed = time.monotonic() - start_time
+        count = driver.execute_script("return document.querySelectorAll(arguments[0]).length")
+        fixed = '읽기 전 로딩 끝 ✅' if load_seconds <= 5 else f'로딩 중에 읽음 ❌ ({int(60 * 5 / load_seconds)}개)'
+        print(f"  로딩 {load_seconds}초: 조건 대기 {elapsed:.2f}초 (ready={ready}, 상품 {count}개) / "
+              f"고정 sleep 5초: {fixed}")
+
+    class FakeNetworkDriver(FakeDriver):
+        """상품은 바로 다 그려지지만 지연 로딩 요청이 load_seconds까지 이어지는 페이지 (CDP 성능 로그 제공)"""
+
+        def __init__(self, load_seconds, requests=6):
+            super().__init__(0.05)
+            self.requests = [(index * load_seconds / requests, (index + 1) * load_seconds / requests)
+                             for index in range(requests)]
+            self.delivered = set()
+
+        def get_log(self, log_type):
+            # 성능 로그는 읽을 때마다 비워지므로 아직 전달하지 않은 이벤트만 반환
+            now = time.monotonic() - self.opened_at
+            entries = []
+            for index, (started, finished) in enumerate(self.requests):
+                for method, at in [('Network.requestWillBeSent', started), ('Network.loadingFinished', finished)]:
+                    if at <= now and (index, method) not in self.delivered:
+                        self.delivered.add((index, method))
+                        message = {'message': {'method': method, 'params': {'requestId': str(index)}}}
+                        entries.append({'message': json.dumps(message)})
+            return entries
+
+    for load_seconds in [0.5, 1.5]:
+        driver = FakeNetworkDriver(load_seconds)
+        start_time = time.monotonic()
+        ready = waiter.wait_for_search_results(driver, name='search_results_network', timeout=10,
+                                               stable_ms=300, network_idle=True)
+        elapsed = time.monotonic() - start_time
+        print(f"  지연 요청 {load_seconds}초 (CDP): 조건 대기 {elapsed:.2f}초 (ready={ready}, "
+              f"요청 {len(driver.requests)}개 모두 끝난 뒤 {'✅' if elapsed >= load_seconds else '❌'})")
+
+    for line in waiter.stats.summary():
+        print(f"📊 {line}")
+
+
+if __name__ == "__main__":
+    main()
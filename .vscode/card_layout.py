@@ -0,0 +1,217 @@
+import re
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+import cv2
+import numpy as np
+
+PRICE_RE = re.compile(r'(\d{1,3}(?:,\d{3})+|\d{4,})\s*(?:원|won|W|₩)', re.IGNORECASE)
+REVIEW_RE = re.compile(r'\((\d{1,3}(?:,\d{3})*)\)')
+
+
+def find_ink_rows(binary, min_ink):
+    """행별로 글자/그림 픽셀이 min_ink개 이상인지 여부"""
+    return np.count_nonzero(binary, axis=1) >= min_ink
+
+
+def find_runs(mask, min_length=1):
+    """True가 이어지는 구간 [(start, end), ...]"""
+    padded = np.concatenate(([False], mask, [False]))
+    edges = np.flatnonzero(padded[1:] != padded[:-1])
+    return [(start, end) for start, end in zip(edges[::2], edges[1::2]) if end - start >= min_length]
+
+
+def detect_product_cards(gray, header_ratio=0.08, footer_ratio=0.06, min_gap=48,
+                         min_card_height=150, text_column=0.33):
+    """검색 결과 화면에서 상품 카드 영역 검출
+
+    가로로 긴 구분선을 지운 뒤, 내용이 없는 행이 min_gap 이상 이어지는 곳을
+    카드 경계로 본다. 상단 검색바/하단 탭바는 제외한다.
+    반환: [{'card': (x, y, w, h), 'text': (x, y, w, h)}, ...] (위에서 아래 순)
+    """
+    height, width = gray.shape[:2]
+
+    # 배경보다 어두운 픽셀(글자, 이미지, 구분선)
+    _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+
+    # 카드 구분선 제거 (화면 폭의 60% 이상인 가로선)
+    line_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (int(width * 0.6), 1))
+    separators = cv2.morphologyEx(binary, cv2.MORPH_OPEN, line_kernel)
+    binary = cv2.subtract(binary, separators)
+
+    top = int(height * header_ratio)
+    bottom = height - int(height * footer_ratio)
+    ink_rows = find_ink_rows(binary[top:bottom], min_ink=3)
+
+    # 작은 빈틈(줄 간격)은 메우고 min_gap 이상의 빈 구간만 경계로 사용
+    filled = ink_rows.copy()
+    for start, end in find_runs(~ink_rows):
+        if end - start < min_gap:
+            filled[start:end] = True
+
+    cards = []
+    text_left = int(width * text_column)
+    for start, end in find_runs(filled, min_length=min_card_height):
+        y = top + start
+        card_height = end - start
+
+        # 텍스트 열에서 실제 글자가 있는 세로 범위만 사용
+        text_rows = find_runs(find_ink_rows(binary[y:y + card_height, text_left:], min_ink=2))
+        if not text_rows:
+            continue
+        text_top = y + text_rows[0][0]
+        text_bottom = y + text_rows[-1][1]
+
+        # 오른쪽 빈 공간도 제외
+        ink_columns = np.flatnonzero(np.count_nonzero(binary[text_top:text_bottom, text_left:], axis=0))
+        text_x = text_left + int(ink_columns[0])
+        text_right = text_left + int(ink_columns[-1]) + 1
+
+        cards.append({
+            'card': (0, int(y), width, int(card_height)),
+            'text': (text_x, int(text_top), text_right - text_x, int(text_bottom - text_top))
+        })
+
+    return cards
+
+
+def crop(image, box, padding=4):
+    """영역 잘라내기 (가장자리 여백 포함)"""
+    x, y, w, h = box
+    height, width = image.shape[:2]
+    return image[max(0, y - padding):min(height, y + h + padding),
+                 max(0, x - padding):min(width, x + w + padding)]
+
+
+def parse_card_text(text):
+    """카드 하나의 OCR 텍스트에서 제목/가격/리뷰 수 추출"""
+    lines = [line.strip() for line in text.split('\n') if line.strip()]
+
+    price_match = None
+    review_match = None
+    title_lines = []
+
+    for line in lines:
+        line_price = PRICE_RE.search(line)
+        line_review = REVIEW_RE.search(line)
+
+        if line_price and not price_match:
+            price_match = line_price
+        if line_review and not review_match:
+            review_match = line_review
+
+        # 가격/리뷰 줄이 나오기 전까지가 제목
+        if not (line_price or line_review) and not price_match:
+            title_lines.append(line)
+
+    return {
+        'title': ' '.join(title_lines) or (lines[0] if lines else ''),
+        'price': price_match.group(1) + '원' if price_match else 'N/A',
+        'reviews': review_match.group(1) if review_match else '0'
+    }
+
+
+# 작업 프로세스의 OCR 엔진 설정 (Windows는 작업 프로세스를 새로 띄우므로 initializer로 전달)
+_engine_options = {}
+
+
+def _init_worker(engine_options):
+    """작업 프로세스 시작 시 OCR 엔진 설정 저장"""
+    global _engine_options
+    _engine_options = engine_options
+
+
+def _ocr_crop(image, engine_options=None):
+    """영역 하나 인식 (프로세스별 OCR 엔진 재사용)"""
+    from ocr_engine import get_engine
+
+    # 예외 객체가 프로세스 간에 전달되지 않을 수 있으므로 여기서 처리
+    try:
+        return get_engine(**(engine_options or _engine_options)).recognize(image)['text']
+    except Exception as e:
+        print(f"Card OCR failed: {e}")
+        return ""
+
+
+class CardOCRPool:
+    """카드 영역 OCR을 여러 프로세스로 나눠 처리하는 풀 (한 번 만들어 계속 사용)
+
+    여러 디바이스의 체커가 스레드에서 같은 풀을 함께 써도 된다 (프로세스 수는 풀 하나 기준).
+    tesseract_cmd/lang은 작업 프로세스마다 OCR 엔진에 그대로 전달된다.
+    """
+
+    def __init__(self, processes=None, tesseract_cmd=None, lang='eng'):
+        self.processes = processes
+        self.engine_options = {'lang': lang, 'psm': 6, 'fallback_psms': (4,), 'tesseract_cmd': tesseract_cmd}
+        self.executor = None
+        self.lock = threading.Lock()
+
+    def ocr_cards(self, gray, cards):
+        """카드별 텍스트 영역 OCR (카드 순서대로 텍스트 목록 반환)"""
+        crops = [crop(gray, card['text']) for card in cards]
+        if not crops:
+            return []
+
+        # 카드가 하나뿐이면 프로세스 간 전송 비용이 더 큼
+        if len(crops) == 1 or self.processes == 1:
+            return [_ocr_crop(image, self.engine_options) for image in crops]
+
+        with self.lock:
+            if self.executor is None:
+                self.executor = ProcessPoolExecutor(max_workers=self.processes, initializer=_init_worker,
+                                                    initargs=(self.engine_options,))
+            executor = self.executor
+
+        return list(executor.map(_ocr_crop, crops))
+
+    def close(self):
+        """작업 프로세스 종료"""
+        with self.lock:
+            executor, self.executor = self.executor, None
+        if executor:
+            executor.shutdown()
+
+
+def extract_card_products(gray, pool, **detect_options):
+    """화면의 카드별 상품 정보 (rank는 화면 위에서부터의 순서)"""
+    cards = detect_product_cards(gray, **detect_options)
+    texts = pool.ocr_cards(gray, cards)
+
+    products = []
+    for index, (card, text) in enumerate(zip(cards, texts)):
+        product = parse_card_text(text)
+        product['rank'] = index + 1
+        product['box'] = card['card']
+        product['ocr_text'] = text
+        products.append(product)
+
+    return products
+
+
+def main():
+    """생성한 검색 결과 화면으로 카드 검출과 OCR 픽셀 수 확인"""
+    from ocr_engine import build_sample_screen
+
+    print("Product Card Layout Check")
+    print("=" * 50)
+
+    screen = build_sample_screen()
+    height, width = screen.shape
+    # 카드 구분선 추가
+    for index in range(7):
+        y = 120 + index * 280
+        cv2.line(screen, (0, y), (width, y), 200, 2)
+
+    start_time = time.perf_counter()
+    cards = detect_product_cards(screen, text_column=0.0)
+    elapsed = (time.perf_counter() - start_time) * 1000
+
+    ocr_pixels = sum(card['text'][2] * card['text'][3] for card in cards)
+    print(f"카드 {len(cards)}개 검출 ({elapsed:.1f}ms)")
+    for card in cards:
+        print(f"  card={card['card']} text={card['text']}")
+    print(f"OCR 픽셀: {ocr_pixels:,} / 전체 {width * height:,} ({ocr_pixels / (width * height):.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,18 +6,24 @@ import json
 import time
 import random
 from datetime import datetime
-import sqlite3
 import os
 import threading
 from flask import Flask, jsonify, request, render_template_string
 import webbrowser
+from rank_storage import RankStorage
+from rank_ingest import ensure_slot_status_unique_index, bulk_upsert_slot_status
+from rank_schema import apply_migrations
+from search_planner import load_last_ranks, plan_searches, resolve_targets
+from search_result_parser import PAGE_SIZE
 
 class CompleteRankSystem:
-    def __init__(self):
+    def __init__(self, db_path="rank_system.db"):
         self.base_url = "http://localhost:3000"
-        self.db_path = "rank_system.db"
+        self.db_path = db_path
         self.log_file = "complete_system.log"
         self.web_server = None
+        self.bulk_size = 100  # 이 건수마다 slot_status에 일괄 기록
+        self.storage = RankStorage.open(self.db_path)
         self.setup_database()
         
     def log(self, message):
@@ -35,11 +41,8 @@ class CompleteRankSystem:
     def setup_database(self):
         """데이터베이스 초기화"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
             # ranking_check 테이블 생성
-            cursor.execute('''
+            self.storage.execute('''
                 CREATE TABLE IF NOT EXISTS ranking_check (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     order_num INTEGER,
@@ -52,7 +55,7 @@ class CompleteRankSystem:
             ''')
             
             # slot_status 테이블 생성
-            cursor.execute('''
+            self.storage.execute('''
                 CREATE TABLE IF NOT EXISTS slot_status (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     slot_id INTEGER,
@@ -69,7 +72,7 @@ class CompleteRankSystem:
             ''')
             
             # ranking_history 테이블 생성 (그래프용)
-            cursor.execute('''
+            self.storage.execute('''
                 CREATE TABLE IF NOT EXISTS ranking_history (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     slot_id INTEGER,
@@ -79,19 +82,26 @@ class CompleteRankSystem:
                 )
             ''')
             
-            conn.commit()
-            conn.close()
             self.log("데이터베이스 초기화 완료")
             
         except Exception as e:
             self.log(f"데이터베이스 초기화 오류: {e}")
+        
+        # 일괄 업서트(ON CONFLICT)용 유니크 인덱스
+        try:
+            ensure_slot_status_unique_index(self.storage)
+        except Exception as e:
+            self.log(f"⚠️ slot_status(slot_id) 유니크 인덱스 생성 실패 (중복 slot_id 확인 필요): {e}")
+        
+        # 차트/상태 조회용 인덱스
+        try:
+            apply_migrations(self.storage, log=self.log)
+        except Exception as e:
+            self.log(f"⚠️ 인덱스 생성 실패: {e}")
     
     def create_sample_data(self):
         """샘플 데이터 생성"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
             # ranking_check 테이블에 샘플 데이터
             sample_data = [
                 (1, '쿠팡', '트롱리', 'https://www.coupang.com/vp/products/8473798698'),
@@ -101,17 +111,16 @@ class CompleteRankSystem:
                 (5, '쿠팡', '쇼핑카트', 'https://www.coupang.com/vp/products/9999999999')
             ]
             
-            cursor.execute('DELETE FROM ranking_check')
-            cursor.execute('DELETE FROM slot_status')
-            cursor.execute('DELETE FROM ranking_history')
-            
-            cursor.executemany('''
-                INSERT INTO ranking_check (order_num, slot_type, keyword, product_url)
-                VALUES (?, ?, ?, ?)
-            ''', sample_data)
+            with self.storage.transaction() as conn:
+                conn.execute('DELETE FROM ranking_check')
+                conn.execute('DELETE FROM slot_status')
+                conn.execute('DELETE FROM ranking_history')
+                
+                conn.executemany('''
+                    INSERT INTO ranking_check (order_num, slot_type, keyword, product_url)
+                    VALUES (?, ?, ?, ?)
+                ''', sample_data)
             
-            conn.commit()
-            conn.close()
             self.log("샘플 데이터 생성 완료")
             
         except Exception as e:
@@ -126,9 +135,9 @@ class CompleteRankSystem:
         except:
             return None
     
-    def simulate_coupang_search(self, keyword, product_id):
-        """쿠팡 검색 시뮬레이션"""
-        self.log(f"쿠팡 검색 시작: {keyword}")
+    def simulate_coupang_search(self, keyword, product_ids, max_pages=1):
+        """쿠팡 검색 시뮬레이션 (검색 한 번의 결과 상품 목록 반환)"""
+        self.log(f"쿠팡 검색 시작: {keyword} (대상 상품 {len(product_ids)}개, {max_pages}페이지)")
         
         steps = [
             "쿠팡 홈페이지 접속",
@@ -136,31 +145,35 @@ class CompleteRankSystem:
             "키워드 입력",
             "검색 실행",
             "결과 페이지 로딩",
-            "상품 리스트 분석",
-            f"상품 ID {product_id} 검색"
+            "상품 리스트 분석"
         ]
         
         for i, step in enumerate(steps, 1):
             self.log(f"  단계 {i}: {step}")
             time.sleep(random.uniform(0.2, 0.5))
         
-        # 순위 생성 시뮬레이션
-        if random.random() > 0.1:  # 90% 성공률
-            rank = random.choice([1, 2, 3, 5, 7, 10, 12, 15, 18, 20, 25, 30])
-            self.log(f"  ✅ 순위 발견: {rank}위")
-            return rank
-        else:
-            self.log(f"  ❌ 검색 결과에 없음")
-            return None
+        # 검색 결과 생성 시뮬레이션 (대상 상품마다 90% 확률로 노출)
+        products = [
+            {'rank': rank, 'product_id': f"9{rank:09d}", 'url': f"https://www.coupang.com/vp/products/9{rank:09d}"}
+            for rank in range(1, max_pages * PAGE_SIZE + 1)
+        ]
+        ranks = [1, 2, 3, 5, 7, 10, 12, 15, 18, 20, 25, 30]
+        random.shuffle(ranks)
+        for product_id in product_ids:
+            if ranks and random.random() > 0.1:
+                rank = ranks.pop()
+                products[rank - 1].update(product_id=product_id, url=f"https://www.coupang.com/vp/products/{product_id}")
+        
+        return products
     
-    def process_keyword(self, ranking_data):
-        """개별 키워드 처리"""
+    def validate_slot(self, ranking_data):
+        """순위 체크 대상 슬롯인지 확인 (쿠팡 슬롯이면 상품 ID, 아니면 None)"""
         order_num = ranking_data['order_num']
         slot_type = ranking_data['slot_type']
         keyword = ranking_data['keyword']
         product_url = ranking_data['product_url']
         
-        self.log(f"\n--- 순번 {order_num} 처리 ---")
+        self.log(f"\n--- 순번 {order_num} 확인 ---")
         self.log(f"슬롯유형: {slot_type}")
         self.log(f"검색어: {keyword}")
         self.log(f"링크주소: {product_url}")
@@ -168,77 +181,127 @@ class CompleteRankSystem:
         # 쿠팡이 아니면 스킵
         if slot_type != '쿠팡':
             self.log(f"⚠️ 쿠팡이 아닌 슬롯유형이므로 스킵")
-            return False
+            return None
         
         # 상품 ID 추출
         product_id = self.extract_product_id(product_url)
         if not product_id:
             self.log(f"❌ 상품 ID 추출 실패")
+            return None
+        
+        return product_id
+    
+    def attach_last_ranks(self, slots):
+        """슬롯마다 slot_status의 마지막 순위를 붙임 (검색할 페이지 수 계산용)"""
+        last_ranks = load_last_ranks(self.storage)
+        for slot in slots:
+            slot['current_rank'] = last_ranks.get(slot['order_num'])
+        return slots
+    
+    def check_keyword_group(self, group):
+        """같은 검색어 슬롯들을 검색 한 번으로 순위 체크 (slot_status 반영용 행 목록 반환)"""
+        product_ids = [self.extract_product_id(slot['product_url']) for slot in group.slots]
+        products = self.simulate_coupang_search(group.keyword, product_ids, group.max_pages)
+        
+        rows = []
+        for slot, product in resolve_targets(group, products):
+            if product:
+                self.log(f"  ✅ 순번 {slot['order_num']}: {product['rank']}위")
+                rows.append((slot['order_num'], slot['slot_type'], slot['keyword'], product['product_id'], product['rank']))
+            else:
+                self.log(f"  ❌ 순번 {slot['order_num']}: 검색 결과에 없음")
+        
+        return rows
+    
+    def check_keyword(self, ranking_data):
+        """개별 키워드 순위 체크 (slot_status 반영용 행 반환, 실패하면 None)"""
+        if not self.validate_slot(ranking_data):
             return False
         
-        # 순위 체크
-        rank = self.simulate_coupang_search(keyword, product_id)
+        rows = self.check_keyword_group(plan_searches(self.attach_last_ranks([ranking_data]))[0])
+        if rows:
+            return rows[0]
+        else:
+            self.log(f"❌ 순위 체크 실패")
+            return None
+    
+    def process_keyword(self, ranking_data):
+        """개별 키워드 처리"""
+        row = self.check_keyword(ranking_data)
+        if not row:
+            return False
         
-        if rank:
+        # 상태 업데이트와 삭제를 한 트랜잭션으로 기록
+        with self.storage.transaction():
             # slot_status 테이블 업데이트
-            self.update_slot_status(order_num, slot_type, keyword, product_id, rank)
+            self.update_slot_status(*row)
             
             # ranking_check에서 삭제
-            self.delete_from_ranking_check(order_num)
+            self.delete_from_ranking_check(row[0])
+        
+        return True
+    
+    def bulk_update_slot_status(self, rows):
+        """순위 결과 여러 건을 한 트랜잭션으로 반영하고 ranking_check에서 삭제"""
+        if not rows:
+            return 0
+        
+        try:
+            with self.storage.transaction() as conn:
+                count = bulk_upsert_slot_status(self.storage, rows)
+                conn.executemany(
+                    'DELETE FROM ranking_check WHERE order_num = ?',
+                    [(row[0],) for row in rows]
+                )
             
-            return True
-        else:
-            self.log(f"❌ 순위 체크 실패")
-            return False
+            self.log(f"✅ slot_status 일괄 반영: {count}건")
+            return count
+            
+        except Exception as e:
+            self.log(f"❌ DB 일괄 업데이트 오류: {e}")
+            return 0
     
     def update_slot_status(self, slot_id, slot_type, keyword, product_id, rank):
         """slot_status 테이블 업데이트"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # 기존 레코드 확인
-            cursor.execute('''
-                SELECT id, start_rank FROM slot_status 
-                WHERE slot_id = ?
-            ''', (slot_id,))
-            
-            existing_record = cursor.fetchone()
-            
-            if existing_record:
-                # 기존 레코드 업데이트
-                slot_status_id, start_rank = existing_record
-                
-                cursor.execute('''
-                    UPDATE slot_status 
-                    SET current_rank = ?, last_checked = ?, updated_at = CURRENT_TIMESTAMP
-                    WHERE id = ?
-                ''', (rank, datetime.now().isoformat(), slot_status_id))
+            with self.storage.transaction() as conn:
+                # 기존 레코드 확인
+                existing_record = conn.execute('''
+                    SELECT id, start_rank FROM slot_status 
+                    WHERE slot_id = ?
+                ''', (slot_id,)).fetchone()
                 
-                self.log(f"✅ 기존 레코드 업데이트: 현재순위={rank}위 (시작순위={start_rank}위)")
-                
-            else:
-                # 새 레코드 생성
-                cursor.execute('''
-                    INSERT INTO slot_status 
-                    (slot_id, slot_type, keyword, product_id, current_rank, start_rank, last_checked)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    slot_id, slot_type, keyword, product_id,
-                    rank, rank, datetime.now().isoformat()
-                ))
+                if existing_record:
+                    # 기존 레코드 업데이트
+                    slot_status_id, start_rank = existing_record
+                    
+                    conn.execute('''
+                        UPDATE slot_status 
+                        SET current_rank = ?, last_checked = ?, updated_at = CURRENT_TIMESTAMP
+                        WHERE id = ?
+                    ''', (rank, datetime.now().isoformat(), slot_status_id))
+                    
+                    self.log(f"✅ 기존 레코드 업데이트: 현재순위={rank}위 (시작순위={start_rank}위)")
+                    
+                else:
+                    # 새 레코드 생성
+                    cursor = conn.execute('''
+                        INSERT INTO slot_status 
+                        (slot_id, slot_type, keyword, product_id, current_rank, start_rank, last_checked)
+                        VALUES (?, ?, ?, ?, ?, ?, ?)
+                    ''', (
+                        slot_id, slot_type, keyword, product_id,
+                        rank, rank, datetime.now().isoformat()
+                    ))
+                    
+                    slot_status_id = cursor.lastrowid
+                    self.log(f"✅ 새 레코드 생성: 현재순위={rank}위, 시작순위={rank}위")
                 
-                slot_status_id = cursor.lastrowid
-                self.log(f"✅ 새 레코드 생성: 현재순위={rank}위, 시작순위={rank}위")
-            
-            # 히스토리 기록
-            cursor.execute('''
-                INSERT INTO ranking_history (slot_id, keyword, rank_value, checked_at)
-                VALUES (?, ?, ?, CURRENT_TIMESTAMP)
-            ''', (slot_status_id, keyword, rank))
-            
-            conn.commit()
-            conn.close()
+                # 히스토리 기록
+                conn.execute('''
+                    INSERT INTO ranking_history (slot_id, keyword, rank_value, checked_at)
+                    VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+                ''', (slot_status_id, keyword, rank))
             
         except Exception as e:
             self.log(f"❌ DB 업데이트 오류: {e}")
@@ -246,13 +309,7 @@ class CompleteRankSystem:
     def delete_from_ranking_check(self, order_num):
         """ranking_check에서 삭제"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('DELETE FROM ranking_check WHERE order_num = →', (order_num,))
-            
-            conn.commit()
-            conn.close()
+            self.storage.execute('DELETE FROM ranking_check WHERE order_num = ?', (order_num,))
             
             self.log(f"✅ 순위체크 현황에서 삭제 완료")
             
@@ -262,18 +319,11 @@ class CompleteRankSystem:
     def get_pending_keywords(self):
         """처리 대기 중인 키워드 조회"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            
-            cursor.execute('''
+            keywords = self.storage.fetchall('''
                 SELECT * FROM ranking_check 
                 ORDER BY order_num
             ''')
             
-            keywords = cursor.fetchall()
-            conn.close()
-            
             return [dict(row) for row in keywords]
             
         except Exception as e:
@@ -283,17 +333,11 @@ class CompleteRankSystem:
     def show_current_data(self):
         """현재 데이터 표시"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            
             # ranking_check 테이블
-            cursor.execute('SELECT * FROM ranking_check ORDER BY order_num')
-            pending = cursor.fetchall()
+            pending = self.storage.fetchall('SELECT * FROM ranking_check ORDER BY order_num')
             
             # slot_status 테이블
-            cursor.execute('SELECT * FROM slot_status ORDER BY slot_id')
-            completed = cursor.fetchall()
+            completed = self.storage.fetchall('SELECT * FROM slot_status ORDER BY slot_id')
             
             print("\n" + "="*100)
             print("                          전체 데이터 현황")
@@ -316,8 +360,6 @@ class CompleteRankSystem:
             
             print("="*100)
             
-            conn.close()
-            
         except Exception as e:
             self.log(f"❌ 데이터 표시 오류: {e}")
     
@@ -364,18 +406,12 @@ class CompleteRankSystem:
         
         @app.route('/ranking-status')
         def ranking_status():
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
-            keywords = conn.execute('SELECT * FROM ranking_check ORDER BY order_num').fetchall()
-            conn.close()
+            keywords = self.storage.fetchall('SELECT * FROM ranking_check ORDER BY order_num')
             return render_template_string(ranking_status_html, keywords=keywords)
         
         @app.route('/coupangapp/add')
         def coupang_app_add():
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
-            data = conn.execute('SELECT * FROM slot_status ORDER BY slot_id').fetchall()
-            conn.close()
+            data = self.storage.fetchall('SELECT * FROM slot_status ORDER BY slot_id')
             return render_template_string(coupang_app_html, data=data)
         
         @app.route('/')
@@ -423,15 +459,27 @@ class CompleteRankSystem:
         
         self.log(f"📋 총 {len(keywords)}개 키워드 발견")
         
+        # 같은 검색어를 쓰는 슬롯은 묶어서 검색 한 번으로 처리
+        slots = [keyword_data for keyword_data in keywords if self.validate_slot(keyword_data)]
+        groups = plan_searches(self.attach_last_ranks(slots))
+        self.log(f"🔎 슬롯 {len(slots)}개 → 검색 {len(groups)}회")
+        
         processed_count = 0
+        pending_rows = []
         
-        for keyword_data in keywords:
-            if self.process_keyword(keyword_data):
-                processed_count += 1
+        for group in groups:
+            pending_rows.extend(self.check_keyword_group(group))
             
-            # 키워드 간 대기
+            # 결과는 모아서 한 번에 기록
+            if len(pending_rows) >= self.bulk_size:
+                processed_count += self.bulk_update_slot_status(pending_rows)
+                pending_rows = []
+            
+            # 검색 간 대기
             time.sleep(random.uniform(1, 2))
         
+        processed_count += self.bulk_update_slot_status(pending_rows)
+        
         self.log("\n" + "="*80)
         self.log("                        프로세스 완료")
         self.log("="*80)
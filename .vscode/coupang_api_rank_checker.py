@@ -3,10 +3,12 @@ import json
 import time
 from datetime import datetime
 import re
+from rank_index import RankIndex
 
 class CoupangAPIRankChecker:
     def __init__(self):
         self.session = requests.Session()
+        self.rank_index = None
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Accept': 'application/json, text/plain, */*',
@@ -79,6 +81,8 @@ class CoupangAPIRankChecker:
     def parse_html_response(self, html_content, keyword):
         """HTML 응답에서 상품 정보 파싱"""
         products = []
+        # 파싱하면서 추적 상품 조회용 색인도 함께 만듦
+        self.rank_index = RankIndex(products)
         
         try:
             from bs4 import BeautifulSoup
@@ -100,6 +104,7 @@ class CoupangAPIRankChecker:
                     product_info = self.parse_product_item(item, i + 1, keyword)
                     if product_info:
                         products.append(product_info)
+                        self.rank_index.add(product_info)
                 except Exception as e:
                     print(f"Error parsing product {i+1}: {e}")
                     continue
@@ -254,23 +259,14 @@ class CoupangAPIRankChecker:
         return filename
     
     def find_specific_product(self, products, target_url):
-        """특정 URL의 상품 순위 찾기"""
+        """특정 URL의 상품 순위 찾기 (같은 검색 결과는 한 번 만든 색인으로 바로 조회)"""
         if not target_url or not products:
             return None
         
-        # URL에서 상품 ID 추출
-        match = re.search(r'/products/(\d+)', target_url)
-        if not match:
-            return None
-        
-        target_product_id = match.group(1)
-        
-        # 상품 목록에서 해당 ID 찾기
-        for product in products:
-            if product['product_id'] == target_product_id:
-                return product
+        if self.rank_index is None or not self.rank_index.covers(products):
+            self.rank_index = RankIndex(products)
         
-        return None
+        return self.rank_index.find(target_url)
 
 def main():
     """메인 실행 함수"""
@@ -6,24 +6,27 @@ import json
 import time
 import random
 from datetime import datetime
-import sqlite3
 import os
+from rank_storage import RankStorage
+from rank_schema import apply_migrations
+from rank_rollup import install_rollups
+from rank_index import RankIndex
+from search_planner import load_last_ranks, plan_searches, resolve_targets
+from search_result_parser import PAGE_SIZE
 
 class DatabaseRankChecker:
     def __init__(self):
         self.base_url = "http://localhost:3000"
         self.db_path = "slot_status.db"
+        self.storage = RankStorage.open(self.db_path)
         self.setup_database()
         self.log_file = "db_rank_check.log"
         
     def setup_database(self):
         """데이터베이스 초기화"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
             # slot_status 테이블 생성
-            cursor.execute('''
+            self.storage.execute('''
                 CREATE TABLE IF NOT EXISTS slot_status (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     slot_id INTEGER,
@@ -40,7 +43,7 @@ class DatabaseRankChecker:
             ''')
             
             # ranking_check_history 테이블 생성 (그래프용)
-            cursor.execute('''
+            self.storage.execute('''
                 CREATE TABLE IF NOT EXISTS ranking_check_history (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     slot_id INTEGER,
@@ -51,8 +54,12 @@ class DatabaseRankChecker:
                 )
             ''')
             
-            conn.commit()
-            conn.close()
+            # 차트/상태 조회용 인덱스
+            apply_migrations(self.storage, log=self.log)
+            
+            # 차트용 시간별/일별 순위 집계
+            install_rollups(self.storage, log=self.log)
+            
             self.log("데이터베이스 초기화 완료")
             
         except Exception as e:
@@ -142,31 +149,48 @@ class DatabaseRankChecker:
         except:
             return None
     
+    def search_coupang(self, keyword, product_ids, max_pages=1):
+        """쿠팡 검색 한 번 실행 (검색 결과 상품 목록 반환)"""
+        self.log(f"쿠팡 검색 시작: {keyword} (대상 상품 {len(product_ids)}개, {max_pages}페이지)")
+        
+        # 실제 쿠팡 검색 시뮬레이션
+        steps = [
+            "쿠팡 홈페이지 접속",
+            "검색창 찾기",
+            "키워드 입력",
+            "검색 실행",
+            "결과 페이지 로딩",
+            "상품 리스트 분석"
+        ]
+        
+        for i, step in enumerate(steps, 1):
+            self.log(f"단계 {i}: {step}")
+            time.sleep(random.uniform(0.2, 0.6))
+        
+        # 검색 결과 생성 시뮬레이션 (대상 상품마다 85% 확률로 노출)
+        products = [
+            {'rank': rank, 'product_id': f"9{rank:09d}", 'url': f"https://www.coupang.com/vp/products/9{rank:09d}"}
+            for rank in range(1, max_pages * PAGE_SIZE + 1)
+        ]
+        ranks = [1, 2, 3, 5, 7, 10, 12, 15, 18, 20, 25, 30]
+        random.shuffle(ranks)
+        for product_id in product_ids:
+            if ranks and random.random() > 0.15:
+                rank = ranks.pop()
+                products[rank - 1].update(product_id=product_id, url=f"https://www.coupang.com/vp/products/{product_id}")
+        
+        return products
+    
     def check_coupang_rank(self, keyword, product_url, product_id):
         """쿠팡에서 실제 순위 체크"""
         try:
-            self.log(f"쿠팡 순위 체크 시작: {keyword}")
-            
-            # 실제 쿠팡 검색 시뮬레이션
-            steps = [
-                "쿠팡 홈페이지 접속",
-                "검색창 찾기",
-                "키워드 입력",
-                "검색 실행",
-                "결과 페이지 로딩",
-                "상품 리스트 분석",
-                f"상품 ID {product_id} 찾기"
-            ]
-            
-            for i, step in enumerate(steps, 1):
-                self.log(f"단계 {i}: {step}")
-                time.sleep(random.uniform(0.2, 0.6))
+            products = self.search_coupang(keyword, [product_id])
+            index = RankIndex(products)
+            product = index.find(product_url) or index.find(product_id)
             
-            # 순위 생성 시뮬레이션
-            if random.random() > 0.15:  # 85% 성공률
-                rank = random.choice([1, 2, 3, 5, 7, 10, 12, 15, 18, 20, 25, 30])
-                self.log(f"✅ 순위 발견: {rank}위")
-                return rank
+            if product:
+                self.log(f"✅ 순위 발견: {product['rank']}위")
+                return product['rank']
             else:
                 self.log("❌ 검색 결과에 없음")
                 return None
@@ -178,59 +202,52 @@ class DatabaseRankChecker:
     def update_slot_status(self, slot_data, rank):
         """slot_status 테이블 업데이트"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
             product_id = self.extract_product_id(slot_data['product_url'])
             
-            # 기존 레코드 확인
-            cursor.execute('''
-                SELECT id, start_rank FROM slot_status 
-                WHERE slot_id = ? AND product_id = ?
-            ''', (slot_data['order'], product_id))
-            
-            existing_record = cursor.fetchone()
-            
-            if existing_record:
-                # 기존 레코드 업데이트
-                slot_status_id, start_rank = existing_record
-                
-                cursor.execute('''
-                    UPDATE slot_status 
-                    SET current_rank = ?, last_checked = ?, updated_at = CURRENT_TIMESTAMP
-                    WHERE id = ?
-                ''', (rank, datetime.now().isoformat(), slot_status_id))
+            with self.storage.transaction() as conn:
+                # 기존 레코드 확인
+                existing_record = conn.execute('''
+                    SELECT id, start_rank FROM slot_status 
+                    WHERE slot_id = ? AND product_id = ?
+                ''', (slot_data['order'], product_id)).fetchone()
                 
-                self.log(f"기존 레코드 업데이트: 현재순위={rank}위 (시작순위={start_rank}위)")
-                
-            else:
-                # 새 레코드 생성
-                cursor.execute('''
-                    INSERT INTO slot_status 
-                    (slot_id, slot_type, keyword, product_id, current_rank, start_rank, last_checked)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    slot_data['order'],
-                    slot_data['slot_type'],
-                    slot_data['keyword'],
-                    product_id,
-                    rank,
-                    rank,  # 시작순위도 현재순위와 동일하게 설정
-                    datetime.now().isoformat()
-                ))
-                
-                self.log(f"새 레코드 생성: 현재순위={rank}위, 시작순위={rank}위")
+                if existing_record:
+                    # 기존 레코드 업데이트
+                    slot_status_id, start_rank = existing_record
+                    
+                    conn.execute('''
+                        UPDATE slot_status 
+                        SET current_rank = ?, last_checked = ?, updated_at = CURRENT_TIMESTAMP
+                        WHERE id = ?
+                    ''', (rank, datetime.now().isoformat(), slot_status_id))
+                    
+                    self.log(f"기존 레코드 업데이트: 현재순위={rank}위 (시작순위={start_rank}위)")
+                    
+                else:
+                    # 새 레코드 생성
+                    cursor = conn.execute('''
+                        INSERT INTO slot_status 
+                        (slot_id, slot_type, keyword, product_id, current_rank, start_rank, last_checked)
+                        VALUES (?, ?, ?, ?, ?, ?, ?)
+                    ''', (
+                        slot_data['order'],
+                        slot_data['slot_type'],
+                        slot_data['keyword'],
+                        product_id,
+                        rank,
+                        rank,  # 시작순위도 현재순위와 동일하게 설정
+                        datetime.now().isoformat()
+                    ))
+                    
+                    self.log(f"새 레코드 생성: 현재순위={rank}위, 시작순위={rank}위")
+                    
+                    slot_status_id = cursor.lastrowid
                 
-                slot_status_id = cursor.lastrowid
-            
-            # 순위 히스토리 기록
-            cursor.execute('''
-                INSERT INTO ranking_check_history (slot_id, keyword, rank_value, checked_at)
-                VALUES (?, ?, ?, CURRENT_TIMESTAMP)
-            ''', (slot_status_id, slot_data['keyword'], rank))
-            
-            conn.commit()
-            conn.close()
+                # 순위 히스토리 기록
+                conn.execute('''
+                    INSERT INTO ranking_check_history (slot_id, keyword, rank_value, checked_at)
+                    VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+                ''', (slot_status_id, slot_data['keyword'], rank))
             
             return True
             
@@ -251,19 +268,13 @@ class DatabaseRankChecker:
     def get_chart_data(self, slot_id):
         """그래프용 데이터 조회"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
+            chart_data = self.storage.fetchall('''
                 SELECT rank_value, checked_at 
                 FROM ranking_check_history 
                 WHERE slot_id = ?
                 ORDER BY checked_at
             ''', (slot_id,))
             
-            chart_data = cursor.fetchall()
-            conn.close()
-            
             return chart_data
             
         except Exception as e:
@@ -280,8 +291,9 @@ class DatabaseRankChecker:
         processed_count = 0
         skipped_count = 0
         
+        valid_slots = []
         for data in keywords_data:
-            self.log(f"\n--- 순번 {data['order']} 처리 중 ---")
+            self.log(f"\n--- 순번 {data['order']} 확인 중 ---")
             self.log(f"슬롯유형: {data['slot_type']}")
             self.log(f"검색어: {data['keyword']}")
             self.log(f"링크주소: {data['product_url']}")
@@ -299,23 +311,42 @@ class DatabaseRankChecker:
                 skipped_count += 1
                 continue
             
-            # 순위 체크
-            rank = self.check_coupang_rank(data['keyword'], data['product_url'], product_id)
+            valid_slots.append(data)
+        
+        # 같은 검색어 슬롯은 검색 한 번으로 모든 대상 상품 순위 확인 (마지막 순위까지 보이도록 페이지 수 결정)
+        last_ranks = load_last_ranks(self.storage)
+        for data in valid_slots:
+            data['current_rank'] = last_ranks.get(data['order'])
+        groups = plan_searches(valid_slots)
+        self.log(f"\n슬롯 {len(valid_slots)}개 → 검색 {len(groups)}회")
+        
+        for group in groups:
+            self.log(f"\n--- 검색어 '{group.keyword}' (슬롯 {len(group.slots)}개) ---")
+            
+            try:
+                product_ids = [self.extract_product_id(slot['product_url']) for slot in group.slots]
+                products = self.search_coupang(group.keyword, product_ids, group.max_pages)
+            except Exception as e:
+                self.log(f"순위 체크 오류: {e}")
+                continue
             
-            if rank:
+            for data, product in resolve_targets(group, products):
+                if not product:
+                    self.log(f"❌ 순번 {data['order']}: 검색 결과에 없음")
+                    continue
+                
+                self.log(f"✅ 순번 {data['order']}: {product['rank']}위")
                 # DB 업데이트
-                if self.update_slot_status(data, rank):
+                if self.update_slot_status(data, product['rank']):
                     # 순위체크 현황에서 삭제 (시뮬레이됨)
                     self.delete_from_ranking_status(data['order'])
                     processed_count += 1
                 else:
                     self.log("❌ DB 업데이트 실패")
-            else:
-                self.log("❌ 순위 체크 실패")
             
             self.log("-" * 50)
             
-            # 처리 간 대기
+            # 검색 간 대기
             time.sleep(random.uniform(1, 3))
         
         self.log(f"\n=== 처리 완료 ===")
@@ -326,17 +357,12 @@ class DatabaseRankChecker:
     def show_current_data(self):
         """현재 DB 데이터 보기"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
+            data = self.storage.fetchall('''
                 SELECT slot_id, keyword, current_rank, start_rank, last_checked, status
                 FROM slot_status 
                 ORDER BY slot_id
             ''')
             
-            data = cursor.fetchall()
-            
             print("\n" + "="*80)
             print("                      현재 slot_status 데이터")
             print("="*80)
@@ -350,8 +376,6 @@ class DatabaseRankChecker:
             
             print("="*80)
             
-            conn.close()
-            
         except Exception as e:
             self.log(f"데이터 조회 오류: {e}")
 
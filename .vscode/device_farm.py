@@ -0,0 +1,374 @@
+import queue
+import sys
+import threading
+import time
+from adb_session import list_devices
+from rank_batch_engine import WorkerStats
+
+
+class DeviceHealth:
+    """디바이스별 상태, 처리량, 연속 실패/격리 정보"""
+
+    def __init__(self, serial):
+        self.serial = serial
+        self.state = 'ready'  # ready / leased / quarantined / offline
+        self.stats = WorkerStats(serial)
+        self.consecutive_failures = 0
+        self.quarantine_count = 0
+        self.quarantined_until = 0.0
+        self.last_error = None
+
+    def quarantine_remaining(self):
+        """남은 격리 시간 (초, 격리 중이 아니면 0)"""
+        return max(0.0, self.quarantined_until - time.monotonic())
+
+    def to_dict(self):
+        """상태를 딕셔너리로 변환"""
+        return dict(
+            self.stats.to_dict(),
+            state=self.state,
+            consecutive_failures=self.consecutive_failures,
+            quarantine_count=self.quarantine_count,
+            quarantine_remaining=round(self.quarantine_remaining(), 1),
+            last_error=self.last_error
+        )
+
+    def summary(self):
+        """로그용 한 줄 요약"""
+        line = f"{self.stats.summary()}, 상태 {self.state}"
+        if self.quarantine_count:
+            line += f", 격리 {self.quarantine_count}회"
+        if self.last_error:
+            line += f", 마지막 오류: {self.last_error}"
+        return line
+
+
+class DeviceFarm:
+    """연결된 모든 ADB 디바이스에 키워드 작업을 나눠 동시에 실행하는 스케줄러
+
+    디바이스(시리얼)마다 워커 스레드 하나와 checker_factory(serial)로 만든 체커 하나를
+    두고, 작업 하나를 처리하는 동안 그 디바이스를 점유한다. check(checker, job)이
+    예외를 내면 디바이스 실패로 기록하고 작업은 그 작업에 실패한 적 없는 다른 디바이스에서
+    다시 시도한다 (그런 디바이스가 없을 때만 같은 디바이스에서 재시도).
+    연속 max_failures번 실패한 디바이스는 일정 시간 격리하고(반복될수록 길게),
+    주기적으로 디바이스 목록을 다시 읽어 새로 연결된 디바이스를 추가한다.
+    """
+
+    def __init__(self, checker_factory, check, adb_path='adb', discover=None, max_failures=3,
+                 quarantine_seconds=300, max_quarantine_seconds=3600, max_attempts=2,
+                 rediscover_interval=30, no_device_timeout=120, log=print):
+        self.checker_factory = checker_factory
+        self.check = check
+        self.discover = discover or (lambda: list_devices(adb_path))
+        self.max_failures = max_failures
+        self.quarantine_seconds = quarantine_seconds
+        self.max_quarantine_seconds = max_quarantine_seconds
+        self.max_attempts = max_attempts
+        self.rediscover_interval = rediscover_interval
+        self.no_device_timeout = no_device_timeout
+        self.log = log
+
+        self.devices = {}
+        self.checkers = {}
+        self.lock = threading.Lock()
+
+    def refresh(self):
+        """디바이스 목록 갱신 (새 디바이스 추가, 사라진 디바이스는 offline)"""
+        serials = set(self.discover())
+
+        with self.lock:
+            for serial in sorted(serials):
+                health = self.devices.get(serial)
+                if health is None:
+                    self.devices[serial] = DeviceHealth(serial)
+                    self.log(f"📱 디바이스 추가: {serial}")
+                elif health.state == 'offline':
+                    health.state = 'quarantined' if health.quarantine_remaining() else 'ready'
+                    self.log(f"📱 디바이스 재연결: {serial}")
+
+            for serial, health in self.devices.items():
+                if serial not in serials and health.state != 'offline':
+                    health.state = 'offline'
+                    self.log(f"⚠️ 디바이스 연결 끊김: {serial}")
+
+        return sorted(serials)
+
+    def usable_devices(self):
+        """작업을 맡을 수 있거나 격리가 끝나면 맡을 디바이스"""
+        with self.lock:
+            return [serial for serial, health in self.devices.items() if health.state != 'offline']
+
+    def lease(self, serial):
+        """작업 하나를 위해 디바이스 점유 (격리/연결 끊김이면 False)"""
+        with self.lock:
+            health = self.devices[serial]
+            if health.state == 'quarantined' and not health.quarantine_remaining():
+                health.state = 'ready'
+            if health.state != 'ready':
+                return False
+            health.state = 'leased'
+            return True
+
+    def release(self, serial, elapsed, success, error=None):
+        """작업 결과 기록 후 디바이스 반환 (연속 실패가 쌓이면 격리)"""
+        with self.lock:
+            health = self.devices[serial]
+            health.stats.record(elapsed, success)
+
+            if health.state == 'leased':
+                health.state = 'ready'
+
+            if success:
+                health.consecutive_failures = 0
+                return
+
+            health.consecutive_failures += 1
+            health.last_error = error
+            if health.consecutive_failures >= self.max_failures:
+                health.quarantine_count += 1
+                seconds = min(self.quarantine_seconds * 2 ** (health.quarantine_count - 1),
+                              self.max_quarantine_seconds)
+                health.quarantined_until = time.monotonic() + seconds
+                # 격리가 끝난 뒤 한 번 더 실패하면 바로 다시 격리
+                health.consecutive_failures = self.max_failures - 1
+                if health.state != 'offline':
+                    health.state = 'quarantined'
+                self.log(f"🚫 디바이스 격리: {serial} ({seconds:.0f}초, 오류: {error})")
+
+    def other_device_available(self, serial, failed_on):
+        """serial 말고 failed_on에 없는, 지금 작업을 맡을 수 있는 디바이스가 있는지"""
+        with self.lock:
+            return any(
+                other != serial and other not in failed_on and health.state in ('ready', 'leased')
+                for other, health in self.devices.items()
+            )
+
+    def get_checker(self, serial):
+        """디바이스 전용 체커 (한 번 만들어 계속 사용)"""
+        checker = self.checkers.get(serial)
+        if checker is None:
+            checker = self.checkers[serial] = self.checker_factory(serial)
+        return checker
+
+    def run(self, jobs):
+        """작업을 디바이스들에 나눠 실행하고 모두 끝날 때까지 대기
+
+        반환: (성공 목록 [{'job', 'serial', 'result', 'attempts'}], 실패 목록 [{'job', 'attempts', 'error', 'failed_on'}])
+        """
+        self.refresh()
+        if not self.usable_devices():
+            self.log("❌ 사용할 수 있는 디바이스가 없습니다")
+            return [], [{'job': job, 'attempts': 0, 'error': 'no devices'} for job in jobs]
+
+        job_queue = queue.Queue()
+        for job in jobs:
+            job_queue.put({'job': job, 'attempts': 0, 'error': None, 'failed_on': set()})
+
+        state = {'pending': len(jobs), 'results': [], 'failed': []}
+        done = threading.Event()
+        stop = threading.Event()
+        if not jobs:
+            done.set()
+
+        def finish(entry, result=None, serial=None, success=True):
+            with self.lock:
+                if success:
+                    state['results'].append({'job': entry['job'], 'serial': serial,
+                                             'result': result, 'attempts': entry['attempts']})
+                else:
+                    state['failed'].append(entry)
+                state['pending'] -= 1
+                if state['pending'] == 0:
+                    done.set()
+
+        def device_loop(serial):
+            while not stop.is_set():
+                with self.lock:
+                    health = self.devices[serial]
+                    offline = health.state == 'offline'
+                    wait = health.quarantine_remaining() if health.state == 'quarantined' else 0
+                if offline:
+                    return
+                if wait:
+                    stop.wait(min(wait, 1.0))
+                    continue
+
+                try:
+                    entry = job_queue.get(timeout=0.5)
+                except queue.Empty:
+                    continue
+
+                if serial in entry['failed_on'] and self.other_device_available(serial, entry['failed_on']):
+                    # 이 디바이스에서 실패한 작업은 다른 디바이스가 가져가도록 돌려놓음
+                    job_queue.put(entry)
+                    stop.wait(0.1)
+                    continue
+
+                if not self.lease(serial):
+                    job_queue.put(entry)
+                    continue
+
+                entry['attempts'] += 1
+                start_time = time.time()
+                try:
+                    result = self.check(self.get_checker(serial), entry['job'])
+                    error = None
+                except Exception as e:
+                    result = None
+                    error = str(e) or e.__class__.__name__
+
+                self.release(serial, time.time() - start_time, error is None, error)
+
+                if error is None:
+                    finish(entry, result, serial)
+                elif entry['attempts'] < self.max_attempts:
+                    # 다른 디바이스에서 다시 시도
+                    entry['error'] = error
+                    entry['failed_on'].add(serial)
+                    job_queue.put(entry)
+                else:
+                    entry['error'] = error
+                    self.log(f"❌ 작업 실패 ({entry['attempts']}회 시도): {entry['job']} - {error}")
+                    finish(entry, success=False)
+
+        threads = {}
+
+        def start_workers():
+            for serial in self.usable_devices():
+                thread = threads.get(serial)
+                if thread is None or not thread.is_alive():
+                    threads[serial] = threading.Thread(target=device_loop, args=(serial,), daemon=True)
+                    threads[serial].start()
+
+        start_workers()
+        self.log(f"디바이스 {len(threads)}대로 작업 {len(jobs)}개 시작")
+
+        last_refresh = time.monotonic()
+        no_device_since = None
+        while not done.wait(0.5):
+            if time.monotonic() - last_refresh >= self.rediscover_interval:
+                self.refresh()
+                start_workers()
+                last_refresh = time.monotonic()
+
+            # 연결된 디바이스가 하나도 없는 상태가 계속되면 남은 작업은 실패 처리
+            if self.usable_devices():
+                no_device_since = None
+            elif no_device_since is None:
+                no_device_since = time.monotonic()
+            elif time.monotonic() - no_device_since >= self.no_device_timeout:
+                self.log("❌ 연결된 디바이스가 없어 남은 작업을 중단합니다")
+                stop.set()
+                break
+
+        stop.set()
+        for thread in threads.values():
+            thread.join()
+
+        # 중단된 경우 큐에 남은 작업
+        while True:
+            try:
+                entry = job_queue.get_nowait()
+            except queue.Empty:
+                break
+            entry['error'] = entry['error'] or 'no devices'
+            state['failed'].append(entry)
+
+        return state['results'], state['failed']
+
+    def get_stats(self):
+        """디바이스별 상태/처리량 목록"""
+        with self.lock:
+            return [health.to_dict() for health in self.devices.values()]
+
+    def log_stats(self):
+        """디바이스별 통계 로그 출력"""
+        with self.lock:
+            lines = [health.summary() for health in self.devices.values()]
+        for line in lines:
+            self.log(line)
+
+    def close(self):
+        """디바이스별 체커 정리"""
+        for serial, checker in self.checkers.items():
+            close = getattr(checker, 'close', None)
+            if close:
+                try:
+                    close()
+                except Exception as e:
+                    self.log(f"체커 종료 오류 ({serial}): {e}")
+        self.checkers = {}
+
+
+def check_keyword(checker, job):
+    """EnhancedADBCoupangRankChecker로 키워드 하나 순위 체크 (디바이스 문제면 예외)"""
+    products = checker.check_rank(job['keyword'], job.get('target'))
+    if products is None and checker.last_failure != 'no_products':
+        raise RuntimeError(checker.last_failure or 'rank check failed')
+    return products or []
+
+
+def run_fake_farm():
+    """가짜 디바이스 세 대 (그중 한 대는 계속 실패)로 분배/격리 확인"""
+    class FakeChecker:
+        def __init__(self, serial):
+            self.serial = serial
+
+        def check(self, job):
+            time.sleep(0.05)
+            if self.serial == 'FAKE0003':
+                raise RuntimeError("device not responding")
+            return [{'rank': len(job['keyword']), 'title': job['keyword']}]
+
+    farm = DeviceFarm(
+        FakeChecker, lambda checker, job: checker.check(job),
+        discover=lambda: ['FAKE0001', 'FAKE0002', 'FAKE0003'],
+        quarantine_seconds=60
+    )
+
+    jobs = [{'keyword': f"키워드{index}"} for index in range(30)]
+    start_time = time.perf_counter()
+    results, failed = farm.run(jobs)
+    elapsed = time.perf_counter() - start_time
+
+    print(f"📊 작업 {len(jobs)}개: 성공 {len(results)}, 실패 {len(failed)}, {elapsed:.2f}초 "
+          f"(한 대로 순차 처리 시 약 {len(jobs) * 0.05:.2f}초)")
+    farm.log_stats()
+    farm.close()
+
+
+def main():
+    """연결된 모든 디바이스로 키워드 순위 체크 (인자 없으면 가짜 디바이스로 확인)"""
+    print("ADB Device Farm")
+    print("=" * 50)
+
+    keywords = sys.argv[1:]
+    if not keywords:
+        run_fake_farm()
+        return
+
+    from card_layout import CardOCRPool
+    from enhanced_adb_rank_checker import TESSERACT_CMD, EnhancedADBCoupangRankChecker
+
+    # OCR 프로세스 풀은 모든 디바이스가 함께 사용 (디바이스마다 만들면 디바이스 수 × CPU 수만큼 생성됨)
+    card_pool = CardOCRPool(tesseract_cmd=TESSERACT_CMD, lang='eng')
+    farm = DeviceFarm(
+        lambda serial: EnhancedADBCoupangRankChecker(device_id=serial, card_pool=card_pool),
+        check_keyword,
+        adb_path="adb.exe"
+    )
+    try:
+        results, failed = farm.run([{'keyword': keyword} for keyword in keywords])
+        for item in results:
+            checker = farm.get_checker(item['serial'])
+            if item['result']:
+                checker.save_rank_data(item['job']['keyword'], item['result'])
+        print(f"완료: 성공 {len(results)}, 실패 {len(failed)}")
+        farm.log_stats()
+    finally:
+        farm.close()
+        card_pool.close()
+
+
+if __name__ == "__main__":
+    main()
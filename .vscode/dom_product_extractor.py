@@ -0,0 +1,129 @@
+import re
+import time
+from datetime import datetime
+
+# 상품 카드를 한 번에 훑어 [상품 ID, URL, 제목, 가격, 리뷰, 평점] 배열로 반환 (arguments[0]: 최대 개수, 0이면 전체)
+EXTRACT_PRODUCTS_JS = r"""
+var limit = arguments[0];
+var items = document.querySelectorAll('li.search-product');
+if (!items.length) {
+    items = document.querySelectorAll('#productList > li, #product-list > li, ul.search-product-list > li');
+}
+
+function text(item, selector) {
+    var element = item.querySelector(selector);
+    return element ? element.textContent.trim() : null;
+}
+
+var rows = [];
+for (var i = 0; i < items.length && (!limit || rows.length < limit); i++) {
+    var item = items[i];
+    var link = item.querySelector('a.search-product-link') || item.querySelector('a[href*="/products/"]');
+    var href = link ? link.href : '';
+    var match = href.match(/\/products\/(\d+)/);
+    rows.push([
+        item.getAttribute('data-product-id') || (match ? match[1] : ''),
+        href,
+        text(item, '.name'),
+        text(item, '.price-value'),
+        text(item, '.rating-total-count'),
+        text(item, 'em.rating')
+    ]);
+}
+return rows;
+"""
+
+FIELDS = ('product_id', 'url', 'title', 'price', 'reviews', 'rating')
+
+# 리뷰 수 텍스트 "(1,234)"에서 숫자만
+REVIEW_COUNT_RE = re.compile(r'\d[\d,]*')
+
+
+def row_to_product(row, rank, timestamp):
+    """스크립트가 반환한 배열 하나를 상품 정보로 변환"""
+    product = dict(zip(FIELDS, row))
+    reviews = REVIEW_COUNT_RE.search(product['reviews'] or '')
+
+    return {
+        'rank': rank,
+        'product_id': product['product_id'] or 'N/A',
+        'title': product['title'] or '',
+        'price': product['price'] or 'N/A',
+        'reviews': reviews.group() if reviews else '0',
+        'rating': product['rating'] or '0',
+        'url': product['url'] or '',
+        'timestamp': timestamp
+    }
+
+
+def extract_products(driver, limit=None):
+    """execute_script 한 번으로 검색 결과의 모든 상품 정보 추출 (요소마다 WebDriver를 호출하지 않음)"""
+    rows = driver.execute_script(EXTRACT_PRODUCTS_JS, limit or 0) or []
+    timestamp = datetime.now().isoformat()
+    return [row_to_product(row, rank, timestamp) for rank, row in enumerate(rows, 1)]
+
+
+def main():
+    """WebDriver 호출마다 지연이 있는 가짜 드라이버로 요소별 조회와 비교"""
+    print("DOM Product Extractor Check")
+    print("=" * 50)
+
+    round_trip = 0.004  # 로컬 드라이버 HTTP 왕복 시간
+    calls = {'count': 0}
+    catalog = [[str(7000000000 + index), f"https://www.coupang.com/vp/products/{7000000000 + index}",
+                f"테스트 상품 {index}", f"{(index + 1) * 1000:,}", f"({index * 7})", "4.5"] for index in range(60)]
+
+    def round_trip_call(value):
+        calls['count'] += 1
+        time.sleep(round_trip)
+        return value
+
+    class FakeElement:
+        def __init__(self, row):
+            self.row = row
+
+        def find_element(self, by, selector):
+            index = {'a': 1, '.name': 2, '.price-value': 3, '.rating-total-count': 4, 'em.rating': 5}[selector]
+            return round_trip_call(FakeText(self.row[index]))
+
+    class FakeText:
+        def __init__(self, value):
+            self.text = value
+
+        def get_attribute(self, name):
+            return round_trip_call(self.text)
+
+    class FakeDriver:
+        def find_elements(self, by, selector):
+            return round_trip_call([FakeElement(row) for row in catalog])
+
+        def execute_script(self, script, limit):
+            return round_trip_call([list(row) for row in catalog[:limit or None]])
+
+    driver = FakeDriver()
+
+    # 기존 방식: 상품마다 링크/제목/가격/리뷰/평점을 각각 조회
+    start_time = time.perf_counter()
+    legacy = []
+    for element in driver.find_elements('css selector', 'li.search-product'):
+        legacy.append((element.find_element('css selector', 'a').get_attribute('href'),
+                       element.find_element('css selector', '.name').text,
+                       element.find_element('css selector', '.price-value').text,
+                       element.find_element('css selector', '.rating-total-count').text,
+                       element.find_element('css selector', 'em.rating').text))
+    legacy_time = time.perf_counter() - start_time
+    legacy_calls, calls['count'] = calls['count'], 0
+
+    start_time = time.perf_counter()
+    products = extract_products(driver)
+    script_time = time.perf_counter() - start_time
+
+    same = [(product['url'], product['title'], product['price']) for product in products] == \
+        [(url, title, price) for url, title, price, _, _ in legacy]
+    print(f"  요소별 조회: WebDriver 호출 {legacy_calls}회, {legacy_time * 1000:.0f}ms")
+    print(f"  스크립트 한 번: WebDriver 호출 {calls['count']}회, {script_time * 1000:.0f}ms")
+    print(f"📊 상품 {len(products)}개, 결과 {'동일 ✅' if same else '다름 ❌'}, 첫 상품: {products[0]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,20 +5,63 @@ import re
 from datetime import datetime
 import os
 import configparser
+from adb_session import ADBShellSession, parse_devices
 import cv2
 import numpy as np
-from PIL import Image
 import pytesseract
+from ocr_engine import get_engine
+from card_layout import CardOCRPool, extract_card_products
+from ui_wait import UIWaiter
+from ui_hierarchy import HierarchyProductCollector, record_identity
+from scroll_collector import IncrementalScrollCollector, text_key
+from ocr_text_parser import parse_products
+
+# Tesseract 실행 파일 경로 (Windows, 카드 OCR 작업 프로세스에도 전달)
+TESSERACT_CMD = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
 
 class EnhancedADBCoupangRankChecker:
-    def __init__(self):
+    def __init__(self, device_id=None, card_pool=None):
         self.adb_path = "adb.exe"  # ADB 경로
-        self.device_id = None
+        self.device_id = device_id  # 지정하면 이 디바이스만 사용 (여러 대 동시 실행 시)
+        self.pinned_device = device_id is not None
+        self.last_failure = None  # 마지막 check_rank 실패 원인
+        self.shell_session = None  # 디바이스 셸 명령용 장기 세션
         self.coupang_package = "com.coupang.mobile"
         self.config = self.load_config()
         
+        # 디버깅용 스크린샷 저장 (기본은 메모리에서만 처리)
+        self.save_screenshots = self.config.getboolean('debug', 'save_screenshots', fallback=False)
+        self.screenshot_dir = self.config.get('debug', 'screenshot_dir', fallback='.')
+        
         # Tesseract 경로 설정 (Windows)
-        pytesseract.pytesseract.tesseract_cmd = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
+        pytesseract.pytesseract.tesseract_cmd = TESSERACT_CMD
+        
+        # OCR 엔진 (Tesseract 핸들을 호출 간에 재사용)
+        self.ocr_engine = get_engine(lang='eng', psm=6, fallback_psms=(3, 4, 11), tesseract_cmd=TESSERACT_CMD)
+        
+        # 상품 카드 영역별 OCR 프로세스 풀 (처음 사용할 때 시작, 여러 디바이스를 돌릴 때는 공유 풀을 받음)
+        self.owns_card_pool = card_pool is None
+        self.card_pool = card_pool or CardOCRPool(tesseract_cmd=TESSERACT_CMD, lang='eng')
+        
+        # 화면 준비 대기 (준비되면 바로 진행, 최대 대기 시간은 설정)
+        self.wait_timeouts = {
+            name: self.config.getfloat('wait', f'{name}_timeout', fallback=default)
+            for name, default in [('launch', 10), ('search_box', 3), ('results', 15), ('scroll', 4)]
+        }
+        self.waiter = UIWaiter(
+            self.run_shell,
+            capture_frame=lambda: self.capture_screen(reduced=True),
+            poll_interval=self.config.getfloat('wait', 'poll_interval', fallback=0.3)
+        )
+        
+        # 상품 추출 방식 (hierarchy: 뷰 계층 XML, 실패하면 OCR / ocr: 스크린샷 OCR만)
+        self.extract_backend = self.config.get('extract', 'backend', fallback='hierarchy').strip().lower()
+        self.last_extract_method = None
+        self.screen_index = 0
+        
+        # 스크롤 수집 범위 (목표 상품을 찾으면 그 전에 중단)
+        self.max_rank = self.config.getint('extract', 'max_rank', fallback=60)
+        self.max_scrolls = self.config.getint('extract', 'max_scrolls', fallback=15)
         
     def load_config(self):
         """설정 파일 로드"""
@@ -40,7 +83,11 @@ class EnhancedADBCoupangRankChecker:
         """ADB 명령어 실행 (재시도 로직 포함)"""
         for attempt in range(retries):
             try:
-                full_command = f"{self.adb_path} {command}"
+                # 디바이스가 정해져 있으면 해당 디바이스로 명령 전달
+                if self.device_id and command != "devices":
+                    full_command = f"{self.adb_path} -s {self.device_id} {command}"
+                else:
+                    full_command = f"{self.adb_path} {command}"
                 result = subprocess.run(
                     full_command, 
                     shell=True, 
@@ -75,6 +122,16 @@ class EnhancedADBCoupangRankChecker:
         
         return False, "", "All retry attempts failed"
     
+    def run_shell(self, command, timeout=30):
+        """디바이스 셸 명령 실행 (adb shell 프로세스를 계속 재사용)"""
+        if self.shell_session is None:
+            self.shell_session = ADBShellSession(self.adb_path, self.device_id, timeout=timeout)
+        
+        success, stdout, stderr = self.shell_session.run(command, timeout=timeout)
+        if not success:
+            print(f"ADB shell command failed: {command}: {stderr.strip()}")
+        return success, stdout, stderr
+    
     def check_device_connection(self):
         """디바이스 연결 확인"""
         print("Checking device connection...")
@@ -84,15 +141,19 @@ class EnhancedADBCoupangRankChecker:
             print(f"ADB command failed: {stderr}")
             return False
         
-        lines = stdout.strip().split('\n')
-        devices = []
+        devices = parse_devices(stdout)
         
-        for line in lines[1:]:  # 첫 번째 줄은 "List of devices attached" 제외
-            if line.strip() and '\tdevice' in line:
-                device_id = line.split('\t')[0]
-                devices.append(device_id)
+        if self.pinned_device:
+            if self.device_id in devices:
+                print(f"Device connected: {self.device_id}")
+                return True
+            print(f"Device not available: {self.device_id}")
+            return False
         
         if devices:
+            if self.shell_session and self.device_id != devices[0]:
+                self.shell_session.close()
+                self.shell_session = None
             self.device_id = devices[0]
             print(f"Device connected: {self.device_id}")
             return True
@@ -103,7 +164,7 @@ class EnhancedADBCoupangRankChecker:
     def check_coupang_app(self):
         """쿠팡 앱 설치 확인"""
         print("Checking Coupang app...")
-        success, stdout, stderr = self.run_adb_command(f"shell pm list packages | findstr {self.coupang_package}")
+        success, stdout, stderr = self.run_shell(f"pm list packages | grep {self.coupang_package}")
         
         if success and self.coupang_package in stdout:
             print(f"Coupang app found: {self.coupang_package}")
@@ -117,17 +178,17 @@ class EnhancedADBCoupangRankChecker:
         print("Waking up screen...")
         
         # 화면 상태 확인
-        success, stdout, stderr = self.run_adb_command("shell dumpsys display | findstr mDisplayState")
+        success, stdout, stderr = self.run_shell("dumpsys display | grep mDisplayState")
         if success and "OFF" in stdout:
             print("Screen is off, waking up...")
             # 화면 켜기
-            self.run_adb_command("shell input keyevent KEYCODE_POWER")
+            self.run_shell("input keyevent KEYCODE_POWER")
             time.sleep(1)
-            self.run_adb_command("shell input keyevent KEYCODE_WAKEUP")
+            self.run_shell("input keyevent KEYCODE_WAKEUP")
             time.sleep(2)
             
             # 화면이 켜졌는지 확인
-            success, stdout, stderr = self.run_adb_command("shell dumpsys display | findstr mDisplayState")
+            success, stdout, stderr = self.run_shell("dumpsys display | grep mDisplayState")
             if success and "ON" in stdout:
                 print("Screen is now on")
                 return True
@@ -146,11 +207,13 @@ class EnhancedADBCoupangRankChecker:
         if not self.wake_up_screen():
             return False
         
-        success, stdout, stderr = self.run_adb_command(f"shell monkey -p {self.coupang_package} -c android.intent.category.LAUNCHER 1")
+        success, stdout, stderr = self.run_shell(f"monkey -p {self.coupang_package} -c android.intent.category.LAUNCHER 1")
         
         if success:
             print("Coupang app launched successfully")
-            time.sleep(3)  # 앱 로딩 대기
+            # 앱 창이 포커스를 받고 화면이 멈출 때까지 대기
+            self.waiter.wait_for_focus('app_launch', self.coupang_package, timeout=self.wait_timeouts['launch'])
+            self.waiter.wait_for_stable_screen('app_ready', timeout=self.wait_timeouts['launch'])
             return True
         else:
             print(f"Failed to launch app: {stderr}")
@@ -158,43 +221,65 @@ class EnhancedADBCoupangRankChecker:
     
     def get_screen_info(self):
         """화면 정보 가져오기"""
-        success, stdout, stderr = self.run_adb_command("shell wm size")
+        success, stdout, stderr = self.run_shell("wm size")
         if success:
             print(f"Screen size: {stdout.strip()}")
             return stdout.strip()
         return None
     
-    def take_screenshot(self, filename=None):
-        """스크린샷 촬영 (개선된 버전)"""
-        if not filename:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"screenshot_{timestamp}.png"
+    def adb_base_args(self):
+        """ADB 기본 인자 (디바이스 지정 포함)"""
+        args = [self.adb_path]
+        if self.device_id:
+            args += ['-s', self.device_id]
+        return args
+    
+    def capture_screen(self, timeout=30, reduced=False):
+        """스크린샷을 파일 없이 메모리로 받아 그레이스케일 배열로 반환 (실패하면 None)
         
-        # 여러 방법으로 스크린샷 시도
-        methods = [
-            f"exec-out screencap -p > {filename}",
-            f"shell screencap -p /sdcard/screenshot.png && pull /sdcard/screenshot.png {filename}",
-            f"shell screencap -p /sdcard/screenshot.png && pull /sdcard/screenshot.png {filename} && shell rm /sdcard/screenshot.png"
-        ]
+        reduced=True이면 1/4 크기로 디코딩 (화면 변화 감지용)
+        """
+        try:
+            # exec-out은 PTY를 거치지 않아 PNG 바이트가 그대로 전달됨
+            result = subprocess.run(
+                self.adb_base_args() + ['exec-out', 'screencap', '-p'],
+                capture_output=True,
+                timeout=timeout
+            )
+        except subprocess.TimeoutExpired:
+            print("Screen capture timeout")
+            return None
+        except Exception as e:
+            print(f"Screen capture error: {e}")
+            return None
         
-        for i, method in enumerate(methods):
-            print(f"Screenshot method {i+1}: {method}")
-            success, stdout, stderr = self.run_adb_command(method)
-            
-            if success and os.path.exists(filename) and os.path.getsize(filename) > 1000:
-                print(f"Screenshot saved: {filename} ({os.path.getsize(filename)} bytes)")
-                return filename
-            else:
-                print(f"Screenshot method {i+1} failed: {stderr}")
-                if os.path.exists(filename):
-                    os.remove(filename)
+        if result.returncode != 0 or len(result.stdout) < 1000:
+            print(f"Screen capture failed: {result.stderr.decode('utf-8', errors='replace')}")
+            return None
         
-        print("All screenshot methods failed")
-        return None
+        # PNG 바이트를 바로 디코딩 (OCR에는 그레이스케일만 필요)
+        flags = cv2.IMREAD_REDUCED_GRAYSCALE_4 if reduced else cv2.IMREAD_GRAYSCALE
+        image = cv2.imdecode(np.frombuffer(result.stdout, dtype=np.uint8), flags)
+        if image is None:
+            print("Could not decode screen capture")
+            return None
+        
+        return image
+    
+    def dump_debug_image(self, image, filename):
+        """디버깅 설정이 켜진 경우에만 이미지를 파일로 저장"""
+        if not self.save_screenshots or image is None:
+            return None
+        
+        os.makedirs(self.screenshot_dir, exist_ok=True)
+        path = os.path.join(self.screenshot_dir, filename)
+        cv2.imwrite(path, image)
+        print(f"Debug image saved: {path}")
+        return path
     
     def tap_screen(self, x, y):
         """화면 탭"""
-        success, stdout, stderr = self.run_adb_command(f"shell input tap {x} {y}")
+        success, stdout, stderr = self.run_shell(f"input tap {x} {y}")
         if success:
             print(f"Tapped at ({x}, {y})")
             return True
@@ -204,7 +289,7 @@ class EnhancedADBCoupangRankChecker:
     
     def swipe_screen(self, x1, y1, x2, y2, duration=300):
         """화면 스와이프"""
-        success, stdout, stderr = self.run_adb_command(f"shell input swipe {x1} {y1} {x2} {y2} {duration}")
+        success, stdout, stderr = self.run_shell(f"input swipe {x1} {y1} {x2} {y2} {duration}")
         if success:
             print(f"Swiped from ({x1}, {y1}) to ({x2}, {y2})")
             return True
@@ -216,7 +301,7 @@ class EnhancedADBCoupangRankChecker:
         """텍스트 입력"""
         # 특수문자 이스케이프
         escaped_text = text.replace(' ', '%s').replace('&', '\\&')
-        success, stdout, stderr = self.run_adb_command(f'shell input text "{escaped_text}"')
+        success, stdout, stderr = self.run_shell(f'input text "{escaped_text}"')
         if success:
             print(f"Text input: {text}")
             return True
@@ -226,7 +311,7 @@ class EnhancedADBCoupangRankChecker:
     
     def press_back(self):
         """뒤로가기 버튼"""
-        success, stdout, stderr = self.run_adb_command("shell input keyevent KEYCODE_BACK")
+        success, stdout, stderr = self.run_shell("input keyevent KEYCODE_BACK")
         if success:
             print("Back button pressed")
             return True
@@ -236,7 +321,7 @@ class EnhancedADBCoupangRankChecker:
     
     def press_home(self):
         """홈 버튼"""
-        success, stdout, stderr = self.run_adb_command("shell input keyevent KEYCODE_HOME")
+        success, stdout, stderr = self.run_shell("input keyevent KEYCODE_HOME")
         if success:
             print("Home button pressed")
             return True
@@ -246,24 +331,31 @@ class EnhancedADBCoupangRankChecker:
     
     def get_current_activity(self):
         """현재 액티비티 정보"""
-        success, stdout, stderr = self.run_adb_command("shell dumpsys activity activities | grep mResumedActivity")
+        success, stdout, stderr = self.run_shell("dumpsys activity activities | grep mResumedActivity")
         if success:
             print(f"Current activity: {stdout.strip()}")
             return stdout.strip()
         return None
     
-    def preprocess_image_for_ocr(self, image_path):
-        """OCR을 위한 이미지 전처리 (개선된 버전)"""
+    def load_image(self, image):
+        """파일 경로 또는 배열을 그레이스케일 배열로 변환"""
+        if isinstance(image, np.ndarray):
+            if image.ndim == 3:
+                return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+            return image
+        
+        loaded = cv2.imread(image, cv2.IMREAD_GRAYSCALE)
+        if loaded is None:
+            print(f"Could not load image: {image}")
+        return loaded
+    
+    def preprocess_image_for_ocr(self, image):
+        """OCR을 위한 이미지 전처리 (배열 또는 파일 경로를 받아 이진화된 배열 반환)"""
         try:
-            # 이미지 로드
-            image = cv2.imread(image_path)
-            if image is None:
-                print(f"Could not load image: {image_path}")
+            gray = self.load_image(image)
+            if gray is None:
                 return None
             
-            # 그레이스케일 변환
-            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-            
             # 이미지 크기 조정 (OCR 정확도 향상)
             height, width = gray.shape
             if width > 2000:
@@ -292,49 +384,27 @@ class EnhancedADBCoupangRankChecker:
             kernel_noise = cv2.getStructuringElement(cv2.MORPH_RECT, (1, 1))
             binary = cv2.morphologyEx(binary, cv2.MORPH_OPEN, kernel_noise)
             
-            # 전처리된 이미지 저장
-            processed_path = image_path.replace('.png', '_processed.png')
-            cv2.imwrite(processed_path, binary)
+            # 디버깅 시에만 전처리 결과 저장
+            self.dump_debug_image(binary, f"processed_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png")
             
-            print(f"Image preprocessed: {processed_path}")
-            return processed_path
+            return binary
             
         except Exception as e:
             print(f"Image preprocessing failed: {e}")
             return None
     
-    def extract_text_with_ocr(self, image_path):
-        """OCR로 텍스트 추출 (개선된 버전)"""
+    def extract_text_with_ocr(self, image):
+        """OCR로 텍스트 추출 (배열 또는 파일 경로)"""
         try:
-            # 이미지 전처리
-            processed_path = self.preprocess_image_for_ocr(image_path)
-            if not processed_path:
+            # 이미지 전처리 (메모리에서 처리한 배열을 그대로 OCR에 전달)
+            image = self.preprocess_image_for_ocr(image)
+            if image is None:
                 return ""
             
-            # OCR 실행
-            image = Image.open(processed_path)
-            
-            # 여러 OCR 설정 시도
-            ocr_configs = [
-                r'--oem 3 --psm 6 -l eng',  # 영어만
-                r'--oem 3 --psm 3 -l eng',  # 자동 페이지 분할
-                r'--oem 3 --psm 4 -l eng',  # 단일 컬럼 텍스트
-                r'--oem 3 --psm 8 -l eng',  # 단일 단어
-                r'--oem 3 --psm 13 -l eng'  # 원시 라인
-            ]
-            
-            best_text = ""
-            max_length = 0
-            
-            for config in ocr_configs:
-                try:
-                    text = pytesseract.image_to_string(image, config=config)
-                    if len(text.strip()) > max_length:
-                        max_length = len(text.strip())
-                        best_text = text
-                except Exception as e:
-                    print(f"OCR config failed: {config}, error: {e}")
-                    continue
+            # 한 번 인식하고 신뢰도가 낮을 때만 다른 psm 시도
+            result = self.ocr_engine.recognize(image)
+            best_text = result['text']
+            print(f"OCR psm {result['psm']} ({result['passes']} pass, confidence {result['confidence']:.0f})")
             
             # 숫자와 특수문자 포함한 텍스트 정리
             cleaned_text = self.clean_ocr_text(best_text)
@@ -373,94 +443,20 @@ class EnhancedADBCoupangRankChecker:
             print(f"Error cleaning OCR text: {e}")
             return text if text else ""
     
-    def extract_products_from_screenshot(self, screenshot_file, keyword):
-        """스크린샷에서 상품 정보 추출 (OCR 사용)"""
-        products = []
-        
-        print(f"Analyzing screenshot with OCR: {screenshot_file}")
-        
-        try:
-            # OCR로 텍스트 추출
-            ocr_text = self.extract_text_with_ocr(screenshot_file)
-            
-            if not ocr_text:
-                print("No text extracted from screenshot")
-                return []
-            
-            print(f"OCR extracted text length: {len(ocr_text)}")
-            print("OCR Text preview:")
-            
-            # 안전한 텍스트 출력
-            try:
-                safe_text = ocr_text.encode('utf-8', errors='replace').decode('utf-8')
-                print(safe_text[:500] + "..." if len(safe_text) > 500 else safe_text)
-            except:
-                print("Text preview unavailable due to encoding issues")
-            
-            # 상품 정보 파싱
-            products = self.parse_product_info_from_text(ocr_text, keyword)
-            
-            # 순위 감지 알고리즘 적용
-            products = self.detect_product_ranks(products, keyword)
-            
-            return products
-            
-        except Exception as e:
-            print(f"Error extracting products from screenshot: {e}")
-            return []
-    
-    def detect_product_ranks(self, products, keyword):
-        """상품 순위 감지 알고리즘"""
-        if not products:
+    def extract_products_from_cards(self, screenshot, keyword):
+        """화면에서 상품 카드를 찾아 카드별로 OCR (순위는 화면 위에서부터의 순서)"""
+        gray = self.load_image(screenshot)
+        if gray is None:
             return []
         
-        try:
-            # 상품 정보를 기반으로 순위 재정렬
-            ranked_products = []
-            
-            # 1. 가격이 있는 상품 우선
-            products_with_price = [p for p in products if p['price'] != 'N/A']
-            products_without_price = [p for p in products if p['price'] == 'N/A']
-            
-            # 2. 가격이 있는 상품을 가격 순으로 정렬 (낮은 가격부터)
-            if products_with_price:
-                # 가격 문자열에서 숫자만 추출하여 정렬
-                def extract_price_number(price_str):
-                    try:
-                        # "12,000원" -> 12000
-                        price_clean = re.sub(r'[^\d]', '', price_str)
-                        return int(price_clean) if price_clean else 0
-                    except:
-                        return 0
-                
-                products_with_price.sort(key=lambda x: extract_price_number(x['price']))
-            
-            # 3. 리뷰 수가 많은 상품 우선 (가격이 없는 상품 중)
-            if products_without_price:
-                def extract_review_number(review_str):
-                    try:
-                        review_clean = re.sub(r'[^\d]', '', review_str)
-                        return int(review_clean) if review_clean else 0
-                    except:
-                        return 0
-                
-                products_without_price.sort(key=lambda x: extract_review_number(x['reviews']), reverse=True)
-            
-            # 4. 최종 순위 할당
-            all_products = products_with_price + products_without_price
-            
-            for i, product in enumerate(all_products):
-                product['rank'] = i + 1
-                product['confidence'] = self.calculate_rank_confidence(product, keyword)
-                ranked_products.append(product)
-            
-            print(f"Rank detection completed: {len(ranked_products)} products ranked")
-            
-            return ranked_products
-            
-        except Exception as e:
-            print(f"Error in rank detection: {e}")
-            return products
+        products = []
+        for product in extract_card_products(gray, self.card_pool):
+            if not product['title']:
+                continue
+            products.append(product)
+        
+        print(f"Card OCR: {len(products)} products")
+        return products
     
     def calculate_rank_confidence(self, product, keyword):
         """순위 신뢰도 계산"""
@@ -508,113 +504,15 @@ class EnhancedADBCoupangRankChecker:
             print(f"Error calculating confidence: {e}")
             return 0.5
     
-    def parse_product_info_from_text(self, text, keyword):
-        """OCR 텍스트에서 상품 정보 파싱 (개선된 버전)"""
-        products = []
-        
-        try:
-            # 인코딩 문제 해결
-            if isinstance(text, bytes):
-                text = text.decode('utf-8', errors='replace')
-            
-            # 특수문자 정리
-            text = text.replace('\x00', '').replace('\ufffd', '').replace('\xa9', '')
-            # 다양한 가격 패턴 (더 포괄적)
-            price_patterns = [
-                r'(\d{1,3}(?:,\d{3})*)\s*원',
-                r'₩\s*(\d{1,3}(?:,\d{3})*)',
-                r'(\d{1,3}(?:,\d{3})*)\s*₩',
-                r'(\d{1,3}(?:,\d{3})*)\s*W',
-                r'(\d{1,3}(?:,\d{3})*)\s*KRW',
-                r'(\d{1,3}(?:,\d{3})*)\s*₩',
-                r'(\d{1,3}(?:,\d{3})*)\s*원',
-                r'(\d{1,3}(?:,\d{3})*)\s*원',
-                r'(\d{1,3}(?:,\d{3})*)\s*원',
-                r'(\d{1,3}(?:,\d{3})*)\s*원'
-            ]
-            
-            # 리뷰 수 패턴 (더 포괄적)
-            review_patterns = [
-                r'(\d{1,3}(?:,\d{3})*)\s*개?\s*리뷰',
-                r'리뷰\s*(\d{1,3}(?:,\d{3})*)',
-                r'\((\d{1,3}(?:,\d{3})*)\)',
-                r'(\d{1,3}(?:,\d{3})*)\s*review',
-                r'review\s*(\d{1,3}(?:,\d{3})*)',
-                r'(\d{1,3}(?:,\d{3})*)\s*개',
-                r'(\d{1,3}(?:,\d{3})*)\s*건'
-            ]
-            
-            # 상품 제목 패턴 (키워드 포함)
-            title_patterns = [
-                rf'{keyword}.*?(?=\d{{1,3}}(?:,\d{{3}})*\s*원)',
-                rf'{keyword}.*?(?=₩)',
-                rf'{keyword}.*?(?=\d{{1,3}}(?:,\d{{3}})*\s*개?\s*리뷰)',
-                rf'{keyword}.*?(?=\d{{1,3}}(?:,\d{{3}})*\s*review)'
-            ]
-            
-            # 텍스트를 줄 단위로 분할
-            lines = text.split('\n')
-            
-            current_rank = 1
-            for i, line in enumerate(lines):
-                line = line.strip()
-                if not line or len(line) < 5:
-                    continue
-                
-                # 키워드가 포함된 줄 찾기 (대소문자 무시)
-                if keyword.lower() in line.lower():
-                    product_info = {
-                        'rank': current_rank,
-                        'product_id': f'extracted_{current_rank}',
-                        'title': line[:50] + "..." if len(line) > 50 else line,
-                        'price': 'N/A',
-                        'reviews': '0',
-                        'timestamp': datetime.now().isoformat()
-                    }
-                    
-                    # 가격 추출
-                    for pattern in price_patterns:
-                        price_match = re.search(pattern, line)
-                        if price_match:
-                            product_info['price'] = price_match.group(1) + '원'
-                            break
-                    
-                    # 리뷰 수 추출
-                    for pattern in review_patterns:
-                        review_match = re.search(pattern, line)
-                        if review_match:
-                            product_info['reviews'] = review_match.group(1)
-                            break
-                    
-                    # 가격이 없어도 상품 정보 추가 (키워드 포함)
-                    products.append(product_info)
-                    current_rank += 1
-                    
-                    # 최대 20개까지만
-                    if current_rank > 20:
-                        break
-            
-            # 가격이 있는 상품 우선 정렬
-            products_with_price = [p for p in products if p['price'] != 'N/A']
-            products_without_price = [p for p in products if p['price'] == 'N/A']
-            
-            # 가격이 있는 상품을 먼저, 그 다음 가격이 없는 상품
-            sorted_products = products_with_price + products_without_price
-            
-            print(f"Parsed {len(sorted_products)} products from OCR text")
-            print(f"Products with price: {len(products_with_price)}")
-            print(f"Products without price: {len(products_without_price)}")
-            
-            return sorted_products
-            
-        except Exception as e:
-            print(f"Error parsing product info: {e}")
-            return []
-    
-    def search_products(self, keyword):
-        """상품 검색 (개선된 버전)"""
+    def search_products(self, keyword, target=None):
+        """상품 검색 (target: 찾을 상품 제목 일부, 찾으면 스크롤 중단)"""
         print(f"\nSearching for: {keyword}")
         
+        # 화면에서는 상품 ID를 읽을 수 없으므로 ID/URL 목표로는 조기 종료하지 않음
+        if target and re.fullmatch(r'\d+|https?://\S+', target.strip()):
+            print(f"Target '{target}' looks like a product ID/URL; app screens only match titles, scanning up to max rank")
+            target = None
+        
         try:
             # 1. 앱 실행
             if not self.launch_coupang_app():
@@ -626,10 +524,11 @@ class EnhancedADBCoupangRankChecker:
             screen_height = 1920
             
             # 3. 스크린샷 촬영 (검색 전)
-            before_screenshot = self.take_screenshot(f"before_search_{keyword}.png")
-            if not before_screenshot:
+            before_screenshot = self.capture_screen()
+            if before_screenshot is None:
                 print("Failed to take before search screenshot")
                 return []
+            self.dump_debug_image(before_screenshot, f"before_search_{keyword}.png")
             
             # 4. 검색창 찾기 및 클릭 (여러 위치 시도)
             search_positions = [
@@ -643,11 +542,9 @@ class EnhancedADBCoupangRankChecker:
             for x, y in search_positions:
                 print(f"Trying search position: ({x}, {y})")
                 self.tap_screen(x, y)
-                time.sleep(2)
                 
-                # 검색창이 활성화되었는지 확인
-                current_activity = self.get_current_activity()
-                if current_activity and "search" in current_activity.lower():
+                # 검색 화면으로 포커스가 바뀌었는지 확인
+                if self.waiter.wait_for_focus('search_box', 'search', timeout=self.wait_timeouts['search_box']):
                     print("Search box activated")
                     search_clicked = True
                     break
@@ -655,45 +552,47 @@ class EnhancedADBCoupangRankChecker:
             if not search_clicked:
                 print("Search box not found, trying default position")
                 self.tap_screen(screen_width // 2, 200)
-                time.sleep(2)
+                self.waiter.wait_for_stable_screen('search_box', timeout=self.wait_timeouts['search_box'], min_change=True)
             
             # 5. 검색어 입력
             print("Entering search keyword...")
             self.input_text(keyword)
-            time.sleep(2)
+            self.waiter.wait_for_stable_screen('text_input', timeout=self.wait_timeouts['search_box'], min_change=True)
             
             # 6. 검색 실행 (엔터키)
             print("Executing search...")
-            success, stdout, stderr = self.run_adb_command("shell input keyevent KEYCODE_ENTER")
-            time.sleep(3)
+            success, stdout, stderr = self.run_shell("input keyevent KEYCODE_ENTER")
             
-            # 7. 검색 결과 페이지 대기
+            # 7. 검색 결과 페이지 대기 (화면이 바뀐 뒤 멈출 때까지)
             print("Waiting for search results...")
-            time.sleep(8)  # 더 긴 대기 시간
+            self.waiter.wait_for_stable_screen('search_results', timeout=self.wait_timeouts['results'], min_change=True)
             
             # 8. 스크린샷 촬영 (검색 후)
-            after_screenshot = self.take_screenshot(f"after_search_{keyword}.png")
-            if not after_screenshot:
+            after_screenshot = self.capture_screen()
+            if after_screenshot is None:
                 print("Failed to take after search screenshot")
                 return []
+            self.dump_debug_image(after_screenshot, f"after_search_{keyword}.png")
             
-            # 9. 검색 결과 스크롤하여 더 많은 상품 로드
-            print("Scrolling to load more products...")
-            for i in range(5):  # 더 많은 스크롤
-                self.swipe_screen(screen_width//2, screen_height*0.8, screen_width//2, screen_height*0.2, 800)
-                time.sleep(3)  # 더 긴 대기 시간
+            # 9. 스크롤할 때마다 상품 추출 (목표 상품을 찾거나 순위 상한에 도달하면 중단)
+            scroll = lambda: self.scroll_results(screen_width, screen_height)
             
-            # 10. 최종 스크린샷
-            final_screenshot = self.take_screenshot(f"final_search_{keyword}.png")
-            if not final_screenshot:
-                print("Failed to take final screenshot")
-                return []
+            if self.extract_backend == 'hierarchy':
+                hierarchy = HierarchyProductCollector(self.run_shell)
+                products = self.collect_products(keyword, hierarchy.read_screen, scroll, target, key=record_identity)
+                if products:
+                    print(f"Hierarchy dumps: {hierarchy.dump_count} "
+                          f"({hierarchy.dump_seconds / hierarchy.dump_count * 1000:.0f}ms avg)")
+                    self.last_extract_method = 'ADB_HIERARCHY'
+                    return products
+                print("Hierarchy extraction failed, falling back to OCR")
             
-            # 11. 현재 액티비티 확인
+            # 10. 현재 액티비티 확인
             self.get_current_activity()
             
-            # 12. 상품 정보 추출 (OCR 사용)
-            products = self.extract_products_from_screenshot(final_screenshot, keyword)
+            # 11. 상품 정보 추출 (OCR 사용)
+            products = self.collect_products(keyword, lambda: self.read_screen_with_ocr(keyword), scroll, target)
+            self.last_extract_method = 'ADB_OCR'
             
             return products
             
@@ -701,26 +600,82 @@ class EnhancedADBCoupangRankChecker:
             print(f"Search failed: {e}")
             return []
     
-    def check_rank(self, keyword):
-        """순위 체크 실행 (개선된 에러 처리)"""
+    def scroll_results(self, screen_width, screen_height):
+        """검색 결과 한 화면 스크롤 후 화면이 멈출 때까지 대기"""
+        self.swipe_screen(screen_width//2, screen_height*0.8, screen_width//2, screen_height*0.2, 800)
+        self.waiter.wait_for_stable_screen('scroll', timeout=self.wait_timeouts['scroll'])
+    
+    def read_screen_with_ocr(self, keyword):
+        """현재 화면을 캡처해 OCR로 상품 추출 (캡처 실패면 None)"""
+        screenshot = self.capture_screen()
+        if screenshot is None:
+            print("Failed to take screenshot")
+            return None
+        
+        self.screen_index += 1
+        self.dump_debug_image(screenshot, f"search_{keyword}_{self.screen_index}.png")
+        
+        products = self.extract_products_from_cards(screenshot, keyword)
+        if products:
+            return products
+        
+        # 카드를 못 찾으면 화면 전체 OCR (화면 간 병합을 위해 가격순 재정렬 없이 줄 순서 유지)
+        ocr_text = self.extract_text_with_ocr(screenshot)
+        return parse_products(ocr_text, keyword) if ocr_text else []
+    
+    def collect_products(self, keyword, read_screen, scroll, target=None, key=text_key):
+        """스크롤하며 화면마다 추출한 상품을 겹침을 맞춰 이어 붙임 (순위는 목록 전체에서의 위치)"""
+        self.screen_index = 0
+        collector = IncrementalScrollCollector(
+            read_screen, scroll, key=key, target=target,
+            max_rank=self.max_rank, max_scrolls=self.max_scrolls
+        )
+        
+        products = collector.run()
+        for product in products:
+            # 실제 ID가 없는 OCR 레코드만 목록 전체 순위로 임시 ID를 다시 매김 (화면별 extracted_N 대체)
+            product_id = product.get('product_id')
+            if not product_id or product_id.startswith('extracted_'):
+                product['product_id'] = f"extracted_{product['rank']}"
+            product['timestamp'] = datetime.now().isoformat()
+            product['confidence'] = self.calculate_rank_confidence(product, keyword)
+        
+        if products:
+            print(f"Collected {len(products)} products in {collector.scroll_count} scrolls ({collector.stop_reason})")
+            if collector.found:
+                print(f"Target found at rank {collector.found['rank']}")
+            if collector.gap_count:
+                print(f"Warning: {collector.gap_count} scrolls had no overlap with the previous screen")
+        return products
+    
+    def check_rank(self, keyword, target=None):
+        """순위 체크 실행 (target에 상품 제목 일부를 주면 해당 상품까지만 스크롤)"""
         print(f"\nRank check started: {keyword}")
+        self.last_failure = None
         
         try:
             # 디바이스 연결 확인
             if not self.check_device_connection():
                 print("Device not connected")
+                self.last_failure = 'device_not_connected'
                 return None
             
             # 쿠팡 앱 확인
             if not self.check_coupang_app():
                 print("Coupang app not installed")
+                self.last_failure = 'app_not_installed'
                 return None
             
             # 상품 검색
-            products = self.search_products(keyword)
+            products = self.search_products(keyword, target)
+            
+            # 화면 대기 시간 통계
+            for line in self.waiter.stats.summary():
+                print(f"Wait {line}")
             
             if not products:
                 print("No products found.")
+                self.last_failure = 'no_products'
                 return None
             
             # 결과 출력
@@ -738,6 +693,7 @@ class EnhancedADBCoupangRankChecker:
             
         except Exception as e:
             print(f"Error in rank check: {e}")
+            self.last_failure = f'error: {e}'
             return None
     
     def save_rank_data(self, keyword, products, filename=None):
@@ -753,7 +709,7 @@ class EnhancedADBCoupangRankChecker:
             'products': products,
             'device_id': self.device_id,
             'coupang_package': self.coupang_package,
-            'method': 'ADB_OCR'
+            'method': self.last_extract_method or 'ADB_OCR'
         }
         
         with open(filename, 'w', encoding='utf-8') as f:
@@ -766,7 +722,12 @@ class EnhancedADBCoupangRankChecker:
         """정리 작업"""
         print("Cleaning up...")
         # 앱 종료
-        self.run_adb_command(f"shell am force-stop {self.coupang_package}")
+        self.run_shell(f"am force-stop {self.coupang_package}")
+        if self.shell_session:
+            self.shell_session.close()
+            self.shell_session = None
+        if self.owns_card_pool:
+            self.card_pool.close()
         print("Enhanced ADB rank checker closed")
 
 def main():
@@ -11,8 +11,9 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import TimeoutException
 from webdriver_manager.chrome import ChromeDriverManager
+from dom_product_extractor import extract_products
 import re
 import os
 
@@ -150,49 +151,18 @@ class FinalCoupanChecker:
             if not product_id:
                 return None
             
-            # 상품 아이템들 찾기
-            product_selectors = [
-                "li.search-product",
-                "li[class*='search-product']",
-                "li[class*='product']"
-            ]
-            
-            product_items = []
-            for selector in product_selectors:
-                product_items = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                if product_items:
-                    break
-            
-            self.log(f"총 {len(product_items)}개 상품 발견")
+            # 상품 카드 전체를 스크립트 한 번으로 추출
+            products = extract_products(self.driver)
+            self.log(f"총 {len(products)}개 상품 발견")
             
             # 타겟 상품 검색
-            for index, item in enumerate(product_items, 1):
-                try:
-                    link_element = item.find_element(By.CSS_SELECTOR, "a.search-product-link")
-                    href = link_element.get_attribute("href")
+            for product in products:
+                if product_id == product['product_id'] or product_id in product['url']:
+                    title = product['title'] or "상품명 추출 실패"
+                    price = product['price'] if product['price'] != 'N/A' else "가격 정보 없음"
                     
-                    if product_id in href:
-                        # 상품 정보 추출
-                        title = "상품명 추출 실패"
-                        price = "가격 정보 없음"
-                        
-                        try:
-                            title_elem = item.find_element(By.CSS_SELECTOR, ".name")
-                            title = title_elem.text.strip()
-                        except:
-                            pass
-                        
-                        try:
-                            price_elem = item.find_element(By.CSS_SELECTOR, ".price-value, .price")
-                            price = price_elem.text.strip()
-                        except:
-                            pass
-                        
-                        self.log(f"상품 정보: {title[:50]}... 가격: {price}")
-                        return index
-                        
-                except NoSuchElementException:
-                    continue
+                    self.log(f"상품 정보: {title[:50]}... 가격: {price}")
+                    return product['rank']
             
             return None
             
@@ -10,14 +10,28 @@ import json
 from datetime import datetime
 import requests
 from urllib.parse import quote
-import re
+from search_result_parser import parse_search_results
+from webdriver_pool import get_pool, release_pool, run_with_pooled_driver
+from page_load_profile import apply_firefox_profile, load_search_page
+from browser_wait import BrowserWaiter
 
 class FirefoxCoupangRankChecker:
-    def __init__(self):
+    def __init__(self, pool_size=0, max_jobs=50, max_memory_mb=1500):
         self.driver = None
-        self.setup_driver()
+        self.waiter = BrowserWaiter()
+        self.driver_pool = None
+        if pool_size:
+            # 브라우저를 미리 띄워 두고 키워드마다 정리된 새 탭으로 재사용
+            self.driver_pool = get_pool(self.__class__.__name__, self.create_driver, size=pool_size,
+                                        max_jobs=max_jobs, max_memory_mb=max_memory_mb)
+        else:
+            self.setup_driver()
         
     def setup_driver(self):
+        """브라우저를 바로 실행해 이 체커 전용으로 사용 (풀을 쓰지 않을 때)"""
+        self.driver = self.create_driver()
+    
+    def create_driver(self):
         """Firefox 드라이버 설정"""
         print("Setting up Firefox driver...")
         
@@ -47,15 +61,19 @@ class FirefoxCoupangRankChecker:
         firefox_options.set_preference("dom.webnotifications.enabled", False)
         firefox_options.set_preference("media.volume_scale", "0.0")
         
+        # DOMContentLoaded에서 바로 반환, 웹폰트/자동재생/추적 스크립트 차단
+        apply_firefox_profile(firefox_options)
+        
         try:
             service = Service(GeckoDriverManager().install())
-            self.driver = webdriver.Firefox(service=service, options=firefox_options)
+            driver = webdriver.Firefox(service=service, options=firefox_options)
             
             # 페이지 로드 타임아웃 설정
-            self.driver.set_page_load_timeout(60)
-            self.driver.implicitly_wait(10)
+            driver.set_page_load_timeout(60)
+            driver.implicitly_wait(10)
             
             print("Firefox driver setup completed")
+            return driver
             
         except Exception as e:
             print(f"Firefox driver setup failed: {e}")
@@ -82,9 +100,9 @@ class FirefoxCoupangRankChecker:
             search_url = f"https://www.coupang.com/np/search?q={quote(keyword)}"
             print(f"Direct URL: {search_url}")
             
-            # 페이지 로드
-            self.driver.get(search_url)
-            time.sleep(5)  # 페이지 로딩 대기
+            # 페이지 로드 (불필요한 리소스 차단, 상품 목록이 나타날 때까지 대기)
+            if not load_search_page(self.driver, search_url, self.waiter):
+                print("Product list not found within timeout")
             
             # 페이지 제목 확인
             page_title = self.driver.title
@@ -108,69 +126,9 @@ class FirefoxCoupangRankChecker:
     
     def extract_product_info(self, page_source):
         """검색 결과에서 상품 정보 추출"""
-        products = []
-        
         try:
-            # 상품 링크 패턴
-            product_pattern = r'/products/(\d+)'
-            product_ids = re.findall(product_pattern, page_source)
-            
-            # 상품 제목 패턴 (여러 패턴 시도)
-            title_patterns = [
-                r'<dt class="name">.*?<a[^>]*>([^<]+)</a>',
-                r'<a[^>]*class="[^"]*name[^"]*"[^>]*>([^<]+)</a>',
-                r'data-product-id="[^"]*"[^>]*>([^<]+)</a>',
-                r'<span class="name">([^<]+)</span>'
-            ]
-            
-            titles = []
-            for pattern in title_patterns:
-                found_titles = re.findall(pattern, page_source, re.DOTALL)
-                if found_titles:
-                    titles = found_titles
-                    print(f"Found {len(titles)} titles with pattern: {pattern}")
-                    break
-            
-            # 가격 패턴 (여러 패턴 시도)
-            price_patterns = [
-                r'<strong class="price-value">([^<]+)</strong>',
-                r'<span class="price-value">([^<]+)</span>',
-                r'data-price="([^"]*)"',
-                r'<em class="price-value">([^<]+)</em>'
-            ]
-            
-            prices = []
-            for pattern in price_patterns:
-                found_prices = re.findall(pattern, page_source)
-                if found_prices:
-                    prices = found_prices
-                    print(f"Found {len(prices)} prices with pattern: {pattern}")
-                    break
-            
-            # 리뷰 수 패턴
-            review_pattern = r'<span class="rating-total-count">\(([^)]+)\)</span>'
-            reviews = re.findall(review_pattern, page_source)
-            
-            print(f"Found {len(product_ids)} product IDs")
-            print(f"Found {len(titles)} titles")
-            print(f"Found {len(prices)} prices")
-            print(f"Found {len(reviews)} reviews")
-            
-            # 상품 정보 조합
-            max_items = min(len(product_ids), len(titles), len(prices))
-            
-            for i in range(max_items):
-                product_info = {
-                    'rank': i + 1,
-                    'product_id': product_ids[i],
-                    'title': titles[i].strip() if i < len(titles) else 'N/A',
-                    'price': prices[i].strip() if i < len(prices) else 'N/A',
-                    'reviews': reviews[i].strip() if i < len(reviews) else '0',
-                    'timestamp': datetime.now().isoformat()
-                }
-                
-                products.append(product_info)
-            
+            products = parse_search_results(page_source)
+            print(f"Found {len(products)} products")
             return products
             
         except Exception as e:
@@ -179,6 +137,10 @@ class FirefoxCoupangRankChecker:
     
     def check_rank(self, keyword):
         """순위 체크 실행"""
+        if self.driver_pool is not None and self.driver is None:
+            # 풀에서 브라우저를 빌려 실행
+            return run_with_pooled_driver(self, self.check_rank, keyword)
+        
         print(f"\nRank check started: {keyword}")
         
         # IP 확인
@@ -224,6 +186,16 @@ class FirefoxCoupangRankChecker:
     
     def close(self):
         """브라우저 종료"""
+        # 페이지 대기 시간 통계
+        for line in self.waiter.stats.summary():
+            print(f"Wait {line}")
+        
+        if self.driver_pool is not None:
+            print(self.driver_pool.summary())
+            # 같은 클래스의 다른 인스턴스가 쓰는 중이면 풀은 유지됨
+            release_pool(self.driver_pool)
+            self.driver_pool = None
+            return
         if self.driver:
             self.driver.quit()
             print("Firefox browser closed")
@@ -233,7 +205,7 @@ def main():
     print("Firefox Coupang Rank Checker System")
     print("=" * 60)
     
-    checker = FirefoxCoupangRankChecker()
+    checker = FirefoxCoupangRankChecker(pool_size=1)
     
     try:
         # 테스트 키워드들
@@ -10,13 +10,26 @@ import json
 from datetime import datetime
 import requests
 from urllib.parse import quote
+from webdriver_pool import get_pool, release_pool, run_with_pooled_driver
+from browser_wait import BrowserWaiter
 
 class FixedSeleniumCoupangRankChecker:
-    def __init__(self):
+    def __init__(self, pool_size=0, max_jobs=50, max_memory_mb=1500):
         self.driver = None
-        self.setup_driver()
+        self.waiter = BrowserWaiter()
+        self.driver_pool = None
+        if pool_size:
+            # 브라우저를 미리 띄워 두고 키워드마다 정리된 새 탭으로 재사용
+            self.driver_pool = get_pool(self.__class__.__name__, self.create_driver, size=pool_size,
+                                        max_jobs=max_jobs, max_memory_mb=max_memory_mb)
+        else:
+            self.setup_driver()
         
     def setup_driver(self):
+        """브라우저를 바로 실행해 이 체커 전용으로 사용 (풀을 쓰지 않을 때)"""
+        self.driver = self.create_driver()
+    
+    def create_driver(self):
         """Chrome 드라이버 설정 (HTTP/2 비활성화)"""
         print("Setting up Chrome driver with HTTP/2 disabled...")
         
@@ -54,16 +67,17 @@ class FixedSeleniumCoupangRankChecker:
         
         try:
             service = Service(ChromeDriverManager().install())
-            self.driver = webdriver.Chrome(service=service, options=chrome_options)
+            driver = webdriver.Chrome(service=service, options=chrome_options)
             
             # 자동화 감지 방지 스크립트
-            self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+            driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
             
             # 페이지 로드 타임아웃 설정
-            self.driver.set_page_load_timeout(60)
-            self.driver.implicitly_wait(10)
+            driver.set_page_load_timeout(60)
+            driver.implicitly_wait(10)
             
             print("Chrome driver setup completed with HTTP/2 disabled")
+            return driver
             
         except Exception as e:
             print(f"Chrome driver setup failed: {e}")
@@ -90,9 +104,10 @@ class FixedSeleniumCoupangRankChecker:
             search_url = f"https://www.coupang.com/np/search?q={quote(keyword)}"
             print(f"Direct URL: {search_url}")
             
-            # 페이지 로드
+            # 페이지 로드 (상품 목록이 다 그려질 때까지 대기)
             self.driver.get(search_url)
-            time.sleep(5)  # 페이지 로딩 대기
+            if not self.waiter.wait_for_search_results(self.driver):
+                print("Product list not found within timeout")
             
             # 페이지 제목 확인
             page_title = self.driver.title
@@ -163,6 +178,10 @@ class FixedSeleniumCoupangRankChecker:
     
     def check_rank(self, keyword):
         """순위 체크 실행"""
+        if self.driver_pool is not None and self.driver is None:
+            # 풀에서 브라우저를 빌려 실행
+            return run_with_pooled_driver(self, self.check_rank, keyword)
+        
         print(f"\nRank check started: {keyword}")
         
         # IP 확인
@@ -208,6 +227,16 @@ class FixedSeleniumCoupangRankChecker:
     
     def close(self):
         """브라우저 종료"""
+        # 페이지 대기 시간 통계
+        for line in self.waiter.stats.summary():
+            print(f"Wait {line}")
+        
+        if self.driver_pool is not None:
+            print(self.driver_pool.summary())
+            # 같은 클래스의 다른 인스턴스가 쓰는 중이면 풀은 유지됨
+            release_pool(self.driver_pool)
+            self.driver_pool = None
+            return
         if self.driver:
             self.driver.quit()
             print("Browser closed")
@@ -217,7 +246,7 @@ def main():
     print("Fixed Selenium Coupang Rank Checker System")
     print("=" * 60)
     
-    checker = FixedSeleniumCoupangRankChecker()
+    checker = FixedSeleniumCoupangRankChecker(pool_size=1)
     
     try:
         # 테스트 키워드들
@@ -4,7 +4,10 @@ import json
 import time
 import hashlib
 import os
+import asyncio
 from urllib.parse import urlencode
+from async_page_fetcher import AsyncPageFetcher, aiohttp
+from search_result_parser import parse_search_results
 
 class HybridCoupangClient:
     def __init__(self):
@@ -147,13 +150,12 @@ class HybridCoupangClient:
             except Exception as e:
                 print(f"❌ {url}: 연결 실패 - {e}")
     
-    def get_ranking_data(self, api_name=None, **params):
-        """순위 데이터 조회"""
+    def select_api(self, api_name=None):
+        """이름에 api_name이 들어간 캡처 API 선택 (없으면 첫 번째, 찾지 못하면 None)"""
         if not self.captured_apis:
             print("❌ 사용 가능한 API가 없습니다")
             return None
         
-        # API 선택
         if api_name:
             selected_api = None
             for api in self.captured_apis:
@@ -170,9 +172,16 @@ class HybridCoupangClient:
         
         print(f"🎯 API 사용: {selected_api['name']}")
         print(f"📡 URL: {selected_api['url']}")
+        return selected_api
+    
+    def get_ranking_data(self, api_name=None, **params):
+        """순위 데이터 조회"""
+        selected_api = self.select_api(api_name)
+        if not selected_api:
+            return None
         
         try:
-            # 요청 파라미터 준비
+            # 요청 파라미터 준비 (API가 받는 파라미터만)
             request_params = {}
             for key, value in params.items():
                 if key in selected_api.get('required_params', {}):
@@ -305,15 +314,59 @@ class HybridCoupangClient:
         
         return None
     
-    def find_product_rank(self, keyword, product_id, max_pages=5):
-        """특정 상품의 순위 찾기"""
+    def parse_search_page(self, content, page, size=60):
+        """검색 API 응답 한 페이지를 전체 순위가 매겨진 상품 목록으로 변환 (JSON/HTML 모두)"""
+        try:
+            json_data = json.loads(content)
+        except ValueError:
+            return parse_search_results(content, page=page, page_size=size)
+        
+        products = self.parse_json_search_results(json_data) or []
+        for product in products:
+            product['product_id'] = str(product['product_id'])
+            product['rank'] += (page - 1) * size
+            product['page'] = page
+        return products
+    
+    def find_product_rank(self, keyword, product_id, max_pages=5, size=60):
+        """특정 상품의 순위 찾기 (페이지 동시 조회, 찾으면 남은 페이지 취소)
+        
+        search_products와 같은 캡처 API('검색')로 요청한다.
+        """
         print(f"🔍 상품 순위 검색: {keyword} - {product_id}")
         
+        if aiohttp is None:
+            print("⚠️ aiohttp가 설치되지 않았습니다. 페이지를 순차 조회합니다")
+            return self.find_product_rank_sequential(keyword, product_id, max_pages, size)
+        
+        selected_api = self.select_api('검색')
+        if not selected_api:
+            return None
+        
+        fetcher = AsyncPageFetcher(
+            headers=self.session.headers,
+            cookies=self.session.cookies.get_dict(),
+            search_url=selected_api['url'],
+            method=selected_api.get('method', 'GET'),
+            params={'size': size},
+            param_names=selected_api.get('required_params', {}),
+            parse=lambda content, page: self.parse_search_page(content, page, size)
+        )
+        result = asyncio.run(fetcher.find_product_rank(keyword, product_id, max_pages))
+        
+        if result:
+            print(f"🎉 상품 발견! 순위: {result['rank']}위")
+        else:
+            print(f"❌ {max_pages}페이지 내에서 상품을 찾을 수 없습니다")
+        return result
+    
+    def find_product_rank_sequential(self, keyword, product_id, max_pages=5, size=60):
+        """특정 상품의 순위 찾기 (한 페이지씩 순차 조회)"""
         for page in range(1, max_pages + 1):
             print(f"📄 {page}페이지 검색 중...")
             
             # 검색 실행
-            products = self.search_products(keyword, page=page)
+            products = self.search_products(keyword, page=page, size=size)
             
             if not products:
                 print(f"⚠️ {page}페이지에서 상품을 찾을 수 없습니다")
@@ -322,7 +375,7 @@ class HybridCoupangClient:
             # 해당 상품 찾기
             for product in products:
                 if product.get('product_id') == str(product_id):
-                    rank = (page - 1) * 60 + product.get('rank', 0)
+                    rank = (page - 1) * size + product.get('rank', 0)
                     print(f"🎉 상품 발견! 순위: {rank}위")
                     return {
                         'rank': rank,
@@ -1,9 +1,11 @@
 import requests
 import time
-import re
+import asyncio
 import json
 from datetime import datetime
 from urllib.parse import quote
+from search_result_parser import parse_search_results, iter_products_stream, PAGE_SIZE
+from async_page_fetcher import AsyncPageFetcher, aiohttp
 
 class HybridCoupangRankChecker:
     def __init__(self):
@@ -41,7 +43,20 @@ class HybridCoupangRankChecker:
             return None
     
     def search_products(self, keyword, max_pages=3):
-        """키워드로 상품 검색 및 순위 정보 추출"""
+        """키워드로 상품 검색 및 순위 정보 추출 (페이지 동시 조회)"""
+        if aiohttp is None:
+            print("⚠️ aiohttp가 설치되지 않았습니다. 페이지를 순차 조회합니다")
+            return self.search_products_sequential(keyword, max_pages)
+        
+        print(f"\n🔍 검색 키워드: {keyword}")
+        fetcher = AsyncPageFetcher(
+            headers=self.session.headers,
+            cookies=self.session.cookies.get_dict()
+        )
+        return asyncio.run(fetcher.fetch_pages(keyword, max_pages))
+    
+    def search_products_sequential(self, keyword, max_pages=3):
+        """키워드로 상품 검색 및 순위 정보 추출 (한 페이지씩 순차 조회)"""
         print(f"\n🔍 검색 키워드: {keyword}")
         all_products = []
         
@@ -77,44 +92,47 @@ class HybridCoupangRankChecker:
         return all_products
     
     def extract_product_info(self, html_content, page):
-        """HTML에서 상품 정보 추출"""
-        products = []
-        
-        # 상품 링크 패턴
-        product_pattern = r'/products/(\d+)'
-        product_ids = re.findall(product_pattern, html_content)
-        
-        # 상품 제목 패턴
-        title_pattern = r'<dt class="name">.*?<a[^>]*>([^<]+)</a>'
-        titles = re.findall(title_pattern, html_content, re.DOTALL)
-        
-        # 가격 패턴
-        price_pattern = r'<strong class="price-value">([^<]+)</strong>'
-        prices = re.findall(price_pattern, html_content)
-        
-        # 리뷰 수 패턴
-        review_pattern = r'<span class="rating-total-count">\(([^)]+)\)</span>'
-        reviews = re.findall(review_pattern, html_content)
-        
-        # 상품 정보 조합
-        max_items = min(len(product_ids), len(titles), len(prices))
+        """HTML에서 상품 정보 추출 (쿠팡은 페이지당 60개 상품)"""
+        return parse_search_results(html_content, page=page)
+    
+    def find_target_rank(self, keyword, target_product_id, max_pages=3):
+        """응답을 스트리밍으로 읽으며 타겟 상품을 찾으면 즉시 중단"""
+        print(f"\n🔍 검색 키워드: {keyword} (타겟: {target_product_id})")
+        target_product_id = str(target_product_id)
         
-        for i in range(max_items):
-            rank = (page - 1) * 60 + i + 1  # 쿠팡은 페이지당 60개 상품
-            
-            product_info = {
-                'rank': rank,
-                'product_id': product_ids[i],
-                'title': titles[i].strip() if i < len(titles) else 'N/A',
-                'price': prices[i].strip() if i < len(prices) else 'N/A',
-                'reviews': reviews[i].strip() if i < len(reviews) else '0',
-                'page': page,
-                'timestamp': datetime.now().isoformat()
-            }
+        for page in range(1, max_pages + 1):
+            try:
+                search_url = f"https://www.coupang.com/np/search?q={quote(keyword)}&page={page}"
+                print(f"  📄 페이지 {page}: {search_url}")
+                
+                start_time = time.time()
+                with self.session.get(search_url, timeout=30, stream=True) as response:
+                    if response.status_code == 200:
+                        position = 0
+                        for position, product in enumerate(iter_products_stream(response.iter_content(chunk_size=16384)), 1):
+                            if product['product_id'] == target_product_id:
+                                # 나머지 본문과 이후 페이지는 읽지 않는다
+                                response_time = round((time.time() - start_time) * 1000, 2)
+                                rank = (page - 1) * PAGE_SIZE + position
+                                print(f"  ✅ 타겟 발견: {position}번째 상품 ({response_time}ms)")
+                                return {
+                                    'rank': rank,
+                                    'page': page,
+                                    'product': dict(product, rank=rank, page=page)
+                                }
+                        
+                        response_time = round((time.time() - start_time) * 1000, 2)
+                        print(f"  📦 상품 {position}개 확인, 타겟 없음 ({response_time}ms)")
+                    else:
+                        print(f"  ❌ 실패: {response.status_code}")
+                    
+            except Exception as e:
+                print(f"  ❌ 오류: {e}")
             
-            products.append(product_info)
+            # 페이지 간 대기
+            time.sleep(2)
         
-        return products
+        return None
     
     def check_rank(self, keyword, target_product_id=None):
         """특정 키워드에서 상품 순위 확인"""
@@ -123,6 +141,17 @@ class HybridCoupangRankChecker:
         # IP 확인
         self.get_current_ip()
         
+        # 특정 상품 순위 찾기 (스트리밍 조기 종료)
+        if target_product_id:
+            result = self.find_target_rank(keyword, target_product_id)
+            
+            if result:
+                print(f"\n🎯 타겟 상품 순위: {result['rank']}위")
+                return result['rank']
+            else:
+                print(f"\n❌ 타겟 상품을 찾을 수 없습니다.")
+                return None
+        
         # 상품 검색
         products = self.search_products(keyword)
         
@@ -140,21 +169,6 @@ class HybridCoupangRankChecker:
             title = product['title'][:37] + "..." if len(product['title']) > 40 else product['title']
             print(f"{product['rank']:<4} {product['product_id']:<12} {title:<40} {product['price']:<10} {product['reviews']:<8}")
         
-        # 특정 상품 순위 찾기
-        if target_product_id:
-            target_rank = None
-            for product in products:
-                if product['product_id'] == target_product_id:
-                    target_rank = product['rank']
-                    break
-            
-            if target_rank:
-                print(f"\n🎯 타겟 상품 순위: {target_rank}위")
-                return target_rank
-            else:
-                print(f"\n❌ 타겟 상품을 찾을 수 없습니다.")
-                return None
-        
         return products
     
     def save_rank_data(self, keyword, products, filename=None):
@@ -6,6 +6,7 @@ import hashlib
 import uuid
 import os
 from urllib.parse import urlencode
+from search_result_parser import iter_products_stream, iter_json_products_stream, JSON_PRODUCT_KEYS
 
 class MobileCoupangAPIClient:
     def __init__(self):
@@ -174,8 +175,8 @@ class MobileCoupangAPIClient:
             except Exception as e:
                 print(f"❌ {url}: 연결 실패 - {e}")
     
-    def get_ranking_data(self, api_name=None, **params):
-        """순위 데이터 조회"""
+    def select_api(self, api_name=None):
+        """이름으로 API 선택 (없으면 첫 번째 API)"""
         if not self.captured_apis:
             print("❌ 사용 가능한 API가 없습니다")
             return None
@@ -197,27 +198,40 @@ class MobileCoupangAPIClient:
         
         print(f"🎯 API 사용: {selected_api['name']}")
         print(f"📡 URL: {selected_api['url']}")
+        return selected_api
+    
+    def call_api(self, selected_api, params, stream=False):
+        """선택한 API 호출"""
+        # 요청 파라미터 준비
+        request_params = {}
+        for key, value in params.items():
+            if key in selected_api.get('required_params', {}):
+                request_params[key] = value
+        
+        # API 호출
+        if selected_api['method'] == 'GET':
+            return self.session.get(
+                selected_api['url'],
+                params=request_params,
+                timeout=30,
+                stream=stream
+            )
+        else:
+            return self.session.post(
+                selected_api['url'],
+                json=request_params,
+                timeout=30,
+                stream=stream
+            )
+    
+    def get_ranking_data(self, api_name=None, **params):
+        """순위 데이터 조회"""
+        selected_api = self.select_api(api_name)
+        if not selected_api:
+            return None
         
         try:
-            # 요청 파라미터 준비
-            request_params = {}
-            for key, value in params.items():
-                if key in selected_api.get('required_params', {}):
-                    request_params[key] = value
-            
-            # API 호출
-            if selected_api['method'] == 'GET':
-                response = self.session.get(
-                    selected_api['url'],
-                    params=request_params,
-                    timeout=30
-                )
-            else:
-                response = self.session.post(
-                    selected_api['url'],
-                    json=request_params,
-                    timeout=30
-                )
+            response = self.call_api(selected_api, params)
             
             if response.status_code == 200:
                 try:
@@ -237,42 +251,54 @@ class MobileCoupangAPIClient:
             return None
     
     def find_product_rank(self, keyword, product_id, max_pages=5):
-        """특정 상품의 순위 찾기"""
+        """특정 상품의 순위 찾기 (응답을 스트리밍으로 읽고 찾는 즉시 중단)"""
         print(f"🔍 상품 순위 검색: {keyword} - {product_id}")
         
+        selected_api = self.select_api(api_name='검색')
+        if not selected_api:
+            return None
+        
         for page in range(1, max_pages + 1):
             print(f"📄 {page}페이지 검색 중...")
             
-            # 검색 API 호출
-            search_data = self.get_ranking_data(
-                api_name='검색',
-                query=keyword,
-                page=page,
-                size=60
-            )
-            
-            if not search_data:
+            try:
+                # 검색 API 호출
+                params = {'query': keyword, 'page': page, 'size': 60}
+                with self.call_api(selected_api, params, stream=True) as response:
+                    if response.status_code != 200:
+                        print(f"❌ API 호출 실패: {response.status_code}")
+                        continue
+                    
+                    # 상품이 도착하는 대로 확인
+                    chunks = response.iter_content(chunk_size=16384)
+                    if 'json' in response.headers.get('Content-Type', ''):
+                        products = iter_json_products_stream(chunks)
+                    else:
+                        products = iter_products_stream(chunks)
+                    
+                    checked = 0
+                    for i, product in enumerate(products):
+                        checked = i + 1
+                        if self.is_target_product(product, product_id):
+                            # 나머지 본문과 이후 페이지는 읽지 않는다
+                            rank = (page - 1) * 60 + i + 1
+                            print(f"🎉 상품 발견! 순위: {rank}위")
+                            return {
+                                'rank': rank,
+                                'page': page,
+                                'position': i + 1,
+                                'product': product
+                            }
+                    
+            except Exception as e:
+                print(f"❌ API 호출 중 오류: {e}")
                 continue
             
-            # 상품 목록에서 해당 상품 찾기
-            products = self.extract_products_from_response(search_data)
-            
-            if not products:
+            if not checked:
                 print(f"⚠️ {page}페이지에서 상품을 찾을 수 없습니다")
                 continue
             
-            for i, product in enumerate(products):
-                if self.is_target_product(product, product_id):
-                    rank = (page - 1) * 60 + i + 1
-                    print(f"🎉 상품 발견! 순위: {rank}위")
-                    return {
-                        'rank': rank,
-                        'page': page,
-                        'position': i + 1,
-                        'product': product
-                    }
-            
-            print(f"📋 {page}페이지: {len(products)}개 상품 확인, 대상 상품 없음")
+            print(f"📋 {page}페이지: {checked}개 상품 확인, 대상 상품 없음")
         
         print(f"❌ {max_pages}페이지 내에서 상품을 찾을 수 없습니다")
         return None
@@ -283,9 +309,7 @@ class MobileCoupangAPIClient:
             return []
         
         # 다양한 응답 구조 처리
-        product_keys = ['productList', 'products', 'items', 'data', 'results', 'list', 'content']
-        
-        for key in product_keys:
+        for key in JSON_PRODUCT_KEYS:
             if key in response_data:
                 products = response_data[key]
                 if isinstance(products, list):
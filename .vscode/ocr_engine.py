@@ -0,0 +1,260 @@
+import glob
+import threading
+import time
+import numpy as np
+from PIL import Image
+
+try:
+    import tesserocr
+except ImportError:
+    tesserocr = None
+
+try:
+    import pytesseract
+except ImportError:
+    pytesseract = None
+
+
+class OCREngine:
+    """한 번의 OCR로 텍스트와 단어별 신뢰도를 얻는 엔진
+
+    기본 psm으로 한 번 인식하고, 평균 신뢰도가 min_confidence보다 낮을 때만
+    fallback_psms를 차례로 시도한다. tesserocr가 있으면 스레드별 Tesseract
+    API 핸들을 만들어 두고 재사용하고, 없으면 pytesseract.image_to_data를 사용한다.
+    """
+
+    def __init__(self, lang='eng', oem=3, psm=6, fallback_psms=(3, 4, 11),
+                 min_confidence=60, tesseract_cmd=None, tessdata_path=None):
+        if tesserocr is None and pytesseract is None:
+            raise ImportError("tesserocr 또는 pytesseract가 설치되지 않았습니다. pip install tesserocr")
+
+        self.lang = lang
+        self.oem = oem
+        self.psm = psm
+        self.fallback_psms = tuple(fallback_psms)
+        self.min_confidence = min_confidence
+        self.tessdata_path = tessdata_path
+        self.backend = 'tesserocr' if tesserocr is not None else 'pytesseract'
+
+        if tesseract_cmd and pytesseract is not None:
+            pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+
+        # tesserocr API는 스레드 간 공유할 수 없으므로 스레드별로 보관
+        self.local = threading.local()
+        self.apis = []
+        self.apis_lock = threading.Lock()
+
+    def get_api(self, psm):
+        """현재 스레드의 Tesseract API 핸들 (psm별로 한 번만 생성)"""
+        apis = getattr(self.local, 'apis', None)
+        if apis is None:
+            apis = self.local.apis = {}
+
+        api = apis.get(psm)
+        if api is None:
+            kwargs = {'lang': self.lang, 'psm': psm, 'oem': self.oem}
+            if self.tessdata_path:
+                kwargs['path'] = self.tessdata_path
+            api = tesserocr.PyTessBaseAPI(**kwargs)
+            apis[psm] = api
+            with self.apis_lock:
+                self.apis.append(api)
+
+        return api
+
+    def run_once(self, image, psm):
+        """지정한 psm으로 한 번 인식 (text, 단어별 신뢰도 목록)"""
+        if self.backend == 'tesserocr':
+            api = self.get_api(psm)
+            api.SetImage(image)
+            text = api.GetUTF8Text()
+            confidences = [conf for conf in api.AllWordConfidences() if conf >= 0]
+            return text, confidences
+
+        data = pytesseract.image_to_data(
+            image,
+            config=f'--oem {self.oem} --psm {psm} -l {self.lang}',
+            output_type=pytesseract.Output.DICT
+        )
+
+        # 단어를 줄 단위로 다시 묶음
+        lines = {}
+        confidences = []
+        for index, word in enumerate(data['text']):
+            word = word.strip()
+            conf = float(data['conf'][index])
+            if not word or conf < 0:
+                continue
+
+            key = (data['block_num'][index], data['par_num'][index], data['line_num'][index])
+            lines.setdefault(key, []).append(word)
+            confidences.append(conf)
+
+        text = '\n'.join(' '.join(words) for words in lines.values())
+        return text, confidences
+
+    def recognize(self, image):
+        """텍스트 인식 (신뢰도가 낮을 때만 다른 psm 시도)
+
+        반환: {'text', 'confidence', 'word_count', 'psm', 'passes'}
+        """
+        if isinstance(image, np.ndarray):
+            image = Image.fromarray(image)
+
+        best = None
+        passes = 0
+
+        for psm in (self.psm,) + self.fallback_psms:
+            text, confidences = self.run_once(image, psm)
+            passes += 1
+
+            confidence = sum(confidences) / len(confidences) if confidences else 0.0
+            result = {
+                'text': text,
+                'confidence': confidence,
+                'word_count': len(confidences),
+                'psm': psm
+            }
+
+            if best is None or (confidence, len(confidences)) > (best['confidence'], best['word_count']):
+                best = result
+
+            if confidence >= self.min_confidence and confidences:
+                break
+
+        best['passes'] = passes
+        return best
+
+    def image_to_string(self, image):
+        """인식된 텍스트만 반환"""
+        return self.recognize(image)['text']
+
+    def close(self):
+        """생성한 Tesseract API 핸들 정리"""
+        with self.apis_lock:
+            for api in self.apis:
+                api.End()
+            self.apis = []
+        self.local = threading.local()
+
+
+_engines = {}
+_engines_lock = threading.Lock()
+
+
+def get_engine(**kwargs):
+    """같은 설정의 엔진은 프로세스에서 하나만 생성해 재사용"""
+    key = tuple(sorted((name, value if not isinstance(value, list) else tuple(value))
+                       for name, value in kwargs.items()))
+    with _engines_lock:
+        engine = _engines.get(key)
+        if engine is None:
+            engine = OCREngine(**kwargs)
+            _engines[key] = engine
+        return engine
+
+
+LEGACY_CONFIGS = [
+    r'--oem 3 --psm 6 -l eng',
+    r'--oem 3 --psm 3 -l eng',
+    r'--oem 3 --psm 4 -l eng',
+    r'--oem 3 --psm 8 -l eng',
+    r'--oem 3 --psm 13 -l eng'
+]
+
+
+def legacy_extract_text(image):
+    """기존 방식: 다섯 가지 설정으로 모두 인식하고 가장 긴 결과 사용 (벤치마크 비교용)"""
+    best_text = ""
+    for config in LEGACY_CONFIGS:
+        text = pytesseract.image_to_string(image, config=config)
+        if len(text.strip()) > len(best_text.strip()):
+            best_text = text
+    return best_text
+
+
+def build_sample_screen(width=1080, height=1920):
+    """벤치마크용 검색 결과 화면 생성 (스크린샷이 없을 때 사용)"""
+    import cv2
+
+    screen = np.full((height, width), 255, dtype=np.uint8)
+    for index in range(6):
+        top = 200 + index * 280
+        cv2.putText(screen, f'Trolley cart {index + 1} folding', (60, top),
+                    cv2.FONT_HERSHEY_SIMPLEX, 1.4, 0, 3)
+        cv2.putText(screen, f'{(index + 1) * 12},900 won', (60, top + 70),
+                    cv2.FONT_HERSHEY_SIMPLEX, 1.2, 0, 2)
+        cv2.putText(screen, f'({(index + 3) * 131})', (60, top + 130),
+                    cv2.FONT_HERSHEY_SIMPLEX, 1.0, 0, 2)
+    return screen
+
+
+def load_fixtures(pattern):
+    """스크린샷 파일을 그레이스케일 배열로 읽기"""
+    import cv2
+
+    images = []
+    for path in sorted(glob.glob(pattern)):
+        image = cv2.imread(path, cv2.IMREAD_GRAYSCALE)
+        if image is not None:
+            images.append((path, image))
+    return images
+
+
+def benchmark(images, engine=None, iterations=3, log=print):
+    """기존 5회 인식과 엔진(단일 인식 + 필요 시 재시도) 비교"""
+    engine = engine or get_engine()
+    results = {'legacy': 0.0, 'engine': 0.0, 'passes': 0}
+
+    for name, image in images:
+        pil_image = Image.fromarray(image)
+
+        # 기존 방식은 pytesseract가 있을 때만 측정
+        legacy_seconds = 0.0
+        if pytesseract is not None:
+            start_time = time.perf_counter()
+            for _ in range(iterations):
+                legacy_extract_text(pil_image)
+            legacy_seconds = (time.perf_counter() - start_time) / iterations
+
+        start_time = time.perf_counter()
+        for _ in range(iterations):
+            result = engine.recognize(image)
+        engine_seconds = (time.perf_counter() - start_time) / iterations
+
+        results['legacy'] += legacy_seconds
+        results['engine'] += engine_seconds
+        results['passes'] += result['passes']
+
+        log(f"  {name}: 기존 {legacy_seconds * 1000:.0f}ms, 엔진 {engine_seconds * 1000:.0f}ms "
+            f"(psm {result['psm']}, {result['passes']}회, 신뢰도 {result['confidence']:.0f})")
+
+    if images:
+        log(f"📊 평균: 기존 {results['legacy'] / len(images) * 1000:.0f}ms, "
+            f"엔진 {results['engine'] / len(images) * 1000:.0f}ms ({engine.backend})")
+
+    return results
+
+
+def main():
+    """저장된 스크린샷(없으면 생성한 화면)으로 OCR 벤치마크"""
+    import sys
+
+    print("OCR Engine Benchmark")
+    print("=" * 50)
+
+    pattern = sys.argv[1] if len(sys.argv) > 1 else 'final_search_*.png'
+    images = load_fixtures(pattern)
+    if not images:
+        print(f"⚠️ 스크린샷 없음 ({pattern}) - 생성한 화면 사용")
+        images = [('sample_screen', build_sample_screen())]
+
+    engine = get_engine()
+    try:
+        benchmark(images, engine)
+    finally:
+        engine.close()
+
+
+if __name__ == "__main__":
+    main()
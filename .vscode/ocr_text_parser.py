@@ -0,0 +1,215 @@
+import glob
+import json
+import re
+import sys
+import time
+from datetime import datetime
+from functools import lru_cache
+
+NUMBER = r'\d{1,3}(?:,\d{3})*'
+
+# 가격 (여러 표기를 하나의 정규식으로, 숫자 부분은 한 번만 검사)
+PRICE_RE = re.compile(rf'(?P<number>{NUMBER})\s*(?P<unit>원|₩|KRW|W)|₩\s*(?P<prefix>{NUMBER})')
+PRICE_UNIT_PRIORITY = {'원': 0, '₩': 2, 'W': 3, 'KRW': 4}
+
+# 리뷰 수
+REVIEW_RE = re.compile(
+    rf'(?P<number>{NUMBER})\s*(?P<unit>개?\s*리뷰|review|개|건)'
+    rf'|리뷰\s*(?P<korean>{NUMBER})'
+    rf'|review\s*(?P<english>{NUMBER})'
+    rf'|\((?P<paren>{NUMBER})\)'
+)
+REVIEW_UNIT_PRIORITY = {'review': 3, '개': 5, '건': 6}
+REVIEW_GROUP_PRIORITY = {'korean': 1, 'paren': 2, 'english': 4}
+
+
+def price_priority(match):
+    """가격 후보의 (우선순위, 값) - 숫자 뒤 '원'이 가장 우선"""
+    if match.lastgroup == 'prefix':
+        return 1, match.group('prefix')
+    return PRICE_UNIT_PRIORITY[match.group('unit')], match.group('number')
+
+
+def review_priority(match):
+    """리뷰 수 후보의 (우선순위, 값) - '리뷰'가 붙은 숫자가 가장 우선"""
+    if match.lastgroup in REVIEW_GROUP_PRIORITY:
+        return REVIEW_GROUP_PRIORITY[match.lastgroup], match.group(match.lastgroup)
+    unit = match.group('unit')
+    return (0 if unit.endswith('리뷰') else REVIEW_UNIT_PRIORITY[unit]), match.group('number')
+
+
+# OCR 잡음 문자
+NOISE_RE = re.compile('[\x00�\xa9]')
+
+MIN_LINE_LENGTH = 5
+MAX_TITLE_LENGTH = 50
+
+
+def search_by_priority(regex, rank_match, line):
+    """한 번 훑어서 찾은 후보 중 우선순위가 가장 높은 값 (기존 패턴 목록의 순서와 같은 결과)"""
+    best = None
+    for match in regex.finditer(line):
+        candidate = rank_match(match)
+        if best is None or candidate[0] < best[0]:
+            best = candidate
+            if best[0] == 0:
+                break
+    return best[1] if best else None
+
+
+@lru_cache(maxsize=256)
+def keyword_pattern(keyword):
+    """키워드 검색용 정규식 (특수문자 이스케이프, 대소문자/OCR 띄어쓰기 차이 무시)"""
+    characters = [re.escape(character) for character in keyword if not character.isspace()]
+    return re.compile(r'\s*'.join(characters), re.IGNORECASE)
+
+
+def parse_line(line, rank):
+    """키워드가 포함된 줄 하나를 상품 정보로 변환"""
+    price = search_by_priority(PRICE_RE, price_priority, line)
+    reviews = search_by_priority(REVIEW_RE, review_priority, line)
+
+    return {
+        'rank': rank,
+        'product_id': f'extracted_{rank}',
+        'title': line[:MAX_TITLE_LENGTH] + "..." if len(line) > MAX_TITLE_LENGTH else line,
+        'price': price + '원' if price else 'N/A',
+        'reviews': reviews or '0',
+        'timestamp': datetime.now().isoformat()
+    }
+
+
+def parse_products(text, keyword, max_products=20):
+    """OCR 텍스트에서 키워드가 포함된 줄을 상품으로 추출 (화면 줄 순서 유지)"""
+    if isinstance(text, bytes):
+        text = text.decode('utf-8', errors='replace')
+    text = NOISE_RE.sub('', text)
+
+    pattern = keyword_pattern(keyword)
+    products = []
+    for line in text.split('\n'):
+        line = line.strip()
+        if len(line) < MIN_LINE_LENGTH or not pattern.search(line):
+            continue
+
+        products.append(parse_line(line, len(products) + 1))
+        if len(products) >= max_products:
+            break
+
+    return products
+
+
+def legacy_parse_products(text, keyword):
+    """기존 방식: 호출마다 패턴 목록을 만들고 줄마다 차례로 검색 (벤치마크 비교용)"""
+    price_patterns = [
+        r'(\d{1,3}(?:,\d{3})*)\s*원', r'₩\s*(\d{1,3}(?:,\d{3})*)', r'(\d{1,3}(?:,\d{3})*)\s*₩',
+        r'(\d{1,3}(?:,\d{3})*)\s*W', r'(\d{1,3}(?:,\d{3})*)\s*KRW', r'(\d{1,3}(?:,\d{3})*)\s*₩',
+        r'(\d{1,3}(?:,\d{3})*)\s*원', r'(\d{1,3}(?:,\d{3})*)\s*원', r'(\d{1,3}(?:,\d{3})*)\s*원',
+        r'(\d{1,3}(?:,\d{3})*)\s*원'
+    ]
+    review_patterns = [
+        r'(\d{1,3}(?:,\d{3})*)\s*개?\s*리뷰', r'리뷰\s*(\d{1,3}(?:,\d{3})*)', r'\((\d{1,3}(?:,\d{3})*)\)',
+        r'(\d{1,3}(?:,\d{3})*)\s*review', r'review\s*(\d{1,3}(?:,\d{3})*)', r'(\d{1,3}(?:,\d{3})*)\s*개',
+        r'(\d{1,3}(?:,\d{3})*)\s*건'
+    ]
+
+    text = text.replace('\x00', '').replace('�', '').replace('\xa9', '')
+    products = []
+    for line in text.split('\n'):
+        line = line.strip()
+        if not line or len(line) < 5 or keyword.lower() not in line.lower():
+            continue
+
+        product = {'price': 'N/A', 'reviews': '0'}
+        for pattern in price_patterns:
+            match = re.search(pattern, line)
+            if match:
+                product['price'] = match.group(1) + '원'
+                break
+        for pattern in review_patterns:
+            match = re.search(pattern, line)
+            if match:
+                product['reviews'] = match.group(1)
+                break
+
+        products.append(product)
+        if len(products) >= 20:
+            break
+
+    return products
+
+
+def load_recorded_texts(pattern):
+    """저장된 순위 결과(JSON)의 OCR 제목 줄로 화면 텍스트 재구성 [(keyword, text), ...]"""
+    texts = []
+    for path in sorted(glob.glob(pattern)):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            continue
+
+        lines = []
+        for index, product in enumerate(data.get('products', [])):
+            lines.append(product.get('title', ''))
+            # 제목 아래 가격/리뷰 줄이 오는 화면 구성
+            lines.append(f"{(index + 1) * 7},{index % 10}00원 ({(index + 2) * 31:,})")
+            lines.append("무료배송 내일(토) 도착 보장")
+        if data.get('keyword') and lines:
+            texts.append((data['keyword'], '\n'.join(lines)))
+
+    return texts
+
+
+def build_sample_text(keyword='트롤리', count=20):
+    """벤치마크용 OCR 텍스트 (키워드가 들어간 제목 줄과 잡음 줄)"""
+    lines = []
+    for index in range(count):
+        lines.append(f"코멧 {keyword} 접이식 카트 {index + 1}호 대용량 12,{index % 10}00원 리뷰 {index * 37:,}")
+        lines.append("로켓배송 | 내일 도착 보장 (2개)")
+        lines.append("ⓒ 광고 ₩ 9,900")
+    return '\n'.join(lines)
+
+
+def benchmark(samples, iterations=200, log=print):
+    """기존 파서와 사전 컴파일 파서 비교 (샘플당 평균 ms)"""
+    for name, function in [('legacy', legacy_parse_products), ('compiled', parse_products)]:
+        start_time = time.perf_counter()
+        for _ in range(iterations):
+            for keyword, text in samples:
+                function(text, keyword)
+        elapsed = (time.perf_counter() - start_time) / (iterations * len(samples)) * 1000
+        log(f"  {name}: {elapsed:.3f}ms/화면")
+
+
+def main():
+    """저장된 OCR 결과로 파서 결과 비교와 마이크로 벤치마크"""
+    print("OCR Text Parser Benchmark")
+    print("=" * 50)
+
+    pattern = sys.argv[1] if len(sys.argv) > 1 else '*rank_data_*.json'
+    samples = load_recorded_texts(pattern)
+    print(f"저장된 OCR 결과 {len(samples)}개 ({pattern})")
+    samples.append(('트롤리', build_sample_text()))
+
+    # 가격/리뷰 추출 결과가 기존 파서와 같은지 확인
+    mismatches = 0
+    for keyword, text in samples:
+        old = [(product['price'], product['reviews']) for product in legacy_parse_products(text, keyword)]
+        new = [(product['price'], product['reviews']) for product in parse_products(text, keyword)]
+        if old != new:
+            mismatches += 1
+            print(f"⚠️ 결과 다름: {keyword} {old[:3]} / {new[:3]}")
+    print(f"결과 비교: {len(samples) - mismatches}/{len(samples)} 일치")
+
+    # 정규식 특수문자가 들어간 키워드
+    for keyword in ['C++ 책', '(특가) 트롤리', '트롤리*2']:
+        text = f"신간 {keyword} 입문서 15,000원 (12)\n다른 상품 9,900원"
+        products = parse_products(text, keyword)
+        print(f"  '{keyword}': {len(products)}개 {products[0]['price'] if products else ''}")
+
+    benchmark(samples)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,9 @@
 import requests
 import time
-import re
 import json
 from datetime import datetime
 from urllib.parse import quote
+from search_result_parser import parse_search_results
 
 class OptimizedCoupangRankChecker:
     def __init__(self):
@@ -80,60 +80,7 @@ class OptimizedCoupangRankChecker:
     
     def extract_product_info(self, html_content):
         """Extract product info from HTML"""
-        products = []
-        
-        # Product link pattern
-        product_pattern = r'/products/(\d+)'
-        product_ids = re.findall(product_pattern, html_content)
-        
-        # Product title pattern (more flexible)
-        title_patterns = [
-            r'<dt class="name">.*?<a[^>]*>([^<]+)</a>',
-            r'<a[^>]*class="[^"]*name[^"]*"[^>]*>([^<]+)</a>',
-            r'data-product-id="[^"]*"[^>]*>([^<]+)</a>'
-        ]
-        
-        titles = []
-        for pattern in title_patterns:
-            found_titles = re.findall(pattern, html_content, re.DOTALL)
-            if found_titles:
-                titles = found_titles
-                break
-        
-        # Price pattern (more flexible)
-        price_patterns = [
-            r'<strong class="price-value">([^<]+)</strong>',
-            r'<span class="price-value">([^<]+)</span>',
-            r'data-price="([^"]*)"'
-        ]
-        
-        prices = []
-        for pattern in price_patterns:
-            found_prices = re.findall(pattern, html_content)
-            if found_prices:
-                prices = found_prices
-                break
-        
-        # Review count pattern
-        review_pattern = r'<span class="rating-total-count">\(([^)]+)\)</span>'
-        reviews = re.findall(review_pattern, html_content)
-        
-        # Combine product info
-        max_items = min(len(product_ids), len(titles), len(prices))
-        
-        for i in range(max_items):
-            product_info = {
-                'rank': i + 1,
-                'product_id': product_ids[i],
-                'title': titles[i].strip() if i < len(titles) else 'N/A',
-                'price': prices[i].strip() if i < len(prices) else 'N/A',
-                'reviews': reviews[i].strip() if i < len(reviews) else '0',
-                'timestamp': datetime.now().isoformat()
-            }
-            
-            products.append(product_info)
-        
-        return products
+        return parse_search_results(html_content)
     
     def check_rank(self, keyword):
         """Check product rank for keyword"""
@@ -0,0 +1,290 @@
+import re
+import sys
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from browser_wait import BrowserWaiter
+from search_result_parser import build_sample_page, parse_search_results
+
+# 상품 목록 파싱에 필요 없는 리소스 (이미지, 동영상/음성, 웹폰트)
+BLOCKED_RESOURCE_PATTERNS = [
+    '*.jpg*', '*.jpeg*', '*.png*', '*.gif*', '*.webp*', '*.svg*', '*.ico*',
+    '*.mp4*', '*.webm*', '*.m3u8*', '*.mp3*',
+    '*.woff*', '*.ttf*', '*.otf*', '*.eot*'
+]
+
+# 광고/트래킹 외부 호스트
+BLOCKED_THIRD_PARTY_HOSTS = [
+    'doubleclick.net', 'googlesyndication.com', 'google-analytics.com', 'googletagmanager.com',
+    'googleadservices.com', 'facebook.net', 'facebook.com', 'criteo.com', 'criteo.net',
+    'adnxs.com', 'mobon.net', 'kakao.ad', 'ads-partners.coupang.com', 'ljc.coupang.com'
+]
+
+def blocked_url_patterns(resources=True, third_party_hosts=None):
+    """CDP Network.setBlockedURLs에 넘길 URL 패턴 목록 ('*' 와일드카드)"""
+    patterns = list(BLOCKED_RESOURCE_PATTERNS) if resources else []
+    hosts = BLOCKED_THIRD_PARTY_HOSTS if third_party_hosts is None else third_party_hosts
+    patterns += [f'*://{host}/*' for host in hosts] + [f'*.{host}/*' for host in hosts]
+    return patterns
+
+
+def url_is_blocked(url, patterns):
+    """URL이 차단 패턴 중 하나와 일치하는지 (CDP와 같은 '*' 와일드카드 규칙)"""
+    for pattern in patterns:
+        regex = '.*'.join(re.escape(part) for part in pattern.split('*'))
+        if re.fullmatch(regex, url):
+            return True
+    return False
+
+
+def apply_chrome_profile(chrome_options):
+    """Chrome/Whale 옵션: DOMContentLoaded에서 get() 반환, 이미지 로딩 끔"""
+    chrome_options.page_load_strategy = 'eager'
+    chrome_options.add_experimental_option('prefs', {'profile.managed_default_content_settings.images': 2})
+    chrome_options.add_argument('--blink-settings=imagesEnabled=false')
+    chrome_options.add_argument('--autoplay-policy=user-gesture-required')
+
+
+def apply_firefox_profile(firefox_options):
+    """Firefox 옵션: eager 로딩, 이미지/웹폰트/자동재생 끔, 추적 차단 목록으로 광고 호스트 차단
+
+    Firefox는 URL 패턴 차단 명령이 없어 외부 호스트는 내장 추적 차단 목록으로 대신한다.
+    """
+    firefox_options.page_load_strategy = 'eager'
+    firefox_options.set_preference("permissions.default.image", 2)
+    firefox_options.set_preference("gfx.downloadable_fonts.enabled", False)
+    firefox_options.set_preference("media.autoplay.default", 5)
+    firefox_options.set_preference("media.autoplay.blocking_policy", 2)
+    firefox_options.set_preference("privacy.trackingprotection.enabled", True)
+    firefox_options.set_preference("privacy.trackingprotection.socialtracking.enabled", True)
+    firefox_options.set_preference("network.prefetch-next", False)
+    firefox_options.set_preference("network.dns.disablePrefetch", True)
+
+
+def apply_request_blocking(driver, patterns=None):
+    """현재 탭에 요청 차단 적용 (Chromium 계열만, 새 탭마다 다시 호출해야 함)
+
+    반환: 적용했으면 True (Firefox 등 CDP가 없는 드라이버는 False)
+    """
+    if not hasattr(driver, 'execute_cdp_cmd'):
+        return False
+    driver.execute_cdp_cmd('Network.enable', {})
+    driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': patterns or blocked_url_patterns()})
+    return True
+
+
+def load_search_page(driver, url, waiter=None, timeout=15, patterns=None):
+    """차단 적용 후 검색 페이지를 열고 상품 목록이 다 그려질 때까지 대기 (시간 초과면 False)"""
+    apply_request_blocking(driver, patterns)
+    driver.get(url)
+    return (waiter or BrowserWaiter()).wait_for_search_results(driver, timeout=timeout)
+
+
+class FixtureServer:
+    """검색 결과 페이지와 이미지/폰트/동영상/외부 스크립트를 내려주는 로컬 서버 (전송 바이트 기록)
+
+    페이지는 localhost로, 광고/트래킹 리소스는 127.0.0.1(다른 호스트)로 참조한다.
+    """
+
+    RESOURCE_SIZES = {'image': 30000, 'font': 120000, 'media': 600000, 'script': 80000}
+    RESOURCE_DELAY = 0.02
+
+    def __init__(self, products=60):
+        self.products = products
+        self.bytes_sent = 0
+        self.requests = 0
+        self.lock = threading.Lock()
+        self.server = None
+
+    def page_html(self):
+        """이미지/폰트/동영상/외부 광고 스크립트가 포함된 검색 결과 HTML"""
+        third_party = f"http://127.0.0.1:{self.port}"
+        body = build_sample_page(self.products).replace('//thumbnail.coupangcdn.com/', '/img/')
+        return (
+            '<!DOCTYPE html><html><head><meta charset="utf-8"><title>검색 결과</title>'
+            '<style>@font-face{font-family:f;src:url(/font/main.woff2)}body{font-family:f}</style>'
+            f'<script src="{third_party}/ads/tracker.js"></script></head><body>'
+            f'{body}<video autoplay src="/media/ad.mp4"></video>'
+            f'<iframe src="{third_party}/ads/banner.html"></iframe></body></html>'
+        )
+
+    def resource_size(self, path):
+        """경로별 리소스 크기"""
+        if path.startswith('/img/'):
+            return self.RESOURCE_SIZES['image']
+        if path.startswith('/font/'):
+            return self.RESOURCE_SIZES['font']
+        if path.startswith('/media/'):
+            return self.RESOURCE_SIZES['media']
+        return self.RESOURCE_SIZES['script']
+
+    def start(self):
+        """백그라운드 스레드로 서버 시작"""
+        fixture = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.startswith('/np/search'):
+                    body = fixture.page_html().encode('utf-8')
+                    content_type = 'text/html; charset=utf-8'
+                else:
+                    time.sleep(fixture.RESOURCE_DELAY)
+                    body = b'\0' * fixture.resource_size(self.path)
+                    content_type = 'application/octet-stream'
+
+                # 클라이언트가 응답을 다 받기 전에 집계 (측정 사이 초기화와 겹치지 않게)
+                with fixture.lock:
+                    fixture.bytes_sent += len(body)
+                    fixture.requests += 1
+
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.send_header('Cache-Control', 'no-store')
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.port = self.server.server_address[1]
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return f"http://localhost:{self.port}/np/search?q=test"
+
+    def reset_counters(self):
+        """전송 기록 초기화"""
+        with self.lock:
+            self.bytes_sent = 0
+            self.requests = 0
+
+    def stop(self):
+        """서버 종료"""
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+
+
+def page_resource_urls(html_content, page_url):
+    """페이지가 불러올 하위 리소스 URL 목록 (src 속성과 CSS url())"""
+    base = re.match(r'https?://[^/]+', page_url).group()
+    urls = re.findall(r'\bsrc="([^"]+)"', html_content) + re.findall(r'url\(([^)]+)\)', html_content)
+    return [base + url if url.startswith('/') else url for url in urls]
+
+
+def simulate_page_load(url, patterns=None, eager=False):
+    """브라우저 없이 페이지 로드 요청 순서를 흉내 냄 (첫 파싱까지 초, 상품 수 반환)
+
+    eager면 HTML을 받자마자 파싱하고, 아니면 모든 하위 리소스를 받은 뒤(load 이벤트) 파싱한다.
+    차단 패턴에 걸린 리소스는 요청하지 않으므로 줄어든 전송량/시간은 차단 목록으로 정해지는 값이다.
+    실제 브라우저가 패턴대로 차단하는지는 measure_browser로 확인해야 한다.
+    """
+    start_time = time.perf_counter()
+    with urllib.request.urlopen(url) as response:
+        html_content = response.read().decode('utf-8')
+
+    resources = [resource for resource in page_resource_urls(html_content, url)
+                 if not (patterns and url_is_blocked(resource, patterns))]
+
+    def fetch(resource):
+        with urllib.request.urlopen(resource) as response:
+            return len(response.read())
+
+    def fetch_all():
+        # 브라우저처럼 호스트당 6개씩 동시에 요청
+        with ThreadPoolExecutor(max_workers=6) as executor:
+            list(executor.map(fetch, resources))
+
+    if not eager:
+        fetch_all()
+    products = parse_search_results(html_content)
+    first_parse = time.perf_counter() - start_time
+    if eager:
+        fetch_all()
+
+    return first_parse, len(products)
+
+
+def create_browser(name, fast):
+    """실제 브라우저로 비교할 때 사용할 헤드리스 드라이버"""
+    from selenium import webdriver
+
+    if name == 'firefox':
+        options = webdriver.FirefoxOptions()
+        options.add_argument('-headless')
+        if fast:
+            apply_firefox_profile(options)
+        return webdriver.Firefox(options=options)
+
+    options = webdriver.ChromeOptions()
+    options.add_argument('--headless=new')
+    if fast:
+        apply_chrome_profile(options)
+    return webdriver.Chrome(options=options)
+
+
+def measure_browser(name, url, fixture, fast, patterns):
+    """실제 브라우저로 한 번 로드해 (전송 바이트, 첫 파싱까지 초, 상품 수) 측정"""
+    driver = create_browser(name, fast)
+    try:
+        fixture.reset_counters()
+        start_time = time.perf_counter()
+        if fast:
+            load_search_page(driver, url, patterns=patterns)
+        else:
+            driver.get(url)
+        products = parse_search_results(driver.page_source)
+        first_parse = time.perf_counter() - start_time
+        time.sleep(1)  # 뒤늦게 요청된 리소스까지 집계
+        return fixture.bytes_sent, first_parse, len(products)
+    finally:
+        driver.quit()
+
+
+def main():
+    """로컬 서버로 전체 로드와 차단 프로파일 비교 (인자: chrome/firefox면 실제 브라우저 사용)
+
+    인자가 없으면 시뮬레이션만 한다. 시뮬레이터는 차단 URL을 처음부터 요청하지 않으므로
+    이때의 수치는 차단 효과의 측정이 아니라 차단 목록이 페이지 리소스를 얼마나 덮는지에 대한 추정이다.
+    """
+    print("Page Load Profile Check")
+    print("=" * 50)
+
+    fixture = FixtureServer()
+    url = fixture.start()
+    browser = sys.argv[1] if len(sys.argv) > 1 else None
+    if not browser:
+        print("⚠️ 브라우저 없이 시뮬레이션 (차단 효과 측정은 인자로 chrome 또는 firefox 지정)")
+
+    # 로컬 서버의 127.0.0.1을 외부 광고 호스트로 취급
+    patterns = blocked_url_patterns(third_party_hosts=BLOCKED_THIRD_PARTY_HOSTS + [f'127.0.0.1:{fixture.port}'])
+
+    try:
+        results = {}
+        for name, fast in [('전체 로드', False), ('차단 프로파일', True)]:
+            if browser:
+                results[name] = measure_browser(browser, url, fixture, fast, patterns)
+            else:
+                fixture.reset_counters()
+                first_parse, count = simulate_page_load(url, patterns if fast else None, eager=fast)
+                results[name] = (fixture.bytes_sent, first_parse, count)
+
+            sent, first_parse, count = results[name]
+            print(f"  {name}: {sent / 1024:,.0f}KB, 첫 파싱까지 {first_parse * 1000:.0f}ms, 상품 {count}개")
+
+        (full_bytes, full_time, full_count), (fast_bytes, fast_time, fast_count) = results.values()
+        same = '동일 ✅' if full_count == fast_count else '다름 ❌'
+        if browser:
+            print(f"📊 {browser}: 전송량 {full_bytes / max(fast_bytes, 1):.1f}배 감소, "
+                  f"첫 파싱 {full_time / max(fast_time, 1e-6):.1f}배 빠름, 상품 목록 {same}")
+        else:
+            print(f"📊 차단 목록 적용 시 예상 전송량 {full_bytes / max(fast_bytes, 1):.1f}배 감소 (시뮬레이션 추정치), "
+                  f"리소스 없이 파싱한 상품 목록 {same}")
+    finally:
+        fixture.stop()
+
+
+if __name__ == "__main__":
+    main()
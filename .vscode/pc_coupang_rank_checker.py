@@ -6,10 +6,12 @@ from datetime import datetime
 import re
 from urllib.parse import quote
 import random
+from rank_index import RankIndex
 
 class PCCoupangRankChecker:
     def __init__(self):
         self.session = requests.Session()
+        self.rank_index = None
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
@@ -77,6 +79,8 @@ class PCCoupangRankChecker:
     def extract_products_from_html(self, soup, keyword):
         """HTML에서 상품 정보 추출"""
         products = []
+        # 파싱하면서 추적 상품 조회용 색인도 함께 만듦
+        self.rank_index = RankIndex(products)
         
         try:
             # 상품 리스트 찾기
@@ -95,6 +99,7 @@ class PCCoupangRankChecker:
                     product_info = self.parse_product_item(item, i + 1, keyword)
                     if product_info:
                         products.append(product_info)
+                        self.rank_index.add(product_info)
                 except Exception as e:
                     print(f"Error parsing product {i+1}: {e}")
                     continue
@@ -249,23 +254,14 @@ class PCCoupangRankChecker:
         return filename
     
     def find_specific_product(self, products, target_url):
-        """특정 URL의 상품 순위 찾기"""
+        """특정 URL의 상품 순위 찾기 (같은 검색 결과는 한 번 만든 색인으로 바로 조회)"""
         if not target_url or not products:
             return None
         
-        # URL에서 상품 ID 추출
-        match = re.search(r'/products/(\d+)', target_url)
-        if not match:
-            return None
-        
-        target_product_id = match.group(1)
-        
-        # 상품 목록에서 해당 ID 찾기
-        for product in products:
-            if product['product_id'] == target_product_id:
-                return product
+        if self.rank_index is None or not self.rank_index.covers(products):
+            self.rank_index = RankIndex(products)
         
-        return None
+        return self.rank_index.find(target_url)
 
 def main():
     """메인 실행 함수"""
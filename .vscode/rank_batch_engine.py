@@ -0,0 +1,172 @@
+import queue
+import threading
+import time
+
+# 결과 전송 채널 종료 신호
+_STOP = object()
+
+
+class WorkerStats:
+    """워커별 처리량 통계"""
+
+    def __init__(self, name):
+        self.name = name
+        self.completed = 0
+        self.failed = 0
+        self.busy_seconds = 0.0
+        self.started_at = time.time()
+        self.lock = threading.Lock()
+
+    def record(self, elapsed, success):
+        """작업 하나의 소요 시간과 성공 여부 기록"""
+        with self.lock:
+            self.busy_seconds += elapsed
+            if success:
+                self.completed += 1
+            else:
+                self.failed += 1
+
+    @property
+    def jobs_per_hour(self):
+        """시작 이후 시간당 처리 건수"""
+        elapsed = time.time() - self.started_at
+        return self.completed * 3600 / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def average_seconds(self):
+        """작업당 평균 소요 시간"""
+        total = self.completed + self.failed
+        return self.busy_seconds / total if total else 0.0
+
+    def to_dict(self):
+        """통계를 딕셔너리로 변환"""
+        return {
+            'worker': self.name,
+            'completed': self.completed,
+            'failed': self.failed,
+            'average_seconds': round(self.average_seconds, 2),
+            'jobs_per_hour': round(self.jobs_per_hour, 1)
+        }
+
+    def summary(self):
+        """로그용 한 줄 요약"""
+        return (f"{self.name}: 완료 {self.completed}건, 실패 {self.failed}건, "
+                f"평균 {self.average_seconds:.1f}초, 시간당 {self.jobs_per_hour:.1f}건")
+
+
+class RankBatchEngine:
+    """여러 워커가 키워드를 나눠 처리하고 결과는 하나의 채널로 전송하는 배치 엔진
+
+    worker_factory(index)는 check(job)을 가진 워커를 반환한다. 워커는 자신만의
+    세션과 브라우저/디바이스 핸들을 갖고 배치가 바뀌어도 재사용된다.
+    submit_result(job, result)는 전송 스레드 하나에서만 호출된다.
+    """
+
+    def __init__(self, worker_factory, submit_result, num_workers=1, job_delay=0, log=print):
+        self.worker_factory = worker_factory
+        self.submit_result = submit_result
+        self.num_workers = max(1, num_workers)
+        self.job_delay = job_delay
+        self.log = log
+        self.workers = []
+        self.stats = []
+
+    def start_workers(self):
+        """워커 생성 (이미 있으면 재사용)"""
+        if self.workers:
+            return
+
+        for index in range(self.num_workers):
+            self.workers.append(self.worker_factory(index))
+            self.stats.append(WorkerStats(f"worker-{index + 1}"))
+
+        self.log(f"워커 {self.num_workers}개 시작")
+
+    def run_batch(self, jobs):
+        """작업 목록을 워커들에 분배하고 모두 끝날 때까지 대기 (전송된 결과 목록 반환)"""
+        self.start_workers()
+
+        job_queue = queue.Queue()
+        for job in jobs:
+            job_queue.put(job)
+
+        result_queue = queue.Queue()
+        submitted = []
+        submitter = threading.Thread(target=self._submit_loop, args=(result_queue, submitted), daemon=True)
+        submitter.start()
+
+        threads = [
+            threading.Thread(target=self._work_loop, args=(worker, stats, job_queue, result_queue), daemon=True)
+            for worker, stats in zip(self.workers, self.stats)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        result_queue.put(_STOP)
+        submitter.join()
+
+        return submitted
+
+    def _work_loop(self, worker, stats, job_queue, result_queue):
+        """큐가 빌 때까지 작업 처리"""
+        while True:
+            try:
+                job = job_queue.get_nowait()
+            except queue.Empty:
+                return
+
+            start_time = time.time()
+            try:
+                result = worker.check(job)
+                success = True
+            except Exception as e:
+                self.log(f"{stats.name} 작업 오류: {e}")
+                result = None
+                success = False
+
+            stats.record(time.time() - start_time, success)
+
+            if success:
+                result_queue.put((job, result))
+
+            # 워커별 작업 간 대기
+            if self.job_delay and not job_queue.empty():
+                time.sleep(self.job_delay)
+
+    def _submit_loop(self, result_queue, submitted):
+        """결과 전송 채널 (전송은 이 스레드에서만 수행)"""
+        while True:
+            item = result_queue.get()
+            if item is _STOP:
+                return
+
+            job, result = item
+            try:
+                self.submit_result(job, result)
+                submitted.append(item)
+            except Exception as e:
+                self.log(f"결과 전송 오류: {e}")
+
+    def get_stats(self):
+        """워커별 통계 목록"""
+        return [stats.to_dict() for stats in self.stats]
+
+    def log_stats(self):
+        """워커별 통계 로그 출력"""
+        for stats in self.stats:
+            self.log(stats.summary())
+
+    def close(self):
+        """워커 정리"""
+        for worker in self.workers:
+            close = getattr(worker, 'close', None)
+            if close:
+                try:
+                    close()
+                except Exception as e:
+                    self.log(f"워커 종료 오류: {e}")
+
+        self.workers = []
+        self.stats = []
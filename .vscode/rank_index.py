@@ -0,0 +1,125 @@
+import re
+import time
+from functools import lru_cache
+
+# 상품 URL의 ID들 (HTML 속성 안에서는 &가 &amp;로 들어 있음)
+PRODUCT_ID_RE = re.compile(r'/products/(\d+)')
+ITEM_ID_RE = re.compile(r'[?&;]itemId=(\d+)')
+VENDOR_ITEM_ID_RE = re.compile(r'[?&;]vendorItemId=(\d+)')
+
+
+@lru_cache(maxsize=1024)
+def parse_product_url(url):
+    """상품 URL에서 (상품 ID, itemId, vendorItemId) 추출 (없는 값은 None, 숫자만 있으면 상품 ID로 봄)"""
+    if not url:
+        return None, None, None
+    if url.isdigit():
+        return url, None, None
+
+    ids = []
+    for regex in (PRODUCT_ID_RE, ITEM_ID_RE, VENDOR_ITEM_ID_RE):
+        match = regex.search(url)
+        ids.append(match.group(1) if match else None)
+    return tuple(ids)
+
+
+class RankIndex:
+    """검색 결과 한 페이지의 상품 ID/itemId/vendorItemId → 상품(순위) 색인
+
+    상품을 파싱하면서 add()로 한 번만 만들어 두면, 같은 키워드로 추적하는 여러 상품을
+    목록을 다시 훑지 않고 각각 O(1)로 찾는다. 같은 ID가 여러 번 나오면 가장 높은 순위를 남긴다.
+    """
+
+    def __init__(self, products=None):
+        self.source = products
+        self.count = 0
+        self.by_product_id = {}
+        self.by_item_id = {}
+        self.by_vendor_item_id = {}
+        for product in products or []:
+            self.add(product)
+
+    def add(self, product):
+        """상품 하나 추가 (ID 필드가 없으면 url에서 추출)"""
+        self.count += 1
+        product_id = product.get('product_id')
+        item_id = product.get('item_id')
+        vendor_item_id = product.get('vendor_item_id')
+
+        if not (item_id and vendor_item_id) and product.get('url'):
+            url_product_id, url_item_id, url_vendor_item_id = parse_product_url(product['url'])
+            product_id = product_id or url_product_id
+            item_id = item_id or url_item_id
+            vendor_item_id = vendor_item_id or url_vendor_item_id
+
+        for table, key in ((self.by_product_id, product_id), (self.by_item_id, item_id),
+                           (self.by_vendor_item_id, vendor_item_id)):
+            if key and key not in table:
+                table[key] = product
+
+    def covers(self, products):
+        """products 목록 전체로 만든 색인인지 (목록이 바뀌었으면 다시 만들어야 함)"""
+        return self.source is products and self.count == len(products)
+
+    def find(self, target):
+        """대상 URL(또는 상품 ID)의 상품 - vendorItemId, itemId, 상품 ID 순으로 일치하는 것 (없으면 None)"""
+        product_id, item_id, vendor_item_id = parse_product_url(target)
+        for table, key in ((self.by_vendor_item_id, vendor_item_id), (self.by_item_id, item_id),
+                           (self.by_product_id, product_id)):
+            if key and key in table:
+                return table[key]
+        return None
+
+    def find_all(self, targets):
+        """여러 대상의 상품 {대상: 상품 또는 None}"""
+        return {target: self.find(target) for target in targets}
+
+    def __len__(self):
+        return self.count
+
+
+def legacy_find(products, target_url):
+    """기존 방식: 호출마다 대상 URL을 정규식으로 다시 읽고 목록을 처음부터 훑음 (벤치마크 비교용)"""
+    match = re.search(r'/products/(\d+)', target_url)
+    if not match:
+        return None
+    for product in products:
+        if product['product_id'] == match.group(1):
+            return product
+    return None
+
+
+def main():
+    """검색 결과 페이지를 파싱하며 색인을 만들고 추적 상품 조회를 선형 탐색과 비교"""
+    from search_result_parser import build_sample_page, parse_search_results
+
+    print("Rank Index Check")
+    print("=" * 50)
+
+    html_content = build_sample_page().replace('&', '&amp;')
+    index = RankIndex()
+    products = parse_search_results(html_content, index=index)
+    print(f"상품 {len(products)}개, 색인 {len(index)}개 (상품 ID {len(index.by_product_id)}, "
+          f"itemId {len(index.by_item_id)}, vendorItemId {len(index.by_vendor_item_id)})")
+
+    # 목록 뒤쪽 상품과 검색 결과에 없는 상품을 섞어 30개 추적
+    targets = [f"https://www.coupang.com/vp/products/{7000000000 + rank}?itemId={rank}&vendorItemId={rank}"
+               for rank in range(30, 90, 2)]
+
+    same = all((legacy_find(products, target) or {}).get('rank') == (index.find(target) or {}).get('rank')
+               for target in targets)
+    found = sum(1 for product in index.find_all(targets).values() if product)
+    print(f"추적 {len(targets)}개 중 {found}개 발견, 선형 탐색과 결과 {'동일 ✅' if same else '다름 ❌'}")
+
+    iterations = 2000
+    for name, find in [('선형 탐색', lambda target: legacy_find(products, target)), ('색인', index.find)]:
+        start_time = time.perf_counter()
+        for _ in range(iterations):
+            for target in targets:
+                find(target)
+        elapsed = (time.perf_counter() - start_time) / (iterations * len(targets)) * 1e6
+        print(f"  {name}: {elapsed:.2f}µs/조회")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+import time
+from datetime import datetime
+
+# slot_status 는 slot_id 당 한 행 (ON CONFLICT 대상)
+SLOT_STATUS_UNIQUE_INDEX_SQL = '''
+    CREATE UNIQUE INDEX IF NOT EXISTS idx_slot_status_slot_id
+    ON slot_status (slot_id)
+'''
+
+# 새 슬롯은 시작순위 = 현재순위, 기존 슬롯은 시작순위 유지
+UPSERT_SLOT_STATUS_SQL = '''
+    INSERT INTO slot_status
+    (slot_id, slot_type, keyword, product_id, current_rank, start_rank, last_checked)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (slot_id) DO UPDATE SET
+        current_rank = excluded.current_rank,
+        last_checked = excluded.last_checked,
+        updated_at = CURRENT_TIMESTAMP
+'''
+
+# 히스토리는 slot_status.id 를 참조
+INSERT_HISTORY_SQL = '''
+    INSERT INTO {table} (slot_id, keyword, rank_value, checked_at)
+    SELECT id, ?, ?, CURRENT_TIMESTAMP FROM slot_status WHERE slot_id = ?
+'''
+
+
+def ensure_slot_status_unique_index(storage):
+    """slot_status(slot_id) 유니크 인덱스 생성 (중복 slot_id가 있으면 IntegrityError)"""
+    storage.execute(SLOT_STATUS_UNIQUE_INDEX_SQL)
+
+
+def bulk_upsert_slot_status(storage, rows, history_table='ranking_history'):
+    """(slot_id, slot_type, keyword, product_id, rank) 목록을 한 트랜잭션으로 반영"""
+    rows = list(rows)
+    if not rows:
+        return 0
+
+    last_checked = datetime.now().isoformat()
+
+    with storage.transaction() as conn:
+        conn.executemany(UPSERT_SLOT_STATUS_SQL, [
+            (slot_id, slot_type, keyword, product_id, rank, rank, last_checked)
+            for slot_id, slot_type, keyword, product_id, rank in rows
+        ])
+        conn.executemany(INSERT_HISTORY_SQL.format(table=history_table), [
+            (keyword, rank, slot_id)
+            for slot_id, slot_type, keyword, product_id, rank in rows
+        ])
+
+    return len(rows)
+
+
+def upsert_slot_status_one_by_one(storage, rows, history_table='ranking_history'):
+    """기존 방식: 행마다 SELECT 후 UPDATE/INSERT, 히스토리 INSERT를 각각의 트랜잭션으로 (벤치마크 비교용)"""
+    count = 0
+    for slot_id, slot_type, keyword, product_id, rank in rows:
+        with storage.transaction() as conn:
+            existing_record = conn.execute(
+                'SELECT id, start_rank FROM slot_status WHERE slot_id = ?', (slot_id,)
+            ).fetchone()
+
+            if existing_record:
+                slot_status_id = existing_record[0]
+                conn.execute('''
+                    UPDATE slot_status
+                    SET current_rank = ?, last_checked = ?, updated_at = CURRENT_TIMESTAMP
+                    WHERE id = ?
+                ''', (rank, datetime.now().isoformat(), slot_status_id))
+            else:
+                cursor = conn.execute('''
+                    INSERT INTO slot_status
+                    (slot_id, slot_type, keyword, product_id, current_rank, start_rank, last_checked)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                ''', (slot_id, slot_type, keyword, product_id, rank, rank, datetime.now().isoformat()))
+                slot_status_id = cursor.lastrowid
+
+            conn.execute(f'''
+                INSERT INTO {history_table} (slot_id, keyword, rank_value, checked_at)
+                VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+            ''', (slot_status_id, keyword, rank))
+        count += 1
+
+    return count
+
+
+def sample_rows(row_count, rank_offset=0):
+    """벤치마크용 순위 결과 생성"""
+    return [
+        (slot_id, '쿠팡', f'키워드{slot_id % 500}', str(8000000000 + slot_id), (slot_id + rank_offset) % 300 + 1)
+        for slot_id in range(1, row_count + 1)
+    ]
+
+
+def benchmark(create_storage, row_count=10000, log=print):
+    """행 단위 업서트와 일괄 업서트 비교 (create_storage(name)은 빈 스키마의 저장소를 반환)"""
+    results = {}
+
+    for name, func in [('one_by_one', upsert_slot_status_one_by_one), ('bulk', bulk_upsert_slot_status)]:
+        storage = create_storage(name)
+        ensure_slot_status_unique_index(storage)
+
+        # 첫 실행은 INSERT, 두 번째 실행은 UPDATE 경로
+        timings = []
+        for rank_offset in (0, 7):
+            rows = sample_rows(row_count, rank_offset)
+            start_time = time.perf_counter()
+            func(storage, rows)
+            timings.append(time.perf_counter() - start_time)
+
+        results[name] = timings
+        storage.close()
+
+    log(f"📊 slot_status 업서트 {row_count:,}건")
+    for name, (insert_seconds, update_seconds) in results.items():
+        log(f"  {name:<12} 신규 {insert_seconds:7.3f}s  갱신 {update_seconds:7.3f}s")
+
+    return results
+
+
+def main():
+    """임시 DB에서 10,000건 업서트 벤치마크"""
+    import tempfile
+    from pathlib import Path
+    from complete_rank_system import CompleteRankSystem
+
+    print("slot_status Bulk Upsert Benchmark")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        def create_storage(name):
+            return CompleteRankSystem(db_path=str(Path(temp_dir) / f"{name}.db")).storage
+
+        benchmark(create_storage, row_count=10000)
+
+
+if __name__ == "__main__":
+    main()
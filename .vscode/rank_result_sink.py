@@ -0,0 +1,181 @@
+import json
+import os
+import threading
+import time
+from datetime import datetime
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class RankResultSink:
+    """순위 결과를 모았다가 한 번에 전송하는 버퍼
+
+    batch_size개가 모이거나 flush_interval초가 지나면 한 번의 POST로 전송한다.
+    서버에 연결할 수 없으면 journal_path에 기록해 두었다가 다음 전송
+    (재시작 후 포함) 때 함께 보낸다.
+    """
+
+    def __init__(self, api_base_url, worker_id, journal_path, batch_size=50,
+                 flush_interval=5.0, max_retries=3, backoff=1.0, timeout=30, log=print):
+        self.bulk_url = f"{api_base_url}/api/rank-checker/results"
+        self.single_url = f"{api_base_url}/api/rank-checker/result"
+        self.worker_id = worker_id
+        self.journal_path = str(journal_path)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.log = log
+
+        # 연결 재사용
+        self.session = requests.Session()
+        self.session.mount('http://', HTTPAdapter(pool_connections=1, pool_maxsize=4))
+        self.session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=4))
+
+        self.buffer = []
+        self.lock = threading.Lock()
+        self.flush_lock = threading.Lock()
+        self.bulk_supported = True
+        self.stop_event = threading.Event()
+        self.flush_thread = None
+
+    def start(self):
+        """주기적 전송 스레드 시작 (이전 실행에서 남은 저널도 전송 대상)"""
+        pending = self.load_journal()
+        if pending:
+            self.log(f"저널에 남은 결과 {len(pending)}건 발견")
+
+        if not self.flush_thread:
+            self.stop_event.clear()
+            self.flush_thread = threading.Thread(target=self._flush_loop, daemon=True)
+            self.flush_thread.start()
+
+    def add(self, keyword_id, rank):
+        """결과 추가 (batch_size에 도달하면 바로 전송)"""
+        result = {
+            'keyword_id': keyword_id,
+            'rank': rank or 0,
+            'timestamp': datetime.now().isoformat(),
+            'worker_id': self.worker_id
+        }
+
+        with self.lock:
+            self.buffer.append(result)
+            should_flush = len(self.buffer) >= self.batch_size
+
+        if should_flush:
+            self.flush()
+
+    def flush(self):
+        """버퍼와 저널의 결과를 전송 (실패하면 저널에 보관)"""
+        with self.flush_lock:
+            with self.lock:
+                results, self.buffer = self.buffer, []
+
+            pending = self.load_journal()
+            batch = pending + results
+            if not batch:
+                return True
+
+            count = len(batch)
+            if self.post_with_retry(batch):
+                if pending:
+                    self.write_journal([])
+                self.log(f"순위 결과 {count}건 전송 성공")
+                return True
+
+            self.write_journal(batch)
+            self.log(f"결과 전송 실패 - {len(batch)}건 저널에 보관: {self.journal_path}")
+            return False
+
+    def post_with_retry(self, batch):
+        """재시도(지수 백오프)를 포함한 전송"""
+        for attempt in range(self.max_retries):
+            try:
+                if self.post_batch(batch):
+                    return True
+            except requests.exceptions.RequestException as e:
+                self.log(f"결과 전송 오류: {e}")
+
+            if attempt < self.max_retries - 1:
+                time.sleep(self.backoff * (2 ** attempt))
+
+        return False
+
+    def post_batch(self, batch):
+        """일괄 전송 (서버에 일괄 API가 없으면 건별 전송)"""
+        if self.bulk_supported:
+            response = self.session.post(
+                self.bulk_url,
+                json={'worker_id': self.worker_id, 'results': batch},
+                timeout=self.timeout
+            )
+
+            if response.status_code in (404, 405):
+                self.log("일괄 전송 API 없음 - 건별 전송으로 전환")
+                self.bulk_supported = False
+            else:
+                if response.status_code != 200:
+                    self.log(f"Send result failed: {response.status_code}")
+                return response.status_code == 200
+
+        while batch:
+            response = self.session.post(self.single_url, json=batch[0], timeout=self.timeout)
+            if response.status_code != 200:
+                self.log(f"Send result failed: {response.status_code}")
+                return False
+            # 전송된 결과는 바로 빼서 재시도(연결 오류 포함)와 저널에는 남은 결과만 남김
+            del batch[0]
+
+        return True
+
+    def load_journal(self):
+        """저널 파일에 남은 결과 읽기"""
+        if not os.path.exists(self.journal_path):
+            return []
+
+        results = []
+        with open(self.journal_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    try:
+                        results.append(json.loads(line))
+                    except ValueError:
+                        # 기록 중 끊긴 줄
+                        continue
+        return results
+
+    def write_journal(self, results):
+        """저널 파일 교체 (임시 파일에 쓴 뒤 이름 변경)"""
+        if not results:
+            if os.path.exists(self.journal_path):
+                os.remove(self.journal_path)
+            return
+
+        temp_path = self.journal_path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            for result in results:
+                f.write(json.dumps(result, ensure_ascii=False) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.journal_path)
+
+    def _flush_loop(self):
+        """flush_interval마다 전송"""
+        while not self.stop_event.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                self.log(f"결과 전송 오류: {e}")
+
+    def close(self):
+        """전송 스레드 종료 후 남은 결과 전송"""
+        self.stop_event.set()
+        if self.flush_thread:
+            self.flush_thread.join()
+            self.flush_thread = None
+
+        self.flush()
+        self.session.close()
@@ -0,0 +1,237 @@
+from datetime import datetime, timedelta, timezone
+
+# 해상도별 구간 키 (checked_at은 CURRENT_TIMESTAMP 형식의 UTC 문자열)
+RESOLUTIONS = {
+    'hourly': "strftime('%Y-%m-%d %H:00', {column})",
+    'daily': "date({column})"
+}
+
+# 조회 기간에 따른 해상도 (이 기간 이하이면 해당 해상도 사용)
+RAW_MAX_RANGE = timedelta(days=3)
+HOURLY_MAX_RANGE = timedelta(days=31)
+
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+ROLLUP_TABLE_SQL = '''
+    CREATE TABLE IF NOT EXISTS {rollup} (
+        resolution TEXT NOT NULL,
+        slot_id INTEGER NOT NULL,
+        bucket TEXT NOT NULL,
+        min_rank INTEGER,
+        max_rank INTEGER,
+        last_rank INTEGER,
+        last_checked_at DATETIME,
+        rank_sum INTEGER NOT NULL DEFAULT 0,
+        sample_count INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (resolution, slot_id, bucket)
+    ) WITHOUT ROWID
+'''
+
+# 히스토리 한 건이 들어올 때마다 해당 구간 집계를 갱신
+ROLLUP_TRIGGER_SQL = '''
+    CREATE TRIGGER IF NOT EXISTS {rollup}_{resolution}_insert
+    AFTER INSERT ON {history}
+    WHEN NEW.rank_value IS NOT NULL
+    BEGIN
+        INSERT INTO {rollup}
+        (resolution, slot_id, bucket, min_rank, max_rank, last_rank, last_checked_at, rank_sum, sample_count)
+        VALUES ('{resolution}', NEW.slot_id, {bucket}, NEW.rank_value, NEW.rank_value,
+                NEW.rank_value, NEW.checked_at, NEW.rank_value, 1)
+        ON CONFLICT (resolution, slot_id, bucket) DO UPDATE SET
+            min_rank = min(min_rank, excluded.min_rank),
+            max_rank = max(max_rank, excluded.max_rank),
+            last_rank = CASE WHEN excluded.last_checked_at >= last_checked_at
+                             THEN excluded.last_rank ELSE last_rank END,
+            last_checked_at = max(last_checked_at, excluded.last_checked_at),
+            rank_sum = rank_sum + excluded.rank_sum,
+            sample_count = sample_count + 1;
+    END
+'''
+
+# 기존 히스토리로 집계 생성 (max()와 함께 쓴 일반 컬럼은 최신 행의 값)
+ROLLUP_BACKFILL_SQL = '''
+    INSERT OR REPLACE INTO {rollup}
+    (resolution, slot_id, bucket, min_rank, max_rank, last_rank, last_checked_at, rank_sum, sample_count)
+    SELECT '{resolution}', slot_id, {bucket}, min(rank_value), max(rank_value),
+           rank_value, max(checked_at), sum(rank_value), count(*)
+    FROM {history}
+    WHERE rank_value IS NOT NULL
+    GROUP BY slot_id, {bucket}
+'''
+
+
+def rollup_table(history_table):
+    """히스토리 테이블의 집계 테이블 이름"""
+    return f"{history_table}_rollup"
+
+
+def install_rollups(storage, history_table='ranking_check_history', log=print):
+    """집계 테이블과 트리거 생성 (처음 설치할 때는 기존 히스토리로 채움, 히스토리 테이블이 없으면 False)"""
+    rollup = rollup_table(history_table)
+
+    with storage.transaction() as conn:
+        history_exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (history_table,)
+        ).fetchone()
+        if not history_exists:
+            return False
+
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (rollup,)
+        ).fetchone()
+
+        conn.execute(ROLLUP_TABLE_SQL.format(rollup=rollup))
+
+        for resolution, bucket in RESOLUTIONS.items():
+            conn.execute(ROLLUP_TRIGGER_SQL.format(
+                rollup=rollup, history=history_table, resolution=resolution,
+                bucket=bucket.format(column='NEW.checked_at')
+            ))
+
+        if not exists:
+            for resolution, bucket in RESOLUTIONS.items():
+                conn.execute(ROLLUP_BACKFILL_SQL.format(
+                    rollup=rollup, history=history_table, resolution=resolution,
+                    bucket=bucket.format(column='checked_at')
+                ))
+            log(f"📈 순위 집계 테이블 생성: {rollup}")
+
+    return True
+
+
+def rebuild_rollups(storage, history_table='ranking_check_history'):
+    """집계를 히스토리에서 다시 계산 (히스토리를 직접 수정/삭제한 뒤 사용)"""
+    rollup = rollup_table(history_table)
+
+    with storage.transaction() as conn:
+        conn.execute(f'DELETE FROM {rollup}')
+        for resolution, bucket in RESOLUTIONS.items():
+            conn.execute(ROLLUP_BACKFILL_SQL.format(
+                rollup=rollup, history=history_table, resolution=resolution,
+                bucket=bucket.format(column='checked_at')
+            ))
+
+
+def choose_resolution(start, end):
+    """조회 기간에 맞는 해상도 (raw / hourly / daily)"""
+    span = end - start
+    if span <= RAW_MAX_RANGE:
+        return 'raw'
+    if span <= HOURLY_MAX_RANGE:
+        return 'hourly'
+    return 'daily'
+
+
+def get_history_range(storage, slot_id, history_table='ranking_check_history'):
+    """슬롯의 첫/마지막 기록 시각 (일 단위 집계에서 조회, 기록이 없으면 None)"""
+    row = storage.fetchone(f'''
+        SELECT min(bucket) AS first_day, max(last_checked_at) AS last_checked_at
+        FROM {rollup_table(history_table)}
+        WHERE resolution = 'daily' AND slot_id = ?
+    ''', (slot_id,))
+
+    if not row or row['first_day'] is None:
+        return None
+
+    return (datetime.strptime(row['first_day'], '%Y-%m-%d'),
+            datetime.strptime(row['last_checked_at'][:19], TIMESTAMP_FORMAT))
+
+
+def get_chart_series(storage, slot_id, start=None, end=None, history_table='ranking_check_history'):
+    """차트용 순위 시계열 (기간에 따라 원본/시간별/일별 집계 중 선택)"""
+    if start is None:
+        history_range = get_history_range(storage, slot_id, history_table)
+        if history_range is None:
+            return {'resolution': 'raw', 'labels': [], 'ranks': [], 'min_ranks': [], 'max_ranks': []}
+        start = history_range[0]
+
+    if end is None:
+        end = datetime.now(timezone.utc).replace(tzinfo=None)
+
+    resolution = choose_resolution(start, end)
+    params = (slot_id, start.strftime(TIMESTAMP_FORMAT), end.strftime(TIMESTAMP_FORMAT))
+
+    if resolution == 'raw':
+        rows = storage.fetchall(f'''
+            SELECT substr(checked_at, 1, 16) AS label, rank_value AS rank,
+                   rank_value AS min_rank, rank_value AS max_rank
+            FROM {history_table}
+            WHERE slot_id = ? AND checked_at BETWEEN ? AND ?
+            ORDER BY checked_at, id
+        ''', params)
+    else:
+        bucket = RESOLUTIONS[resolution].format(column='?')
+        rows = storage.fetchall(f'''
+            SELECT bucket AS label, last_rank AS rank, min_rank, max_rank
+            FROM {rollup_table(history_table)}
+            WHERE resolution = '{resolution}' AND slot_id = ? AND bucket BETWEEN {bucket} AND {bucket}
+            ORDER BY bucket
+        ''', params)
+
+    return {
+        'resolution': resolution,
+        'labels': [row['label'] for row in rows],
+        'ranks': [row['rank'] for row in rows],
+        'min_ranks': [row['min_rank'] for row in rows],
+        'max_ranks': [row['max_rank'] for row in rows]
+    }
+
+
+def main():
+    """임시 DB에 히스토리를 넣고 해상도별 조회 확인"""
+    import os
+    import tempfile
+    import time
+    from rank_storage import RankStorage
+
+    print("Rank History Rollup Check")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        storage = RankStorage(os.path.join(temp_dir, 'rollup.db'))
+        storage.execute('''
+            CREATE TABLE ranking_check_history (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                slot_id INTEGER,
+                keyword TEXT,
+                rank_value INTEGER,
+                checked_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        install_rollups(storage)
+
+        # 1년 동안 10분마다 체크한 슬롯
+        end = datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
+        rows = [
+            (1, '트롤리', (i * 7) % 120 + 1, (end - timedelta(minutes=10 * i)).strftime(TIMESTAMP_FORMAT))
+            for i in range(6 * 24 * 365)
+        ]
+
+        start_time = time.perf_counter()
+        with storage.transaction() as conn:
+            conn.executemany('''
+                INSERT INTO ranking_check_history (slot_id, keyword, rank_value, checked_at)
+                VALUES (?, ?, ?, ?)
+            ''', rows)
+        print(f"히스토리 {len(rows):,}건 입력 (집계 포함): {time.perf_counter() - start_time:.2f}s")
+
+        for days in (None, 90, 14, 2):
+            start = None if days is None else end - timedelta(days=days)
+            start_time = time.perf_counter()
+            series = get_chart_series(storage, 1, start=start, end=end)
+            elapsed = (time.perf_counter() - start_time) * 1000
+            label = '전체' if days is None else f'{days}일'
+            print(f"  {label:>4}: {series['resolution']:<6} {len(series['labels']):>5}개 ({elapsed:.1f}ms)")
+
+        # 트리거 집계와 전체 재계산 결과 비교
+        before = storage.fetchall('SELECT * FROM ranking_check_history_rollup ORDER BY 1, 2, 3')
+        rebuild_rollups(storage)
+        after = storage.fetchall('SELECT * FROM ranking_check_history_rollup ORDER BY 1, 2, 3')
+        same = [tuple(row) for row in before] == [tuple(row) for row in after]
+        print(f"{'✅' if same else '❌'} 증분 집계 = 재계산 결과: {same}")
+
+        storage.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+import re
+
+# (인덱스 이름, 테이블, 생성 SQL) - 테이블이 있는 DB에만 적용
+MIGRATIONS = [
+    # 차트: WHERE slot_id = ? ORDER BY checked_at (rank_value까지 포함해 테이블 조회 없이 처리)
+    ('idx_ranking_check_history_slot_checked', 'ranking_check_history', '''
+        CREATE INDEX IF NOT EXISTS idx_ranking_check_history_slot_checked
+        ON ranking_check_history (slot_id, checked_at, rank_value)
+    '''),
+    ('idx_ranking_history_slot_checked', 'ranking_history', '''
+        CREATE INDEX IF NOT EXISTS idx_ranking_history_slot_checked
+        ON ranking_history (slot_id, checked_at, rank_value)
+    '''),
+    # 상태 목록: ORDER BY slot_id, 갱신: WHERE slot_id = ? AND product_id = ?
+    ('idx_slot_status_slot_product', 'slot_status', '''
+        CREATE INDEX IF NOT EXISTS idx_slot_status_slot_product
+        ON slot_status (slot_id, product_id)
+    '''),
+    # 대기 목록: ORDER BY order_num, 삭제: WHERE order_num = ?
+    ('idx_ranking_check_order_num', 'ranking_check', '''
+        CREATE INDEX IF NOT EXISTS idx_ranking_check_order_num
+        ON ranking_check (order_num)
+    ''')
+]
+
+# (이름, 테이블, 조회 SQL, 파라미터, 사용해야 하는 인덱스 이름들) - 실제 화면/API와 같은 조회
+# slot_status는 rank_ingest의 slot_id 유니크 인덱스가 있으면 플래너가 그쪽을 고른다
+QUERY_PLAN_CHECKS = [
+    ('show_chart / get_chart_data', 'ranking_check_history', '''
+        SELECT rank_value, checked_at
+        FROM ranking_check_history
+        WHERE slot_id = ?
+        ORDER BY checked_at
+    ''', (1,), ('idx_ranking_check_history_slot_checked',)),
+    ('ranking_history chart', 'ranking_history', '''
+        SELECT rank_value, checked_at
+        FROM ranking_history
+        WHERE slot_id = ?
+        ORDER BY checked_at
+    ''', (1,), ('idx_ranking_history_slot_checked',)),
+    ('get_slot_status', 'slot_status', '''
+        SELECT slot_id, keyword, current_rank, start_rank, last_checked
+        FROM slot_status
+        ORDER BY slot_id
+    ''', (), ('idx_slot_status_slot_product', 'idx_slot_status_slot_id')),
+    ('update_slot_status lookup', 'slot_status', '''
+        SELECT id, start_rank FROM slot_status
+        WHERE slot_id = ? AND product_id = ?
+    ''', (1, '1'), ('idx_slot_status_slot_product', 'idx_slot_status_slot_id')),
+    ('get_pending_keywords', 'ranking_check', '''
+        SELECT * FROM ranking_check ORDER BY order_num
+    ''', (), ('idx_ranking_check_order_num',))
+]
+
+# 인덱스를 쓰지 않는 계획 (전체 스캔 또는 별도 정렬)
+FULL_SCAN_RE = re.compile(r'^SCAN \w+$|USE TEMP B-TREE')
+
+# 계획 detail에서 사용한 인덱스 이름 (예: SEARCH t USING COVERING INDEX idx_name (slot_id=?))
+PLAN_INDEX_RE = re.compile(r'USING (?:COVERING )?INDEX (\w+)')
+
+
+def table_exists(storage, table):
+    """테이블 존재 여부"""
+    row = storage.fetchone(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+    )
+    return row is not None
+
+
+def index_exists(storage, index):
+    """인덱스 존재 여부"""
+    row = storage.fetchone(
+        "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = ?", (index,)
+    )
+    return row is not None
+
+
+def apply_migrations(storage, log=print):
+    """없는 인덱스 생성 후 조회 계획 점검 (생성한 인덱스 이름 목록 반환, 여러 번 호출해도 안전)"""
+    created = []
+
+    with storage.transaction() as conn:
+        for index, table, sql in MIGRATIONS:
+            if not table_exists(storage, table) or index_exists(storage, index):
+                continue
+
+            conn.execute(sql)
+            created.append(index)
+
+    if created:
+        # 새 인덱스 통계 갱신 (플래너가 인덱스를 고르도록)
+        storage.execute('ANALYZE')
+        log(f"🗂️ 인덱스 생성: {', '.join(created)}")
+
+    # 시작할 때마다 주요 조회가 인덱스를 쓰는지 확인 (실패해도 실행은 계속)
+    for name, plan in check_query_plans(storage):
+        log(f"⚠️ 인덱스를 쓰지 않는 조회: {name} - {' / '.join(plan)}")
+
+    return created
+
+
+def explain_query_plan(storage, sql, params=()):
+    """EXPLAIN QUERY PLAN 결과의 detail 목록"""
+    return [row['detail'] for row in storage.fetchall(f'EXPLAIN QUERY PLAN {sql}', params)]
+
+
+def check_query_plans(storage):
+    """조회 계획 점검 (인덱스를 쓰지 않는 조회의 (이름, 계획) 목록 반환)"""
+    failures = []
+
+    for name, table, sql, params, expected_indexes in QUERY_PLAN_CHECKS:
+        if not table_exists(storage, table):
+            continue
+
+        plan = explain_query_plan(storage, sql, params)
+        used_indexes = [match.group(1) for detail in plan for match in PLAN_INDEX_RE.finditer(detail)]
+        uses_index = any(index in expected_indexes for index in used_indexes)
+        full_scan = any(FULL_SCAN_RE.search(detail) for detail in plan)
+
+        if not uses_index or full_scan:
+            failures.append((name, plan))
+
+    return failures
+
+
+def main():
+    """임시 DB에 스키마를 만들고 조회 계획 회귀 점검"""
+    import os
+    import sys
+    import tempfile
+    from complete_rank_system import CompleteRankSystem
+    from database_rank_checker import DatabaseRankChecker
+
+    print("Rank DB Query Plan Check")
+    print("=" * 50)
+
+    failures = []
+    original_dir = os.getcwd()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        # 두 클래스 모두 작업 폴더에 DB를 만든다
+        os.chdir(temp_dir)
+        try:
+            for system in (DatabaseRankChecker(), CompleteRankSystem()):
+                print(f"\n📁 {system.db_path}")
+                for name, plan in check_query_plans(system.storage):
+                    failures.append((system.db_path, name, plan))
+
+                for name, table, sql, params, expected_indexes in QUERY_PLAN_CHECKS:
+                    if table_exists(system.storage, table):
+                        print(f"  {name}: {' / '.join(explain_query_plan(system.storage, sql, params))}")
+
+                system.storage.close()
+        finally:
+            os.chdir(original_dir)
+
+    if failures:
+        print("\n❌ 인덱스를 쓰지 않는 조회:")
+        for db_path, name, plan in failures:
+            print(f"  {db_path} - {name}: {plan}")
+        sys.exit(1)
+
+    print("\n✅ 모든 조회가 인덱스를 사용합니다")
+
+
+if __name__ == "__main__":
+    main()
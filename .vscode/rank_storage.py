@@ -0,0 +1,142 @@
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+# 연결마다 적용하는 PRAGMA
+DEFAULT_PRAGMAS = {
+    'journal_mode': 'WAL',        # 읽기와 쓰기가 서로 막지 않음
+    'synchronous': 'NORMAL',      # WAL에서는 커밋마다 fsync하지 않아도 안전
+    'cache_size': -16000,         # 페이지 캐시 약 16MB
+    'mmap_size': 268435456,       # 256MB 메모리 맵 읽기
+    'temp_store': 'MEMORY'
+}
+
+
+class RankStorage:
+    """순위 저장용 SQLite 저장소
+
+    스레드마다 연결 하나를 열어 두고 계속 재사용한다. 연결이 유지되므로
+    sqlite3 모듈의 준비된 문장 캐시(cached_statements)가 그대로 살아 있어
+    같은 SQL은 다시 파싱하지 않는다. 여러 쓰기는 transaction()으로 묶는다.
+    요청마다 스레드가 바뀌는 서버는 요청이 끝날 때 release()로 연결을 닫고,
+    release()하지 못하고 끝난 스레드의 연결은 새 연결을 열 때 정리한다.
+    """
+
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, db_path, pragmas=None, timeout=30, cached_statements=256):
+        self.db_path = db_path
+        self.pragmas = dict(DEFAULT_PRAGMAS, **(pragmas or {}))
+        self.timeout = timeout
+        self.cached_statements = cached_statements
+        self.local = threading.local()
+        self.connections = {}
+        self.connections_lock = threading.Lock()
+
+    @classmethod
+    def open(cls, db_path, **kwargs):
+        """같은 DB 파일은 하나의 저장소를 공유"""
+        key = os.path.abspath(db_path)
+        with cls._instances_lock:
+            storage = cls._instances.get(key)
+            if storage is None:
+                storage = cls(db_path, **kwargs)
+                cls._instances[key] = storage
+            return storage
+
+    def connection(self):
+        """현재 스레드의 장기 연결 반환 (없으면 생성)"""
+        conn = getattr(self.local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.db_path,
+                timeout=self.timeout,
+                isolation_level=None,  # 트랜잭션은 transaction()에서 직접 관리
+                cached_statements=self.cached_statements,
+                check_same_thread=False  # close()는 다른 스레드에서 호출될 수 있음
+            )
+            conn.row_factory = sqlite3.Row
+
+            for name, value in self.pragmas.items():
+                conn.execute(f"PRAGMA {name} = {value}")
+
+            self.local.conn = conn
+            self.local.depth = 0
+            with self.connections_lock:
+                self.close_dead_connections()
+                self.connections[threading.current_thread()] = conn
+        return conn
+
+    def close_dead_connections(self):
+        """이미 끝난 스레드가 남긴 연결 종료 (connections_lock 안에서 호출)"""
+        for thread in [thread for thread in self.connections if not thread.is_alive()]:
+            self.connections.pop(thread).close()
+
+    def release(self):
+        """현재 스레드의 연결 종료 (다음 connection() 호출 때 새로 연결)"""
+        conn = getattr(self.local, 'conn', None)
+        if conn is None:
+            return
+
+        with self.connections_lock:
+            self.connections.pop(threading.current_thread(), None)
+        conn.close()
+        self.local.conn = None
+        self.local.depth = 0
+
+    @contextmanager
+    def transaction(self):
+        """여러 쓰기를 하나의 트랜잭션으로 묶음 (중첩되면 바깥 트랜잭션에 합류)"""
+        conn = self.connection()
+
+        if self.local.depth:
+            self.local.depth += 1
+            try:
+                yield conn
+            finally:
+                self.local.depth -= 1
+            return
+
+        conn.execute('BEGIN IMMEDIATE')
+        self.local.depth = 1
+        try:
+            yield conn
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        finally:
+            self.local.depth = 0
+
+    def execute(self, sql, params=()):
+        """SQL 실행 (트랜잭션 밖이면 자동 커밋)"""
+        return self.connection().execute(sql, params)
+
+    def executemany(self, sql, seq_of_params):
+        """여러 행 실행"""
+        return self.connection().executemany(sql, seq_of_params)
+
+    def executescript(self, script):
+        """스키마 스크립트 실행"""
+        return self.connection().executescript(script)
+
+    def fetchone(self, sql, params=()):
+        """한 행 조회"""
+        return self.execute(sql, params).fetchone()
+
+    def fetchall(self, sql, params=()):
+        """전체 행 조회"""
+        return self.execute(sql, params).fetchall()
+
+    def close(self):
+        """열린 모든 연결 종료"""
+        with self.connections_lock:
+            for conn in self.connections.values():
+                conn.close()
+            self.connections = {}
+        self.local = threading.local()
+
+        with self._instances_lock:
+            self._instances.pop(os.path.abspath(self.db_path), None)
@@ -13,10 +13,12 @@ from datetime import datetime
 import requests
 import re
 import random
+from browser_wait import BrowserWaiter, enable_network_log
 
 class RealClickCoupangRankChecker:
     def __init__(self):
         self.driver = None
+        self.waiter = BrowserWaiter()
         self.setup_driver()
         
     def setup_driver(self):
@@ -41,6 +43,9 @@ class RealClickCoupangRankChecker:
         # 헤드리스 모드 비활성화 (브라우저 보이기)
         # chrome_options.add_argument("--headless")
         
+        # 지연 로딩 요청이 끝났는지 CDP 네트워크 이벤트로 확인
+        enable_network_log(chrome_options)
+        
         try:
             service = Service(ChromeDriverManager().install())
             self.driver = webdriver.Chrome(service=service, options=chrome_options)
@@ -85,13 +90,12 @@ class RealClickCoupangRankChecker:
     
     def human_like_scroll(self):
         """사람처럼 스크롤"""
-        # 페이지 하단으로 스크롤
+        # 페이지 하단으로 스크롤 (지연 로딩되는 상품이 더 늘지 않을 때까지 대기)
         self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        self.human_like_delay(1, 2)
+        self.waiter.wait_for_items_settled(self.driver, network_idle=True)
         
         # 페이지 상단으로 스크롤
         self.driver.execute_script("window.scrollTo(0, 0);")
-        self.human_like_delay(1, 2)
     
     def search_products_real_click(self, keyword):
         """실제 클릭으로 상품 검색"""
@@ -101,7 +105,7 @@ class RealClickCoupangRankChecker:
             # 1단계: 쿠팡 메인 페이지 접속
             print("Step 1: Opening Coupang main page...")
             self.driver.get("https://www.coupang.com")
-            self.human_like_delay(3, 5)
+            self.waiter.wait_for_page(self.driver, 'main_page')
             
             # 페이지 로딩 확인
             page_title = self.driver.title
@@ -153,7 +157,7 @@ class RealClickCoupangRankChecker:
                     # 엔터키로 검색
                     search_box.send_keys(Keys.RETURN)
                 
-                self.human_like_delay(3, 5)
+                self.waiter.wait_for_search_results(self.driver, network_idle=True)
                 
                 # 6단계: 검색 결과 페이지 확인
                 print("Step 6: Checking search results...")
@@ -177,7 +181,7 @@ class RealClickCoupangRankChecker:
                 # 검색창을 찾을 수 없으면 직접 URL로 이동
                 search_url = f"https://www.coupang.com/np/search?q={keyword}"
                 self.driver.get(search_url)
-                self.human_like_delay(5, 8)
+                self.waiter.wait_for_search_results(self.driver, network_idle=True)
                 
                 # 사람처럼 스크롤
                 self.human_like_scroll()
@@ -324,6 +328,10 @@ class RealClickCoupangRankChecker:
     
     def close(self):
         """브라우저 종료"""
+        # 페이지 대기 시간 통계
+        for line in self.waiter.stats.summary():
+            print(f"Wait {line}")
+        
         if self.driver:
             self.driver.quit()
             print("Real Click browser closed")
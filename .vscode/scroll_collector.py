@@ -0,0 +1,189 @@
+import re
+import time
+
+
+def text_key(record):
+    """OCR 결과 비교용 키 (공백/대소문자 무시한 제목 + 가격 숫자)"""
+    title = re.sub(r'\s+', '', record.get('title', '')).lower()
+    price = re.sub(r'[^\d]', '', record.get('price', ''))
+    return (title, price)
+
+
+def find_overlap(merged_keys, screen_keys, window=12):
+    """이전 화면들과 새 화면이 겹치는 구간 찾기
+
+    새 화면의 레코드 중 이미 모은 목록 끝부분(window개)에 있는 것을 기준으로 맞춘 뒤,
+    이어서 같은 레코드가 계속되는 만큼을 겹친 것으로 본다 (잘린 첫 카드는 건너뜀).
+    반환: (새로 추가할 시작 인덱스, 겹친 개수) - 겹치는 곳이 없으면 (0, 0)
+    """
+    tail_start = max(0, len(merged_keys) - window)
+    tail = merged_keys[tail_start:]
+
+    for screen_index, key in enumerate(screen_keys):
+        if key not in tail:
+            continue
+
+        # 같은 키가 여러 번 있으면 가장 뒤의 것에 맞춤
+        merged_index = tail_start + len(tail) - 1 - tail[::-1].index(key)
+        overlap = 0
+        while (merged_index < len(merged_keys) and screen_index < len(screen_keys)
+               and merged_keys[merged_index] == screen_keys[screen_index]):
+            merged_index += 1
+            screen_index += 1
+            overlap += 1
+        return screen_index, overlap
+
+    return 0, 0
+
+
+def matches_target(record, target):
+    """목표 상품인지 (공백 무시한 제목 포함)
+
+    앱 화면(뷰 계층/OCR)에는 상품 ID가 나오지 않으므로 제목으로만 비교한다.
+    """
+    if not target:
+        return False
+    title = re.sub(r'\s+', '', record.get('title', '')).lower()
+    return re.sub(r'\s+', '', target).lower() in title
+
+
+class IncrementalScrollCollector:
+    """스크롤할 때마다 화면의 상품을 추출해 겹치는 부분을 맞춰 이어 붙이는 수집기
+
+    read_screen()은 현재 화면의 상품 레코드 목록(위에서부터, 실패하면 None)을,
+    scroll()은 한 화면 스크롤 후 화면이 멈출 때까지 대기하는 함수다.
+    목표 상품을 찾거나 max_rank개를 모으거나 더 이상 새 상품이 없으면 멈춘다.
+    """
+
+    def __init__(self, read_screen, scroll, key=text_key, target=None, max_rank=60,
+                 max_scrolls=15, max_idle_scrolls=2, log=print):
+        self.read_screen = read_screen
+        self.scroll = scroll
+        self.key = key
+        self.target = target
+        self.max_rank = max_rank
+        self.max_scrolls = max_scrolls
+        self.max_idle_scrolls = max_idle_scrolls
+        self.log = log
+
+        self.products = []
+        self.keys = []
+        self.found = None
+        self.scroll_count = 0
+        self.gap_count = 0
+        self.stop_reason = None
+
+    def merge(self, records):
+        """화면 하나의 레코드를 이어 붙이고 새로 추가된 레코드 목록 반환"""
+        screen_keys = [self.key(record) for record in records]
+        start, overlap = find_overlap(self.keys, screen_keys)
+
+        # 이전 화면이 있는데 겹치는 곳이 없으면 스크롤 사이에 놓친 상품이 있을 수 있음
+        if self.keys and overlap == 0:
+            self.gap_count += 1
+            self.log(f"⚠️ 스크롤 {self.scroll_count}: 이전 화면과 겹치는 상품 없음 (순위 누락 가능)")
+
+        added = []
+        for record, key in zip(records[start:], screen_keys[start:]):
+            # 겹친 구간 밖에서 다시 나타난 상품(광고 반복 등)은 제외
+            if key in self.keys:
+                continue
+
+            record['rank'] = len(self.products) + 1
+            self.products.append(record)
+            self.keys.append(key)
+            added.append(record)
+
+            if self.found is None and matches_target(record, self.target):
+                self.found = record
+
+        return added
+
+    def should_stop(self):
+        """수집을 멈출 이유 (계속하면 None)"""
+        if self.found is not None:
+            return 'target_found'
+        if self.max_rank and len(self.products) >= self.max_rank:
+            return 'max_rank'
+        if self.scroll_count >= self.max_scrolls:
+            return 'max_scrolls'
+        return None
+
+    def run(self):
+        """수집 실행 (첫 화면에서 상품을 못 찾으면 빈 목록)"""
+        records = self.read_screen()
+        if not records:
+            self.stop_reason = 'no_products'
+            return []
+        self.merge(records)
+
+        idle_scrolls = 0
+        while True:
+            self.stop_reason = self.should_stop()
+            if self.stop_reason:
+                break
+
+            self.scroll()
+            self.scroll_count += 1
+
+            records = self.read_screen()
+            if records is None:
+                self.stop_reason = 'read_failed'
+                break
+
+            added = self.merge(records)
+            self.log(f"Scroll {self.scroll_count}: {len(added)} new products (total {len(self.products)})")
+
+            # 새 상품이 계속 없으면 목록 끝
+            idle_scrolls = idle_scrolls + 1 if not added else 0
+            if idle_scrolls >= self.max_idle_scrolls:
+                self.stop_reason = 'end_of_list'
+                break
+
+        if self.max_rank:
+            del self.products[self.max_rank:]
+        return self.products
+
+
+def main():
+    """가짜 화면(스크롤마다 일부 겹침)으로 병합과 조기 종료 확인"""
+    print("Incremental Scroll Collector Check")
+    print("=" * 50)
+
+    catalog = [{'title': f"트롤리 접이식 카트 {index}호", 'price': f"{index + 10},900원", 'reviews': '0'}
+               for index in range(1, 101)]
+
+    def run_case(name, target=None, max_rank=60, step=3, visible=5):
+        state = {'top': 0}
+
+        def read_screen():
+            # 맨 위 카드는 잘려서 제목 일부만 인식된 상황
+            screen = [dict(record) for record in catalog[state['top']:state['top'] + visible]]
+            if state['top'] and screen:
+                screen[0]['title'] = screen[0]['title'][-4:]
+            return screen
+
+        def scroll():
+            # 목록 끝에서는 더 이상 움직이지 않음
+            state['top'] = min(state['top'] + step, len(catalog) - visible)
+
+        collector = IncrementalScrollCollector(read_screen, scroll, target=target, max_rank=max_rank,
+                                               max_scrolls=50, log=lambda message: None)
+        start_time = time.perf_counter()
+        products = collector.run()
+        elapsed = (time.perf_counter() - start_time) * 1000
+
+        positions_ok = all(product['title'] == catalog[product['rank'] - 1]['title'] for product in products)
+        found = collector.found['rank'] if collector.found else None
+        print(f"  {name}: {len(products)}개, 스크롤 {collector.scroll_count}회, 종료={collector.stop_reason}, "
+              f"목표 순위={found}, 순위 정확={'✅' if positions_ok else '❌'}, 누락 의심={collector.gap_count} "
+              f"({elapsed:.1f}ms)")
+
+    run_case("목표 17위", target="카트 17호")
+    run_case("순위 상한 40", max_rank=40)
+    run_case("목록 끝까지", max_rank=None)
+    run_case("스크롤 간격이 화면보다 큼", max_rank=20, step=6)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+import math
+import random
+import time
+import unicodedata
+from rank_index import RankIndex
+from search_result_parser import PAGE_SIZE
+
+
+def normalize_keyword(keyword):
+    """검색어 비교용 정규화 (전각/반각 통일, 앞뒤/중복 공백 제거, 소문자)"""
+    text = unicodedata.normalize('NFKC', keyword or '')
+    return ' '.join(text.split()).lower()
+
+
+def pages_for_rank(rank, page_size=PAGE_SIZE, default_pages=1, max_pages=5):
+    """마지막으로 확인한 순위를 찾으려면 볼 페이지 수 (순위 변동 여유로 반 페이지 더, 모르면 default_pages)"""
+    if not rank or rank <= 0:
+        return default_pages
+    return max(default_pages, min(max_pages, math.ceil((rank + page_size // 2) / page_size)))
+
+
+def load_last_ranks(storage):
+    """slot_status의 슬롯별 마지막 순위 {slot_id: current_rank} (검색 깊이 계산용)"""
+    rows = storage.fetchall('''
+        SELECT slot_id, MAX(current_rank) AS current_rank
+        FROM slot_status
+        WHERE slot_id IS NOT NULL AND current_rank > 0
+        GROUP BY slot_id
+    ''')
+    return {row['slot_id']: row['current_rank'] for row in rows}
+
+
+class SearchGroup:
+    """같은 검색어를 쓰는 슬롯 묶음 (검색 한 번으로 모든 대상 상품을 확인)"""
+
+    def __init__(self, key, keyword):
+        self.key = key
+        self.keyword = keyword
+        self.slots = []
+        self.max_pages = 1
+
+    def add(self, slot, pages):
+        """슬롯 추가 (검색 깊이는 가장 깊이 봐야 하는 슬롯에 맞춤)"""
+        self.slots.append(slot)
+        self.max_pages = max(self.max_pages, pages)
+
+
+def plan_searches(slots, keyword_field='keyword', rank_field='current_rank', default_pages=1, max_pages=5):
+    """대기 중인 슬롯을 정규화한 검색어별로 묶음 (검색어가 처음 나온 순서 유지)
+
+    슬롯의 rank_field(마지막으로 확인한 순위)로 검색할 페이지 수를 정하고, 묶음은 가장 깊이
+    봐야 하는 슬롯에 맞춰 검색한다. 순위를 모르는 슬롯은 default_pages까지 검색한다.
+    """
+    groups = {}
+    for slot in slots:
+        key = normalize_keyword(slot.get(keyword_field))
+        if not key:
+            continue
+
+        group = groups.get(key)
+        if group is None:
+            group = groups[key] = SearchGroup(key, ' '.join(slot[keyword_field].split()))
+        group.add(slot, pages_for_rank(slot.get(rank_field), default_pages=default_pages, max_pages=max_pages))
+
+    return list(groups.values())
+
+
+def resolve_targets(group, products, url_field='product_url'):
+    """한 번의 검색 결과에서 묶음의 모든 대상 상품 찾기 [(슬롯, 상품 또는 None), ...]"""
+    index = RankIndex(products)
+    return [(slot, index.find(slot.get(url_field))) for slot in group.slots]
+
+
+def main():
+    """인기 검색어를 여러 슬롯이 공유하는 상황에서 슬롯별 검색과 묶음 검색 비교"""
+    print("Search Planner Check")
+    print("=" * 50)
+
+    random.seed(7)
+    keywords = ['트롤리', '카트', '핸드카트', '쇼핑카트', '장바구니', '접이식 카트']
+    # 같은 검색어를 띄어쓰기/전각 문자만 다르게 입력한 슬롯
+    variants = {'트롤리': [' 트롤리', '트롤리 '], '접이식 카트': ['접이식  카트', '접이식　카트']}
+
+    catalog = {}
+    for keyword in keywords:
+        catalog[normalize_keyword(keyword)] = [
+            {'rank': rank, 'product_id': str(7000000000 + len(catalog) * 1000 + rank),
+             'url': f"https://www.coupang.com/vp/products/{7000000000 + len(catalog) * 1000 + rank}"}
+            for rank in range(1, 121)
+        ]
+
+    slots = []
+    for order in range(1, 201):
+        keyword = random.choice(keywords)
+        keyword = random.choice([keyword] + variants.get(keyword, []))
+        product = random.choice(catalog[normalize_keyword(keyword)])
+        # 마지막으로 확인한 순위는 지금 순위에서 조금 벗어나 있음
+        slots.append({'order': order, 'keyword': keyword, 'product_url': product['url'],
+                      'current_rank': max(1, product['rank'] + random.randint(-10, 10))})
+
+    searches = {'count': 0, 'pages': 0}
+
+    def search(keyword, max_pages):
+        searches['count'] += 1
+        searches['pages'] += max_pages
+        time.sleep(0.001)  # 검색 한 번 비용
+        return catalog[normalize_keyword(keyword)][:max_pages * 60]
+
+    # 기존 방식: 슬롯마다 검색
+    start_time = time.perf_counter()
+    expected = {}
+    for slot in slots:
+        products = search(slot['keyword'], pages_for_rank(slot['current_rank']))
+        expected[slot['order']] = (RankIndex(products).find(slot['product_url']) or {}).get('rank')
+    per_slot_time = time.perf_counter() - start_time
+    per_slot = dict(searches)
+
+    searches.update(count=0, pages=0)
+    start_time = time.perf_counter()
+    resolved = {}
+    groups = plan_searches(slots)
+    for group in groups:
+        products = search(group.keyword, group.max_pages)
+        for slot, product in resolve_targets(group, products):
+            resolved[slot['order']] = product['rank'] if product else None
+    grouped_time = time.perf_counter() - start_time
+
+    print(f"  슬롯별 검색: 검색 {per_slot['count']}회, 페이지 {per_slot['pages']}개 ({per_slot_time * 1000:.0f}ms)")
+    print(f"  검색어 묶음: 검색 {searches['count']}회, 페이지 {searches['pages']}개 ({grouped_time * 1000:.0f}ms)")
+    print(f"📊 슬롯 {len(slots)}개 → 검색어 {len(groups)}개, 순위 결과 {'동일 ✅' if resolved == expected else '다름 ❌'}")
+
+
+if __name__ == "__main__":
+    main()
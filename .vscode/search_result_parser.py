@@ -0,0 +1,400 @@
+import codecs
+import itertools
+import json
+import os
+import re
+import time
+from datetime import datetime
+from rank_index import ITEM_ID_RE, VENDOR_ITEM_ID_RE
+
+# 쿠팡 검색 결과 한 페이지당 상품 수
+PAGE_SIZE = 60
+
+# 상품 카드(<li>) 시작 태그
+CARD_RE = re.compile(r'<li\b[^>]*>')
+
+# 카드 단위로 나누기 (split 결과: [첫 카드 앞부분, 시작 태그, 본문, 시작 태그, 본문, ...])
+CARD_SPLIT_RE = re.compile(r'(<li\b[^>]*>)')
+
+# 카드 태그의 상품 ID
+CARD_PRODUCT_ID_RE = re.compile(r'data-product-id="(\d+)"')
+
+# 상품 링크와 그 뒤의 쿼리 문자열 (itemId/vendorItemId는 쿼리에서 읽음)
+PRODUCT_LINK_RE = re.compile(r'/products/(\d+)([^"\'\s<>]*)')
+
+# 상품 제목
+TITLE_RE = re.compile(
+    r'<(?:dt|div|span) class="name">\s*(?:<a\b[^>]*>\s*)?([^<]+)'
+    r'|<a\b(?=[^>]*class="[^"]*name[^"]*")[^>]*>([^<]+)</a>'
+    r'|<h[34]\b[^>]*>([^<]+)</h[34]>'
+)
+
+# 가격
+PRICE_RE = re.compile(
+    r'<(?:strong|span|em|div) class="price(?:-value)?">([^<]+)<'
+    r'|data-price="([^"]*)"'
+)
+
+
+
+def _after_tags(tags, class_names):
+    """바로 앞이 <태그 class="이름"> 인지 확인하는 후방 탐색 (태그 × 이름 조합)"""
+    return '(?:%s)' % '|'.join(
+        f'(?<=<{tag} class="{class_name}">)' for tag in tags for class_name in class_names
+    )
+
+
+# 카드 안의 제목/가격(TITLE_RE/PRICE_RE의 class 형태)과 리뷰 수를 findall 한 번으로 찾음
+# 행마다 (제목, 가격, 리뷰 수, 리뷰 수) 중 하나만 채워진다. 고정 문자열 ' class="'로 시작해야
+# 정규식 엔진이 빠른 문자열 검색으로 후보 위치를 건너뛰므로 태그 이름은 후방 탐색으로 확인한다.
+CARD_FIELDS_RE = re.compile(
+    r' class="(?:'
+    r'name">' + _after_tags(('dt', 'div', 'span'), ('name',)) + r'\s*(?:<a\b[^>]*>\s*)?([^<]+)'
+    r'|price(?:-value)?">' + _after_tags(('strong', 'span', 'em', 'div'), ('price', 'price-value')) + r'([^<]+)<'
+    r'|rating-total-count">' + _after_tags(('span', 'em', 'div'), ('rating-total-count',)) + r'\(([^)]+)\)'
+    r'|review-count">' + _after_tags(('span', 'em'), ('review-count',)) + r'([^<]+)<'
+    r')'
+)
+
+
+def _field(pattern, card, default):
+    """카드 안에서 첫 번째로 일치하는 값 반환"""
+    match = pattern.search(card)
+    if match:
+        return match.group(match.lastindex).strip()
+    return default
+
+
+def iter_cards(html_content):
+    """검색 결과 HTML을 <li> 카드의 (시작 태그, 본문) 목록으로 나눔 (본문은 다음 카드 시작 전까지)"""
+    parts = CARD_SPLIT_RE.split(html_content)
+    return list(zip(parts[1::2], parts[2::2]))
+
+
+def _parse_card(card_tag, card):
+    """카드 하나에서 상품 정보 추출 (상품 ID와 제목이 없으면 None)
+
+    제목/가격/리뷰 수는 기본 마크업을 CARD_FIELDS_RE 한 번으로 찾고, 제목이나 가격이 그 형태가
+    아닐 때만(class에 name이 들어간 링크, h3/h4 제목, data-price) 전체 패턴으로 다시 찾는다.
+    """
+    link = PRODUCT_LINK_RE.search(card)
+    match = CARD_PRODUCT_ID_RE.search(card_tag) or link
+    if not match:
+        return None
+
+    title = price = reviews = None
+    for row_title, row_price, row_reviews, row_review_count in CARD_FIELDS_RE.findall(card):
+        if row_title:
+            title = title or row_title
+        elif row_price:
+            price = price or row_price
+        else:
+            reviews = reviews or row_reviews or row_review_count
+
+    title = title.strip() if title else _field(TITLE_RE, card, None)
+    if not title:
+        return None
+
+    query = link.group(2) if link else ''
+    item_id = ITEM_ID_RE.search(query)
+    vendor_item_id = VENDOR_ITEM_ID_RE.search(query)
+
+    return {
+        'product_id': match.group(1),
+        'item_id': item_id.group(1) if item_id else None,
+        'vendor_item_id': vendor_item_id.group(1) if vendor_item_id else None,
+        'title': title,
+        'price': price.strip() if price else _field(PRICE_RE, card, 'N/A'),
+        'reviews': reviews.strip() if reviews else '0'
+    }
+
+
+def iter_products(html_content):
+    """<li> 카드 단위로 상품 정보를 생성 (제목·가격·리뷰가 서로 다른 상품과 섞이지 않음)"""
+    for card_tag, card in iter_cards(html_content):
+        product = _parse_card(card_tag, card)
+        if product:
+            yield product
+
+
+def iter_products_stream(chunks, encoding='utf-8'):
+    """응답 본문 조각을 받는 대로 파싱해 완성된 카드부터 상품 정보를 생성
+
+    다음 카드의 시작 태그가 도착해야 이전 카드가 끝난 것으로 보므로
+    메모리에는 마지막 카드와 새 조각만 남는다. 호출 측에서 중간에
+    반복을 멈추면 나머지 본문은 읽지 않는다.
+    """
+    decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+    buffer = ''
+
+    for chunk in chunks:
+        if isinstance(chunk, bytes):
+            chunk = decoder.decode(chunk)
+        buffer += chunk
+
+        cards = list(CARD_RE.finditer(buffer))
+        if not cards:
+            # 카드 시작 전 부분(head, 스크립트 등)은 잘린 태그만 남기고 버린다
+            tag_start = buffer.rfind('<')
+            buffer = buffer[tag_start:] if tag_start >= 0 else ''
+            continue
+
+        for current, following in zip(cards, cards[1:]):
+            product = _parse_card(current.group(), buffer[current.end():following.start()])
+            if product:
+                yield product
+
+        buffer = buffer[cards[-1].start():]
+
+    buffer += decoder.decode(b'', final=True)
+    yield from iter_products(buffer)
+
+
+# JSON 응답에서 상품 배열이 담기는 키
+JSON_PRODUCT_KEYS = ['productList', 'products', 'items', 'data', 'results', 'list', 'content']
+
+_WHITESPACE_RE = re.compile(r'[\s,]*')
+
+# JSON 구조 토큰 (문자열은 통째로 건너뜀, 아직 닫히지 않은 문자열은 여는 '"'만 일치)
+_JSON_TOKEN_RE = re.compile(r'"(?:[^"\\]|\\.)*"|[{}\[\]]|"')
+
+# 키 뒤에 배열 값이 시작되는지
+_JSON_ARRAY_VALUE_RE = re.compile(r'\s*:\s*\[')
+
+
+def _find_top_level_array(text, position, depth, key):
+    """text[position:]의 구조를 따라가며 최상위 배열 또는 최상위 객체의 key 배열 시작 위치 찾기
+
+    (배열 시작 위치 또는 None, 다음에 이어서 확인할 위치, 깊이) 반환
+    """
+    while True:
+        match = _JSON_TOKEN_RE.search(text, position)
+        if not match:
+            return None, len(text), depth
+
+        token = match.group()
+        if token == '"':
+            # 문자열이 조각 경계에 걸침
+            return None, match.start(), depth
+        if token == '[' and depth == 0:
+            # 응답 자체가 배열인 경우
+            return match.end(), match.end(), depth
+        if token in '{[':
+            depth += 1
+        elif token in '}]':
+            depth -= 1
+        elif depth == 1 and token[1:-1] == key:
+            value = _JSON_ARRAY_VALUE_RE.match(text, match.end())
+            if value:
+                return value.end(), value.end(), depth
+            if not text[match.end():].strip(' \t\r\n:'):
+                # 값이 아직 도착하지 않음
+                return None, match.start(), depth
+        position = match.end()
+
+
+def iter_json_products_stream(chunks, product_keys=None, encoding='utf-8'):
+    """JSON 응답 본문 조각에서 상품 배열의 원소를 도착하는 대로 생성
+
+    응답이 배열이거나 최상위 객체에 가장 우선인 키(product_keys[0])의 배열이 있으면 도착하는 대로
+    생성한다. 그 밖의 키는 더 우선인 키가 뒤에 나올 수 있으므로 본문을 끝까지 읽은 뒤 최상위 키를
+    우선순위대로 확인한다. 중첩된 객체 안의 같은 이름 키는 상품 배열로 보지 않는다.
+    """
+    keys = product_keys or JSON_PRODUCT_KEYS
+    quoted_key = json.dumps(keys[0])
+    json_decoder = json.JSONDecoder()
+    decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+
+    def decoded_chunks():
+        for chunk in chunks:
+            yield decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+        yield decoder.decode(b'', final=True)
+
+    pieces = decoded_chunks()
+    text = ''
+    first = ''
+    position = 0
+    depth = 0
+    array_start = None
+
+    for piece in pieces:
+        text += piece
+        first = first or text.lstrip()[:1]
+
+        # 최상위 배열이거나 가장 우선인 키가 새로 도착했을 때만 구조를 따라간다
+        search_from = max(position, len(text) - len(piece) - len(quoted_key))
+        if first != '[' and text.find(quoted_key, search_from) < 0:
+            continue
+
+        array_start, position, depth = _find_top_level_array(text, position, depth, keys[0])
+        if array_start is not None:
+            break
+
+    if array_start is None:
+        # 스트리밍할 배열이 없으면 본문 전체에서 최상위 키를 우선순위대로 확인
+        try:
+            data = json.loads(text)
+        except ValueError:
+            return
+        if isinstance(data, dict):
+            data = next((data[key] for key in keys if isinstance(data.get(key), list)), [])
+        if isinstance(data, list):
+            yield from (item for item in data if isinstance(item, dict))
+        return
+
+    buffer = text[array_start:]
+    for piece in itertools.chain([''], pieces):
+        buffer += piece
+
+        position = 0
+        while True:
+            position = _WHITESPACE_RE.match(buffer, position).end()
+            if position >= len(buffer):
+                break
+            if buffer[position] == ']':
+                return
+            try:
+                item, end = json_decoder.raw_decode(buffer, position)
+            except ValueError:
+                # 아직 도착하지 않은 원소
+                break
+            position = end
+            if isinstance(item, dict):
+                yield item
+
+        buffer = buffer[position:]
+
+
+def parse_search_results(html_content, page=None, page_size=PAGE_SIZE, index=None):
+    """검색 결과 HTML에서 순위가 매겨진 상품 목록 추출 (index(RankIndex)를 주면 파싱하면서 색인도 채움)"""
+    products = []
+    if index is not None:
+        index.source = products
+    timestamp = datetime.now().isoformat()
+    offset = (page - 1) * page_size if page else 0
+
+    for i, product in enumerate(iter_products(html_content)):
+        product_info = {
+            'rank': offset + i + 1,
+            'product_id': product['product_id'],
+            'title': product['title'],
+            'price': product['price'],
+            'reviews': product['reviews']
+        }
+        if product['item_id']:
+            product_info['item_id'] = product['item_id']
+        if product['vendor_item_id']:
+            product_info['vendor_item_id'] = product['vendor_item_id']
+        if page:
+            product_info['page'] = page
+        product_info['timestamp'] = timestamp
+
+        products.append(product_info)
+        if index is not None:
+            index.add(product_info)
+
+    return products
+
+
+def multi_scan_extract(html_content):
+    """기존 체커들의 다중 re.findall 방식 (벤치마크 비교용)"""
+    products = []
+
+    product_ids = re.findall(r'/products/(\d+)', html_content)
+
+    titles = []
+    for pattern in [
+        r'<dt class="name">.*?<a[^>]*>([^<]+)</a>',
+        r'<a[^>]*class="[^"]*name[^"]*"[^>]*>([^<]+)</a>',
+        r'data-product-id="[^"]*"[^>]*>([^<]+)</a>',
+        r'<span class="name">([^<]+)</span>',
+        r'<div class="name">([^<]+)</div>'
+    ]:
+        titles = re.findall(pattern, html_content, re.DOTALL)
+        if titles:
+            break
+
+    prices = []
+    for pattern in [
+        r'<strong class="price-value">([^<]+)</strong>',
+        r'<span class="price-value">([^<]+)</span>',
+        r'data-price="([^"]*)"',
+        r'<em class="price-value">([^<]+)</em>',
+        r'<div class="price-value">([^<]+)</div>'
+    ]:
+        prices = re.findall(pattern, html_content)
+        if prices:
+            break
+
+    reviews = re.findall(r'<span class="rating-total-count">\(([^)]+)\)</span>', html_content)
+
+    max_items = min(len(product_ids), len(titles), len(prices))
+    for i in range(max_items):
+        products.append({
+            'rank': i + 1,
+            'product_id': product_ids[i],
+            'title': titles[i].strip(),
+            'price': prices[i].strip(),
+            'reviews': reviews[i].strip() if i < len(reviews) else '0',
+            'timestamp': datetime.now().isoformat()
+        })
+
+    return products
+
+
+def build_sample_page(count=PAGE_SIZE, badges=0):
+    """벤치마크용 검색 결과 페이지 생성 (쿠팡 PC 검색 결과 마크업, badges: 카드마다 넣을 배송/혜택 배지 수)"""
+    badge = ('<div class="badge"><span class="badge-text">로켓배송</span>'
+             '<img class="badge-img" src="//image.coupangcdn.com/badge.png" alt=""></div>') * badges
+    items = []
+    for i in range(count):
+        product_id = 7000000000 + i
+        # 일부 상품은 리뷰가 없다 (기존 방식에서 목록 길이가 어긋나는 경우)
+        rating = f'<span class="rating-total-count">({i * 7})</span>' if i % 5 else ''
+        items.append(
+            f'<li class="search-product" id="{product_id}" data-product-id="{product_id}">'
+            f'<a class="search-product-link" href="/vp/products/{product_id}?itemId={i}&vendorItemId={i}">'
+            f'<dl class="search-product-wrap"><dt class="image"><img src="//thumbnail.coupangcdn.com/{i}.jpg"></dt>'
+            f'<dd class="descriptions"><div class="name">테스트 상품 {i}</div>'
+            f'<div class="price-area"><strong class="price-value">{(i + 1) * 1000:,}</strong>원</div>'
+            f'{badge}<div class="rating-star">{rating}</div></dd></dl></a></li>'
+        )
+    return '<ul id="productList">' + ''.join(items) + '</ul>'
+
+
+def benchmark(html_content, label, iterations=200):
+    """단일 패스 파서와 기존 다중 스캔 방식 비교"""
+    results = {}
+    for name, func in [('multi_scan', multi_scan_extract), ('single_pass', parse_search_results)]:
+        start_time = time.perf_counter()
+        for _ in range(iterations):
+            products = func(html_content)
+        elapsed = (time.perf_counter() - start_time) / iterations * 1000
+        results[name] = (elapsed, len(products))
+
+    print(f"\n📊 {label} ({len(html_content):,} bytes, {iterations}회 반복)")
+    for name, (elapsed, count) in results.items():
+        print(f"  {name:<12} {elapsed:8.3f}ms  상품 {count}개")
+
+    return results
+
+
+def main():
+    """메인 실행 함수"""
+    print("Search Result Parser Benchmark")
+    print("=" * 50)
+
+    fixture_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'coupang_page_source_트롤리.html')
+    with open(fixture_path, 'r', encoding='utf-8') as f:
+        fixture_html = f.read()
+
+    sample_html = build_sample_page()
+
+    benchmark(fixture_html, '저장된 페이지 (coupang_page_source_트롤리.html)')
+    benchmark(sample_html, '60개 상품 페이지')
+    benchmark(build_sample_page(badges=20), '60개 상품 페이지 (카드마다 배지 20개)')
+    benchmark(fixture_html + sample_html, '저장된 페이지 + 60개 상품')
+
+
+if __name__ == "__main__":
+    main()
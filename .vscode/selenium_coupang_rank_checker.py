@@ -1,23 +1,34 @@
 from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from webdriver_manager.chrome import ChromeDriverManager
 import json
 import time
-import re
 from datetime import datetime
-import random
+from webdriver_pool import get_pool, release_pool, run_with_pooled_driver
+from page_load_profile import apply_chrome_profile, load_search_page
+from dom_product_extractor import extract_products
+from browser_wait import BrowserWaiter
+from rank_index import RankIndex
 
 class SeleniumCoupangRankChecker:
-    def __init__(self):
+    def __init__(self, pool_size=0, max_jobs=50, max_memory_mb=1500):
         self.driver = None
-        self.setup_driver()
+        self.waiter = BrowserWaiter()
+        self.rank_index = None
+        self.driver_pool = None
+        if pool_size:
+            # 브라우저를 미리 띄워 두고 키워드마다 정리된 새 탭으로 재사용
+            self.driver_pool = get_pool(self.__class__.__name__, self.create_driver, size=pool_size,
+                                        max_jobs=max_jobs, max_memory_mb=max_memory_mb)
+        else:
+            self.setup_driver()
         
     def setup_driver(self):
+        """브라우저를 바로 실행해 이 체커 전용으로 사용 (풀을 쓰지 않을 때)"""
+        self.driver = self.create_driver()
+    
+    def create_driver(self):
         """Chrome 드라이버 설정"""
         chrome_options = Options()
         chrome_options.add_argument('--no-sandbox')
@@ -37,12 +48,16 @@ class SeleniumCoupangRankChecker:
         chrome_options.add_argument('--disable-plugins')
         chrome_options.add_argument('--disable-images')
         
+        # DOMContentLoaded에서 바로 반환, 이미지/동영상/광고 요청 차단
+        apply_chrome_profile(chrome_options)
+        
         try:
             # ChromeDriver 자동 설치 및 설정
             service = Service(ChromeDriverManager().install())
-            self.driver = webdriver.Chrome(service=service, options=chrome_options)
-            self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+            driver = webdriver.Chrome(service=service, options=chrome_options)
+            driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
             print("Chrome driver initialized successfully")
+            return driver
         except Exception as e:
             print(f"Failed to initialize Chrome driver: {e}")
             raise e
@@ -57,11 +72,9 @@ class SeleniumCoupangRankChecker:
             
             print(f"Search URL: {search_url}")
             
-            # 페이지 로드
-            self.driver.get(search_url)
-            
-            # 페이지 로딩 대기
-            time.sleep(random.uniform(3, 5))
+            # 페이지 로드 (불필요한 리소스 차단, 상품 목록이 나타날 때까지 대기)
+            if not load_search_page(self.driver, search_url, self.waiter):
+                print("Product list not found within timeout")
             
             # 페이지 디버깅 정보
             print(f"Page title: {self.driver.title}")
@@ -87,149 +100,26 @@ class SeleniumCoupangRankChecker:
     
     def extract_products_from_page(self, keyword):
         """페이지에서 상품 정보 추출"""
-        products = []
-        
         try:
-            # 상품 리스트 대기 (더 긴 대기 시간)
-            wait = WebDriverWait(self.driver, 20)
-            
-            # 상품 리스트 찾기 (여러 선택자 시도)
-            product_list = None
-            selectors = [
-                (By.ID, "productList"),
-                (By.CSS_SELECTOR, "ul#productList"),
-                (By.CSS_SELECTOR, ".search-product-list"),
-                (By.CSS_SELECTOR, "ul[class*='product']")
-            ]
-            
-            for selector_type, selector_value in selectors:
-                try:
-                    product_list = wait.until(
-                        EC.presence_of_element_located((selector_type, selector_value))
-                    )
-                    print(f"Found product list with selector: {selector_value}")
-                    break
-                except TimeoutException:
-                    continue
-            
-            if not product_list:
-                print("Product list not found with any selector")
-                return []
-            
-            # 개별 상품들 찾기 (여러 선택자 시도)
-            product_items = []
-            item_selectors = [
-                "li.search-product",
-                "li[class*='search-product']",
-                "li[class*='product']",
-                ".search-product",
-                "li"
-            ]
-            
-            for selector in item_selectors:
-                product_items = product_list.find_elements(By.CSS_SELECTOR, selector)
-                if product_items:
-                    print(f"Found {len(product_items)} product items with selector: {selector}")
-                    break
-            
-            if not product_items:
+            # 상품 카드 전체를 스크립트 한 번으로 추출 (최대 20개)
+            products = extract_products(self.driver, limit=20)
+            if not products:
                 print("No product items found")
                 return []
             
-            for i, item in enumerate(product_items[:20]):  # 최대 20개
-                try:
-                    product_info = self.parse_product_item(item, i + 1, keyword)
-                    if product_info:
-                        products.append(product_info)
-                except Exception as e:
-                    print(f"Error parsing product {i+1}: {e}")
-                    continue
+            for product in products:
+                product['confidence'] = self.calculate_confidence(product['title'], keyword)
+            
+            # 추적 상품 조회용 상품 ID/itemId/vendorItemId 색인
+            self.rank_index = RankIndex(products)
             
             print(f"Successfully parsed {len(products)} products")
             return products
             
-        except TimeoutException:
-            print("Timeout waiting for product list")
-            return []
         except Exception as e:
             print(f"Error extracting products: {e}")
             return []
     
-    def parse_product_item(self, item, rank, keyword):
-        """개별 상품 정보 파싱"""
-        try:
-            # 상품 링크
-            product_url = ""
-            try:
-                link_elem = item.find_element(By.CSS_SELECTOR, "a.search-product-link")
-                product_url = "https://www.coupang.com" + link_elem.get_attribute('href')
-            except NoSuchElementException:
-                pass
-            
-            # 상품 ID 추출 (URL에서)
-            product_id = ""
-            if product_url:
-                match = re.search(r'/products/(\d+)', product_url)
-                if match:
-                    product_id = match.group(1)
-            
-            # 상품 제목
-            title = ""
-            try:
-                title_elem = item.find_element(By.CSS_SELECTOR, "div.name")
-                title = title_elem.text.strip()
-            except NoSuchElementException:
-                pass
-            
-            # 가격
-            price = "N/A"
-            try:
-                price_elem = item.find_element(By.CSS_SELECTOR, "strong.price-value")
-                price = price_elem.text.strip()
-            except NoSuchElementException:
-                pass
-            
-            # 리뷰 수
-            reviews = "0"
-            try:
-                review_elem = item.find_element(By.CSS_SELECTOR, "span.rating-total-count")
-                review_text = review_elem.text.strip()
-                # 괄호 안의 숫자 추출
-                match = re.search(r'\((\d+)\)', review_text)
-                if match:
-                    reviews = match.group(1)
-            except NoSuchElementException:
-                pass
-            
-            # 평점
-            rating = "0"
-            try:
-                rating_elem = item.find_element(By.CSS_SELECTOR, "em.rating")
-                rating = rating_elem.text.strip()
-            except NoSuchElementException:
-                pass
-            
-            # 키워드 매칭 확인
-            confidence = self.calculate_confidence(title, keyword)
-            
-            product_info = {
-                'rank': rank,
-                'product_id': product_id,
-                'title': title,
-                'price': price,
-                'reviews': reviews,
-                'rating': rating,
-                'url': product_url,
-                'confidence': confidence,
-                'timestamp': datetime.now().isoformat()
-            }
-            
-            return product_info
-            
-        except Exception as e:
-            print(f"Error parsing product item: {e}")
-            return None
-    
     def calculate_confidence(self, title, keyword):
         """상품 제목과 키워드의 매칭 신뢰도 계산"""
         if not title or not keyword:
@@ -261,6 +151,10 @@ class SeleniumCoupangRankChecker:
     
     def check_rank(self, keyword):
         """순위 체크 실행"""
+        if self.driver_pool is not None and self.driver is None:
+            # 풀에서 브라우저를 빌려 실행
+            return run_with_pooled_driver(self, self.check_rank, keyword)
+        
         print(f"\nRank check started: {keyword}")
         
         try:
@@ -308,26 +202,27 @@ class SeleniumCoupangRankChecker:
         return filename
     
     def find_specific_product(self, products, target_url):
-        """특정 URL의 상품 순위 찾기"""
+        """특정 URL의 상품 순위 찾기 (같은 검색 결과는 한 번 만든 색인으로 바로 조회)"""
         if not target_url or not products:
             return None
         
-        # URL에서 상품 ID 추출
-        match = re.search(r'/products/(\d+)', target_url)
-        if not match:
-            return None
-        
-        target_product_id = match.group(1)
+        if self.rank_index is None or not self.rank_index.covers(products):
+            self.rank_index = RankIndex(products)
         
-        # 상품 목록에서 해당 ID 찾기
-        for product in products:
-            if product['product_id'] == target_product_id:
-                return product
-        
-        return None
+        return self.rank_index.find(target_url)
     
     def close(self):
         """드라이버 종료"""
+        # 페이지 대기 시간 통계
+        for line in self.waiter.stats.summary():
+            print(f"Wait {line}")
+        
+        if self.driver_pool is not None:
+            print(self.driver_pool.summary())
+            # 같은 클래스의 다른 인스턴스가 쓰는 중이면 풀은 유지됨
+            release_pool(self.driver_pool)
+            self.driver_pool = None
+            return
         if self.driver:
             self.driver.quit()
             print("Driver closed")
@@ -9,13 +9,25 @@ import time
 import json
 from datetime import datetime
 import requests
+from webdriver_pool import get_pool, release_pool, run_with_pooled_driver
+from dom_product_extractor import extract_products
 
 class SeleniumCoupangRankChecker:
-    def __init__(self):
+    def __init__(self, pool_size=0, max_jobs=50, max_memory_mb=1500):
         self.driver = None
-        self.setup_driver()
+        self.driver_pool = None
+        if pool_size:
+            # 브라우저를 미리 띄워 두고 키워드마다 정리된 새 탭으로 재사용
+            self.driver_pool = get_pool(self.__class__.__name__, self.create_driver, size=pool_size,
+                                        max_jobs=max_jobs, max_memory_mb=max_memory_mb)
+        else:
+            self.setup_driver()
         
     def setup_driver(self):
+        """브라우저를 바로 실행해 이 체커 전용으로 사용 (풀을 쓰지 않을 때)"""
+        self.driver = self.create_driver()
+    
+    def create_driver(self):
         """Chrome 드라이버 설정"""
         print("Setting up Chrome driver...")
         
@@ -34,12 +46,13 @@ class SeleniumCoupangRankChecker:
         
         try:
             service = Service(ChromeDriverManager().install())
-            self.driver = webdriver.Chrome(service=service, options=chrome_options)
+            driver = webdriver.Chrome(service=service, options=chrome_options)
             
             # 자동화 감지 방지
-            self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+            driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
             
             print("Chrome driver setup completed")
+            return driver
             
         except Exception as e:
             print(f"Chrome driver setup failed: {e}")
@@ -126,55 +139,10 @@ class SeleniumCoupangRankChecker:
     
     def extract_product_info(self):
         """검색 결과에서 상품 정보 추출"""
-        products = []
-        
         try:
-            # 상품 리스트 찾기
-            product_elements = self.driver.find_elements(By.CSS_SELECTOR, ".search-product")
-            print(f"Found {len(product_elements)} products")
-            
-            for i, product in enumerate(product_elements[:20]):  # 상위 20개만
-                try:
-                    # 상품 링크에서 ID 추출
-                    link_element = product.find_element(By.CSS_SELECTOR, "a")
-                    href = link_element.get_attribute("href")
-                    product_id = href.split("/products/")[-1] if "/products/" in href else "N/A"
-                    
-                    # 상품 제목
-                    try:
-                        title_element = product.find_element(By.CSS_SELECTOR, ".name")
-                        title = title_element.text.strip()
-                    except:
-                        title = "N/A"
-                    
-                    # 가격
-                    try:
-                        price_element = product.find_element(By.CSS_SELECTOR, ".price-value")
-                        price = price_element.text.strip()
-                    except:
-                        price = "N/A"
-                    
-                    # 리뷰 수
-                    try:
-                        review_element = product.find_element(By.CSS_SELECTOR, ".rating-total-count")
-                        reviews = review_element.text.strip()
-                    except:
-                        reviews = "0"
-                    
-                    product_info = {
-                        'rank': i + 1,
-                        'product_id': product_id,
-                        'title': title,
-                        'price': price,
-                        'reviews': reviews,
-                        'timestamp': datetime.now().isoformat()
-                    }
-                    
-                    products.append(product_info)
-                    
-                except Exception as e:
-                    print(f"Error extracting product {i+1}: {e}")
-                    continue
+            # 상품 카드 전체를 스크립트 한 번으로 추출 (상위 20개만)
+            products = extract_products(self.driver, limit=20)
+            print(f"Found {len(products)} products")
             
             return products
             
@@ -184,6 +152,10 @@ class SeleniumCoupangRankChecker:
     
     def check_rank(self, keyword):
         """순위 체크 실행"""
+        if self.driver_pool is not None and self.driver is None:
+            # 풀에서 브라우저를 빌려 실행
+            return run_with_pooled_driver(self, self.check_rank, keyword)
+        
         print(f"\nRank check started: {keyword}")
         
         # IP 확인
@@ -229,6 +201,12 @@ class SeleniumCoupangRankChecker:
     
     def close(self):
         """브라우저 종료"""
+        if self.driver_pool is not None:
+            print(self.driver_pool.summary())
+            # 같은 클래스의 다른 인스턴스가 쓰는 중이면 풀은 유지됨
+            release_pool(self.driver_pool)
+            self.driver_pool = None
+            return
         if self.driver:
             self.driver.quit()
             print("Browser closed")
@@ -238,7 +216,7 @@ def main():
     print("Selenium Coupang Rank Checker System")
     print("=" * 50)
     
-    checker = SeleniumCoupangRankChecker()
+    checker = SeleniumCoupangRankChecker(pool_size=1)
     
     try:
         # 테스트 키워드들
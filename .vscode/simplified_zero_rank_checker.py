@@ -10,6 +10,7 @@ from datetime import datetime
 import configparser
 import random
 from pathlib import Path
+from rank_result_sink import RankResultSink
 
 class SimplifiedZeroRankChecker:
     def __init__(self):
@@ -21,6 +22,18 @@ class SimplifiedZeroRankChecker:
         self.api_base_url = self.config.get('api', 'base_url', fallback='http://localhost:8000')
         self.login_id = self.config.get('login', 'id', fallback='pcworker_python')
         
+        # 결과 전송 버퍼 (모아서 일괄 전송, 서버 장애 시 저널 보관)
+        self.result_sink = RankResultSink(
+            self.api_base_url,
+            self.login_id,
+            journal_path=self.log_dir / "pending_results.jsonl",
+            batch_size=int(self.config.get('result', 'batch_size', fallback='50')),
+            flush_interval=float(self.config.get('result', 'flush_interval', fallback='5')),
+            max_retries=2,
+            timeout=10,
+            log=self.log
+        )
+        
         self.log("Zero Rank Checker Python Version 시작")
         self.log("PC 키워드 작업 추가")
         self.log("PC 1.0버전으로 시작...")
@@ -261,26 +274,10 @@ class SimplifiedZeroRankChecker:
             return None
     
     def send_rank_result(self, keyword_id, rank):
-        """순위 결과 서버에 전송"""
+        """순위 결과 서버에 전송 (버퍼에 추가, 일괄 전송)"""
         try:
-            url = f"{self.api_base_url}/api/rank-checker/result"
-            
-            data = {
-                'keyword_id': keyword_id,
-                'rank': rank or 0,
-                'timestamp': datetime.now().isoformat(),
-                'worker_id': self.login_id
-            }
+            self.result_sink.add(keyword_id, rank)
             
-            try:
-                response = requests.post(url, json=data, timeout=10)
-                if response.status_code == 200:
-                    self.log("순위 결과 전송 성공")
-                else:
-                    self.log(f"결과 전송 실패: {response.status_code}")
-            except:
-                self.log("API 서버 없음 - 결과 전송 건너뜀")
-                
         except Exception as e:
             self.log(f"결과 전송 오류: {e}")
     
@@ -288,6 +285,7 @@ class SimplifiedZeroRankChecker:
         """메인 실행 루프"""
         self.log("메인 루프 시작")
         
+        self.result_sink.start()
         cycle_count = 0
         
         while True:
@@ -332,6 +330,9 @@ class SimplifiedZeroRankChecker:
                     
                     self.log(f"No 데이터 전송할 거시료 있음 계속 진행")
                 
+                # 사이클 결과는 대기 전에 바로 전송
+                self.result_sink.flush()
+                
                 self.log("모든 검색 작업 완료. 10초 대기...")
                 time.sleep(10)
                 
@@ -341,6 +342,8 @@ class SimplifiedZeroRankChecker:
             except Exception as e:
                 self.log(f"메인 루프 오류: {e}")
                 time.sleep(5)
+        
+        self.result_sink.close()
 
 def main():
     """메인 실행 함수"""
@@ -5,10 +5,12 @@ import random
 from datetime import datetime
 import re
 from urllib.parse import quote
+from rank_index import RankIndex
 
 class StealthCoupangChecker:
     def __init__(self):
         self.session = requests.Session()
+        self.rank_index = None
         # 더 정교한 헤더 설정
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
@@ -119,6 +121,8 @@ class StealthCoupangChecker:
     def parse_search_results(self, html_content, keyword):
         """검색 결과 파싱"""
         products = []
+        # 파싱하면서 추적 상품 조회용 색인도 함께 만듦
+        self.rank_index = RankIndex(products)
         
         try:
             from bs4 import BeautifulSoup
@@ -136,6 +140,7 @@ class StealthCoupangChecker:
                         product_info = self.parse_product_item(item, i + 1, keyword)
                         if product_info:
                             products.append(product_info)
+                            self.rank_index.add(product_info)
                     except Exception as e:
                         print(f"Error parsing product {i+1}: {e}")
                         continue
@@ -237,21 +242,14 @@ class StealthCoupangChecker:
         return min(confidence, 1.0)
     
     def find_specific_product(self, products, target_url):
-        """특정 제품 찾기"""
+        """특정 제품 찾기 (같은 검색 결과는 한 번 만든 색인으로 바로 조회)"""
         if not target_url or not products:
             return None
         
-        match = re.search(r'/products/(\d+)', target_url)
-        if not match:
-            return None
-        
-        target_product_id = match.group(1)
-        
-        for product in products:
-            if product['product_id'] == target_product_id:
-                return product
+        if self.rank_index is None or not self.rank_index.covers(products):
+            self.rank_index = RankIndex(products)
         
-        return None
+        return self.rank_index.find(target_url)
     
     def check_rank(self, keyboard, target_url):
         """순위 체크 메인 함수"""
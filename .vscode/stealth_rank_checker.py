@@ -10,15 +10,28 @@ import json
 from datetime import datetime
 import requests
 from urllib.parse import quote
-import re
+from search_result_parser import parse_search_results
 import random
+from webdriver_pool import get_pool, release_pool, run_with_pooled_driver
+from browser_wait import BrowserWaiter
 
 class StealthCoupangRankChecker:
-    def __init__(self):
+    def __init__(self, pool_size=0, max_jobs=50, max_memory_mb=1500):
         self.driver = None
-        self.setup_driver()
+        self.waiter = BrowserWaiter()
+        self.driver_pool = None
+        if pool_size:
+            # 브라우저를 미리 띄워 두고 키워드마다 정리된 새 탭으로 재사용
+            self.driver_pool = get_pool(self.__class__.__name__, self.create_driver, size=pool_size,
+                                        max_jobs=max_jobs, max_memory_mb=max_memory_mb)
+        else:
+            self.setup_driver()
         
     def setup_driver(self):
+        """브라우저를 바로 실행해 이 체커 전용으로 사용 (풀을 쓰지 않을 때)"""
+        self.driver = self.create_driver()
+    
+    def create_driver(self):
         """스텔스 모드 Chrome 드라이버 설정"""
         print("Setting up Stealth Chrome driver...")
         
@@ -68,18 +81,19 @@ class StealthCoupangRankChecker:
         
         try:
             service = Service(ChromeDriverManager().install())
-            self.driver = webdriver.Chrome(service=service, options=chrome_options)
+            driver = webdriver.Chrome(service=service, options=chrome_options)
             
             # 자동화 감지 방지 스크립트
-            self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-            self.driver.execute_script("Object.defineProperty(navigator, 'plugins', {get: () => [1, 2, 3, 4, 5]})")
-            self.driver.execute_script("Object.defineProperty(navigator, 'languages', {get: () => ['ko-KR', 'ko', 'en-US', 'en']})")
+            driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+            driver.execute_script("Object.defineProperty(navigator, 'plugins', {get: () => [1, 2, 3, 4, 5]})")
+            driver.execute_script("Object.defineProperty(navigator, 'languages', {get: () => ['ko-KR', 'ko', 'en-US', 'en']})")
             
             # 페이지 로드 타임아웃 설정
-            self.driver.set_page_load_timeout(60)
-            self.driver.implicitly_wait(10)
+            driver.set_page_load_timeout(60)
+            driver.implicitly_wait(10)
             
             print("Stealth Chrome driver setup completed")
+            return driver
             
         except Exception as e:
             print(f"Stealth Chrome driver setup failed: {e}")
@@ -110,7 +124,7 @@ class StealthCoupangRankChecker:
             # 1단계: 쿠팡 메인 페이지 접속
             print("Step 1: Accessing Coupang main page...")
             self.driver.get("https://www.coupang.com")
-            self.random_delay(3, 5)
+            self.waiter.wait_for_page(self.driver, 'main_page')
             
             # 페이지 로딩 확인
             page_title = self.driver.title
@@ -159,13 +173,13 @@ class StealthCoupangRankChecker:
                     from selenium.webdriver.common.keys import Keys
                     search_box.send_keys(Keys.RETURN)
                 
-                self.random_delay(3, 5)
+                self.waiter.wait_for_search_results(self.driver)
             else:
                 # 검색창을 찾을 수 없으면 직접 URL로 이동
                 print("Search box not found, using direct URL...")
                 search_url = f"https://www.coupang.com/np/search?q={quote(keyword)}"
                 self.driver.get(search_url)
-                self.random_delay(5, 8)
+                self.waiter.wait_for_search_results(self.driver)
             
             # 3단계: 검색 결과 확인
             print("Step 5: Checking search results...")
@@ -190,88 +204,9 @@ class StealthCoupangRankChecker:
     
     def extract_product_info(self, page_source):
         """검색 결과에서 상품 정보 추출"""
-        products = []
-        
         try:
-            # 상품 링크 패턴
-            product_pattern = r'/products/(\d+)'
-            product_ids = re.findall(product_pattern, page_source)
-            
-            # 상품 제목 패턴 (여러 패턴 시도)
-            title_patterns = [
-                r'<dt class="name">.*?<a[^>]*>([^<]+)</a>',
-                r'<a[^>]*class="[^"]*name[^"]*"[^>]*>([^<]+)</a>',
-                r'data-product-id="[^"]*"[^>]*>([^<]+)</a>',
-                r'<span class="name">([^<]+)</span>',
-                r'<div class="name">([^<]+)</div>',
-                r'<h3[^>]*>([^<]+)</h3>',
-                r'<h4[^>]*>([^<]+)</h4>'
-            ]
-            
-            titles = []
-            for pattern in title_patterns:
-                found_titles = re.findall(pattern, page_source, re.DOTALL)
-                if found_titles:
-                    titles = found_titles
-                    print(f"Found {len(titles)} titles with pattern: {pattern}")
-                    break
-            
-            # 가격 패턴 (여러 패턴 시도)
-            price_patterns = [
-                r'<strong class="price-value">([^<]+)</strong>',
-                r'<span class="price-value">([^<]+)</span>',
-                r'data-price="([^"]*)"',
-                r'<em class="price-value">([^<]+)</em>',
-                r'<div class="price-value">([^<]+)</div>',
-                r'<span class="price">([^<]+)</span>',
-                r'<strong class="price">([^<]+)</strong>'
-            ]
-            
-            prices = []
-            for pattern in price_patterns:
-                found_prices = re.findall(pattern, page_source)
-                if found_prices:
-                    prices = found_prices
-                    print(f"Found {len(prices)} prices with pattern: {pattern}")
-                    break
-            
-            # 리뷰 수 패턴
-            review_patterns = [
-                r'<span class="rating-total-count">\(([^)]+)\)</span>',
-                r'<em class="rating-total-count">\(([^)]+)\)</em>',
-                r'<div class="rating-total-count">\(([^)]+)\)</div>',
-                r'<span class="review-count">([^<]+)</span>',
-                r'<em class="review-count">([^<]+)</em>'
-            ]
-            
-            reviews = []
-            for pattern in review_patterns:
-                found_reviews = re.findall(pattern, page_source)
-                if found_reviews:
-                    reviews = found_reviews
-                    print(f"Found {len(reviews)} reviews with pattern: {pattern}")
-                    break
-            
-            print(f"Found {len(product_ids)} product IDs")
-            print(f"Found {len(titles)} titles")
-            print(f"Found {len(prices)} prices")
-            print(f"Found {len(reviews)} reviews")
-            
-            # 상품 정보 조합
-            max_items = min(len(product_ids), len(titles), len(prices))
-            
-            for i in range(max_items):
-                product_info = {
-                    'rank': i + 1,
-                    'product_id': product_ids[i],
-                    'title': titles[i].strip() if i < len(titles) else 'N/A',
-                    'price': prices[i].strip() if i < len(prices) else 'N/A',
-                    'reviews': reviews[i].strip() if i < len(reviews) else '0',
-                    'timestamp': datetime.now().isoformat()
-                }
-                
-                products.append(product_info)
-            
+            products = parse_search_results(page_source)
+            print(f"Found {len(products)} products")
             return products
             
         except Exception as e:
@@ -280,6 +215,10 @@ class StealthCoupangRankChecker:
     
     def check_rank(self, keyword):
         """순위 체크 실행"""
+        if self.driver_pool is not None and self.driver is None:
+            # 풀에서 브라우저를 빌려 실행
+            return run_with_pooled_driver(self, self.check_rank, keyword)
+        
         print(f"\nRank check started: {keyword}")
         
         # IP 확인
@@ -325,6 +264,16 @@ class StealthCoupangRankChecker:
     
     def close(self):
         """브라우저 종료"""
+        # 페이지 대기 시간 통계
+        for line in self.waiter.stats.summary():
+            print(f"Wait {line}")
+        
+        if self.driver_pool is not None:
+            print(self.driver_pool.summary())
+            # 같은 클래스의 다른 인스턴스가 쓰는 중이면 풀은 유지됨
+            release_pool(self.driver_pool)
+            self.driver_pool = None
+            return
         if self.driver:
             self.driver.quit()
             print("Stealth browser closed")
@@ -334,7 +283,7 @@ def main():
     print("Stealth Coupang Rank Checker System")
     print("=" * 60)
     
-    checker = StealthCoupangRankChecker()
+    checker = StealthCoupangRankChecker(pool_size=1)
     
     try:
         # 테스트 키워드들
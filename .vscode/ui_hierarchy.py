@@ -0,0 +1,181 @@
+import re
+import time
+import xml.etree.ElementTree as ET
+from card_layout import PRICE_RE, parse_card_text
+
+# 덤프 파일을 만든 뒤 바로 출력 (/dev/tty 출력은 기기마다 동작이 달라 파일 사용)
+DUMP_COMMAND = "uiautomator dump --compressed {path} >/dev/null && cat {path}"
+DUMP_PATH = "/sdcard/window_dump.xml"
+
+BOUNDS_RE = re.compile(r'\[(-?\d+),(-?\d+)\]\[(-?\d+),(-?\d+)\]')
+
+
+def dump_hierarchy(run_shell, path=DUMP_PATH, timeout=15):
+    """현재 화면의 뷰 계층 XML 문자열 (실패하면 None)"""
+    success, stdout, stderr = run_shell(DUMP_COMMAND.format(path=path), timeout=timeout)
+    if not success:
+        return None
+
+    start = stdout.find('<?xml')
+    if start < 0:
+        start = stdout.find('<hierarchy')
+    end = stdout.rfind('</hierarchy>')
+    if start < 0 or end < 0:
+        return None
+
+    return stdout[start:end + len('</hierarchy>')]
+
+
+def parse_bounds(bounds):
+    """'[x1,y1][x2,y2]' → (x1, y1, x2, y2)"""
+    match = BOUNDS_RE.match(bounds or '')
+    return tuple(int(value) for value in match.groups()) if match else None
+
+
+def node_texts(node):
+    """노드와 하위 노드의 텍스트 (text, 없으면 content-desc), 화면 순서"""
+    texts = []
+    for element in node.iter('node'):
+        text = (element.get('text') or element.get('content-desc') or '').strip()
+        if text:
+            texts.append(text)
+    return texts
+
+
+def find_product_nodes(root):
+    """가격 텍스트를 포함하는 가장 안쪽의 클릭 가능한 노드 (상품 카드) 목록"""
+    cards = []
+    card_ids = set()
+
+    def visit(node, clickable_ancestor):
+        if node.get('clickable') == 'true':
+            clickable_ancestor = node
+
+        text = node.get('text') or node.get('content-desc') or ''
+        if clickable_ancestor is not None and PRICE_RE.search(text):
+            if id(clickable_ancestor) not in card_ids:
+                card_ids.add(id(clickable_ancestor))
+                cards.append(clickable_ancestor)
+
+        for child in node:
+            visit(child, clickable_ancestor)
+
+    visit(root, None)
+
+    # 다른 카드를 포함하는 노드(목록 전체 등)는 제외
+    nested = set()
+    for card in cards:
+        for element in card.iter('node'):
+            if element is not card and id(element) in card_ids:
+                nested.add(id(card))
+                break
+
+    return [card for card in cards if id(card) not in nested]
+
+
+def parse_hierarchy(xml_text):
+    """뷰 계층 XML에서 상품 카드 레코드 추출 (화면 위에서부터)"""
+    try:
+        root = ET.fromstring(xml_text)
+    except ET.ParseError as e:
+        print(f"Hierarchy parse failed: {e}")
+        return []
+
+    records = []
+    for node in find_product_nodes(root):
+        texts = node_texts(node)
+        product = parse_card_text('\n'.join(texts))
+        if not product['title']:
+            continue
+
+        product['resource_id'] = node.get('resource-id', '')
+        product['bounds'] = parse_bounds(node.get('bounds'))
+        product['texts'] = texts
+        records.append(product)
+
+    records.sort(key=lambda record: record['bounds'][1] if record['bounds'] else 0)
+    return records
+
+
+def record_identity(record):
+    """스크롤 위치가 달라도 같은 상품이면 같은 값 (화면 좌표는 제외)"""
+    return (record.get('resource_id', ''), record['title'], record['price'])
+
+
+class HierarchyProductCollector:
+    """뷰 계층 덤프로 화면의 상품을 읽는 IncrementalScrollCollector용 read_screen (덤프 횟수/시간 기록)"""
+
+    def __init__(self, run_shell):
+        self.run_shell = run_shell
+        self.dump_count = 0
+        self.dump_seconds = 0.0
+
+    def read_screen(self):
+        """현재 화면의 상품 레코드 (덤프 실패면 None)"""
+        start_time = time.perf_counter()
+        xml_text = dump_hierarchy(self.run_shell)
+        self.dump_seconds += time.perf_counter() - start_time
+        self.dump_count += 1
+
+        if xml_text is None:
+            return None
+        return parse_hierarchy(xml_text)
+
+
+SAMPLE_SCREEN = '''<?xml version='1.0' encoding='UTF-8' standalone='yes' ?>
+<hierarchy rotation="0">
+  <node class="androidx.recyclerview.widget.RecyclerView" resource-id="com.coupang.mobile:id/list" clickable="false" bounds="[0,300][1080,1800]">
+{cards}
+  </node>
+</hierarchy>'''
+
+SAMPLE_CARD = '''    <node class="android.view.ViewGroup" resource-id="com.coupang.mobile:id/product_item" clickable="true" bounds="[0,{top}][1080,{bottom}]">
+      <node class="android.widget.TextView" text="{title}" clickable="false" bounds="[360,{top}][1040,{title_bottom}]" />
+      <node class="android.widget.TextView" text="{price}원" clickable="false" bounds="[360,{title_bottom}][700,{bottom}]" />
+      <node class="android.widget.TextView" text="({reviews})" clickable="false" bounds="[700,{title_bottom}][900,{bottom}]" />
+    </node>'''
+
+
+def build_sample_screen(first, count=4, top=300, height=360):
+    """벤치마크용 검색 결과 뷰 계층 (first번째 상품부터 count개)"""
+    cards = []
+    for offset in range(count):
+        index = first + offset
+        card_top = top + offset * height
+        cards.append(SAMPLE_CARD.format(
+            top=card_top, bottom=card_top + height - 20, title_bottom=card_top + 200,
+            title=f"트롤리 접이식 카트 {index}호", price=f"{index * 3 + 10},900", reviews=f"{index * 17:,}"
+        ))
+    return SAMPLE_SCREEN.format(cards='\n'.join(cards))
+
+
+def main():
+    """스크롤이 겹치는 가짜 화면 세 개로 추출과 중복 제거 확인"""
+    from scroll_collector import IncrementalScrollCollector
+
+    print("UI Hierarchy Extraction Check")
+    print("=" * 50)
+
+    # 스크롤마다 두 개씩 겹치는 화면
+    screens = iter([build_sample_screen(1), build_sample_screen(3), build_sample_screen(5)])
+
+    def fake_shell(command, timeout=None):
+        return True, next(screens) + '\n', ''
+
+    hierarchy = HierarchyProductCollector(fake_shell)
+    collector = IncrementalScrollCollector(hierarchy.read_screen, lambda: None, key=record_identity, max_scrolls=2)
+    products = collector.run()
+    print(f"  덤프 {hierarchy.dump_count}회 ({collector.stop_reason})")
+
+    for product in products:
+        print(f"  {product['rank']:>2}. {product['title']} / {product['price']} / 리뷰 {product['reviews']}")
+
+    xml_text = build_sample_screen(1, count=8)
+    start_time = time.perf_counter()
+    for _ in range(100):
+        parse_hierarchy(xml_text)
+    print(f"📊 화면 하나 파싱: {(time.perf_counter() - start_time) * 10:.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
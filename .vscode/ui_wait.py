@@ -0,0 +1,122 @@
+import time
+import numpy as np
+from wait_stats import WaitStats
+
+
+class UIWaiter:
+    """고정 sleep 대신 값싼 신호를 주기적으로 확인하고 준비되면 바로 반환하는 대기 도구
+
+    run_shell(command)는 (success, stdout, stderr)를 반환하는 디바이스 셸 실행 함수,
+    capture_frame()은 저해상도 그레이스케일 화면(numpy 배열)을 반환하는 함수다.
+    """
+
+    def __init__(self, run_shell, capture_frame=None, stats=None, poll_interval=0.3, log=print):
+        self.run_shell = run_shell
+        self.capture_frame = capture_frame
+        self.stats = stats or WaitStats()
+        self.poll_interval = poll_interval
+        self.log = log
+
+    def wait_until(self, name, check, timeout, interval=None):
+        """check()가 참이 될 때까지 대기 (준비되면 True, 시간 초과면 False)"""
+        interval = interval or self.poll_interval
+        start_time = time.monotonic()
+        deadline = start_time + timeout
+
+        ready = False
+        while True:
+            try:
+                ready = bool(check())
+            except Exception as e:
+                self.log(f"Wait check error ({name}): {e}")
+                ready = False
+
+            if ready or time.monotonic() >= deadline:
+                break
+            time.sleep(min(interval, max(0, deadline - time.monotonic())))
+
+        elapsed = time.monotonic() - start_time
+        self.stats.record(name, elapsed, ready)
+        if not ready:
+            self.log(f"Wait timeout: {name} ({elapsed:.1f}s)")
+        return ready
+
+    def get_focused_window(self):
+        """현재 포커스된 창 이름 (dumpsys window)"""
+        success, stdout, stderr = self.run_shell("dumpsys window | grep -E 'mCurrentFocus|mFocusedApp'")
+        return stdout if success else ''
+
+    def wait_for_focus(self, name, text, timeout=10):
+        """포커스된 창/액티비티에 text가 포함될 때까지 대기"""
+        text = text.lower()
+        return self.wait_until(name, lambda: text in self.get_focused_window().lower(), timeout)
+
+    def wait_for_focus_change(self, name, timeout=5):
+        """포커스된 창이 지금과 달라질 때까지 대기"""
+        before = self.get_focused_window()
+        return self.wait_until(name, lambda: self.get_focused_window() != before, timeout)
+
+    def wait_for_stable_screen(self, name, timeout=10, stable_frames=2, threshold=2.0, min_change=False):
+        """연속 저해상도 화면의 평균 픽셀 차이가 threshold 이하로 stable_frames번 이어질 때까지 대기
+
+        min_change=True이면 처음 화면에서 한 번 바뀐 뒤에 안정되어야 준비로 본다
+        (탭/입력 직후 아직 화면이 바뀌기 전을 준비로 오인하지 않도록).
+        """
+        state = {'previous': None, 'first': None, 'stable': 0, 'changed': not min_change}
+
+        def check():
+            frame = self.capture_frame()
+            if frame is None:
+                return False
+
+            frame = frame.astype(np.int16)
+            previous = state['previous']
+            state['previous'] = frame
+            if state['first'] is None:
+                state['first'] = frame
+
+            if previous is None or previous.shape != frame.shape:
+                return False
+
+            if not state['changed'] and np.abs(frame - state['first']).mean() > threshold:
+                state['changed'] = True
+
+            if np.abs(frame - previous).mean() <= threshold:
+                state['stable'] += 1
+            else:
+                state['stable'] = 0
+
+            return state['changed'] and state['stable'] >= stable_frames
+
+        return self.wait_until(name, check, timeout)
+
+
+def main():
+    """가짜 화면/셸로 대기 동작과 히스토그램 확인"""
+    print("UI Wait Check")
+    print("=" * 50)
+
+    start_time = time.monotonic()
+
+    def fake_shell(command):
+        # 0.6초 뒤 검색 화면으로 포커스 이동
+        focus = 'SearchActivity' if time.monotonic() - start_time > 0.6 else 'MainActivity'
+        return True, f"  mCurrentFocus=Window{{1 u0 com.coupang.mobile/.{focus}}}\n", ''
+
+    def fake_frame():
+        # 1.2초 동안 화면이 바뀌다가 멈춤
+        elapsed = time.monotonic() - start_time
+        value = int(elapsed * 100) % 255 if elapsed < 1.2 else 120
+        return np.full((480, 270), value, dtype=np.uint8)
+
+    waiter = UIWaiter(fake_shell, capture_frame=fake_frame, poll_interval=0.1)
+    print(f"search_box: {waiter.wait_for_focus('search_box', 'search', timeout=3)}")
+    print(f"search_results: {waiter.wait_for_stable_screen('search_results', timeout=5)}")
+    print(f"never_ready: {waiter.wait_until('never_ready', lambda: False, timeout=0.3)}")
+
+    for line in waiter.stats.summary():
+        print(f"  {line}")
+
+
+if __name__ == "__main__":
+    main()
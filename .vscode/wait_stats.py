@@ -0,0 +1,49 @@
+import bisect
+import threading
+
+# 대기 시간 히스토그램 구간 (초)
+WAIT_BUCKETS = [0.25, 0.5, 1, 2, 4, 8, 16]
+
+
+class WaitStats:
+    """대기 이름별 소요 시간 히스토그램"""
+
+    def __init__(self, buckets=None):
+        self.buckets = list(buckets or WAIT_BUCKETS)
+        self.waits = {}
+        self.lock = threading.Lock()
+
+    def record(self, name, seconds, ready):
+        """대기 한 번 기록 (ready=False는 시간 초과)"""
+        with self.lock:
+            stats = self.waits.get(name)
+            if stats is None:
+                stats = self.waits[name] = {
+                    'count': 0, 'timeouts': 0, 'total': 0.0, 'max': 0.0,
+                    'histogram': [0] * (len(self.buckets) + 1)
+                }
+
+            stats['count'] += 1
+            stats['total'] += seconds
+            stats['max'] = max(stats['max'], seconds)
+            stats['histogram'][bisect.bisect_left(self.buckets, seconds)] += 1
+            if not ready:
+                stats['timeouts'] += 1
+
+    def to_dict(self):
+        """대기 이름별 통계"""
+        with self.lock:
+            return {
+                name: dict(stats, average=stats['total'] / stats['count'], histogram=list(stats['histogram']))
+                for name, stats in self.waits.items()
+            }
+
+    def summary(self):
+        """로그용 요약 (대기 이름별 한 줄)"""
+        labels = [f"≤{bound}s" for bound in self.buckets] + [f">{self.buckets[-1]}s"]
+        lines = []
+        for name, stats in self.to_dict().items():
+            histogram = ' '.join(f"{label}:{count}" for label, count in zip(labels, stats['histogram']) if count)
+            lines.append(f"{name}: {stats['count']}회, 평균 {stats['average']:.2f}s, 최대 {stats['max']:.2f}s, "
+                         f"시간초과 {stats['timeouts']}회 [{histogram}]")
+        return lines
@@ -1,13 +1,27 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-from flask import Flask, jsonify, request, render_template_string
-import sqlite3
-from datetime import datetime
+from flask import Flask, Response, jsonify, request, render_template_string
+from datetime import datetime, timedelta, timezone
+import hashlib
 import json
+from rank_storage import RankStorage
+from rank_schema import apply_migrations
+from rank_rollup import install_rollups, get_chart_series
 
 app = Flask(__name__)
 
+# 순위 DB 파일
+DB_PATH = 'slot_status.db'
+
+# /api/slot-status 에서 조회 가능한 필드 (기본 응답은 SLOT_STATUS_DEFAULT_FIELDS)
+SLOT_STATUS_FIELDS = [
+    'id', 'slot_id', 'slot_type', 'keyword', 'product_id', 'current_rank',
+    'start_rank', 'last_checked', 'status', 'created_at', 'updated_at'
+]
+SLOT_STATUS_DEFAULT_FIELDS = ['slot_id', 'keyword', 'current_rank', 'start_rank', 'last_checked']
+SLOT_STATUS_MAX_LIMIT = 1000
+
 # HTML 템플릿
 RANKING_STATUS_HTML = '''
 <!DOCTYPE html>
@@ -154,10 +168,17 @@ CHART_HTML = '''
 '''
 
 def get_db_connection():
-    """데이터베이스 연결"""
-    conn = sqlite3.connect('slot_status.db')
-    conn.row_factory = sqlite3.Row
-    return conn
+    """데이터베이스 연결 (요청 스레드별 연결, 응답을 다 보내면 close_db_connection에서 닫음)"""
+    return RankStorage.open(DB_PATH).connection()
+
+@app.after_request
+def close_db_connection(response):
+    """응답 전송이 끝나면 그 스레드의 연결 종료 (개발 서버는 요청마다 새 스레드를 씀)
+
+    스트리밍 응답은 본문을 다 보낸 뒤에 닫아야 하므로 teardown 대신 call_on_close를 쓴다.
+    """
+    response.call_on_close(RankStorage.open(DB_PATH).release)
+    return response
 
 @app.route('/ranking-status')
 def ranking_status():
@@ -180,7 +201,6 @@ def coupang_app_add():
         SELECT * FROM slot_status 
         ORDER BY slot_id
     ''').fetchall()
-    conn.close()
     
     return render_template_string(COUPANG_APP_HTML, slot_status=slot_status)
 
@@ -197,28 +217,13 @@ def show_chart(slot_id):
     if not slot_info:
         return "슬롯을 찾을 수 없습니다", 404
     
-    # 히스토리 데이터 조회
-    history_data = conn.execute('''
-        SELECT rank_value, checked_at 
-        FROM ranking_check_history 
-        WHERE slot_id = ?
-        ORDER BY checked_at
-    ''', (slot_id,)).fetchall()
-    
-    conn.close()
+    # 조회 기간 (?days=N, 없으면 전체) - 기간에 따라 원본/시간별/일별 집계 사용
+    days = request.args.get('days', type=int)
+    start = None
+    if days:
+        start = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=days)
     
-    # 차트 데이터 준비
-    labels = []
-    ranks = []
-    
-    for data in history_data:
-        labels.append(data['checked_at'][:10])  # 날짜만
-        ranks.append(data['rank_value'])
-    
-    chart_data = {
-        'labels': labels,
-        'ranks': ranks
-    }
+    chart_data = get_chart_series(RankStorage.open(DB_PATH), slot_id, start=start)
     
     return render_template_string(CHART_HTML, 
                                 keyword=slot_info['keyword'], 
@@ -239,52 +244,158 @@ def update_slot_status_api(slot_id):
     """슬롯 상태 업데이트 API"""
     data = request.get_json()
     
-    connection = get_db_connection()
-    
     try:
-        connection.execute('''
-            UPDATE slot_status 
-            SET current_rank = ?, updated_at = CURRENT_TIMESTAMP
-            WHERE slot_id = ?
-        ''', (data.get('current_rank'), slot_id))
-        
-        # 히스토리 기록
-        connection.execute('''
-            INSERT INTO ranking_check_history (slot_id, keyword, rank_value)
-            SELECT ?, keyword, ? FROM slot_status WHERE slot_id = ?
-        ''', (slot_id, data.get('current_rank'), slot_id))
+        with RankStorage.open(DB_PATH).transaction() as connection:
+            connection.execute('''
+                UPDATE slot_status 
+                SET current_rank = ?, updated_at = CURRENT_TIMESTAMP
+                WHERE slot_id = ?
+            ''', (data.get('current_rank'), slot_id))
+            
+            # 히스토리 기록
+            connection.execute('''
+                INSERT INTO ranking_check_history (slot_id, keyword, rank_value)
+                SELECT ?, keyword, ? FROM slot_status WHERE slot_id = ?
+            ''', (slot_id, data.get('current_rank'), slot_id))
         
-        connection.commit()
         return jsonify({'success': True, 'message': '업데이트 완료'})
         
     except Exception as e:
-        connection.rollback()
         return jsonify({'success': False, 'error': str(e)})
-    finally:
-        connection.close()
+
+def slot_status_range(after_slot_id, page_end):
+    """페이지 범위 WHERE 절과 파라미터
+
+    after_slot_id가 None이면 첫 페이지로, slot_id가 NULL인 행(커서로 가리킬 수 없음)을 맨 앞에 포함한다.
+    page_end가 None이면 끝까지.
+    """
+    conditions = []
+    params = []
+    if after_slot_id is not None:
+        conditions.append('slot_id > ?')
+        params.append(after_slot_id)
+    if page_end is not None:
+        conditions.append('slot_id <= ?')
+        params.append(page_end)
+    
+    where = ' AND '.join(conditions) or '1'
+    if after_slot_id is None and page_end is not None:
+        where = f'(slot_id IS NULL OR {where})'
+    return where, params
+
+def get_slot_status_page_end(conn, after_slot_id, limit):
+    """페이지의 마지막 slot_id (같은 slot_id는 한 페이지에 모두 포함, 없으면 None)"""
+    lower = 'slot_id IS NOT NULL' if after_slot_id is None else 'slot_id > ?'
+    params = () if after_slot_id is None else (after_slot_id,)
+    row = conn.execute(f'''
+        SELECT max(slot_id) FROM (
+            SELECT slot_id FROM slot_status
+            WHERE {lower}
+            ORDER BY slot_id
+            LIMIT ?
+        )
+    ''', params + (limit,)).fetchone()
+    return row[0]
+
+def get_slot_status_etag(conn, after_slot_id, page_end, fields, response_format):
+    """페이지 범위의 약한 ETag (행을 읽어 해시하지 않고 SQLite 집계 한 번으로 계산)
+
+    total(slot_id * current_rank)로 슬롯끼리 순위가 바뀐 경우도 구분하고, 나머지 필드 수정은
+    updated_at으로 잡는다.
+    """
+    where, params = slot_status_range(after_slot_id, page_end)
+    summary = conn.execute(f'''
+        SELECT count(*), min(slot_id), max(slot_id), max(updated_at), max(last_checked),
+               total(current_rank), total(slot_id * current_rank)
+        FROM slot_status
+        WHERE {where}
+    ''', params).fetchone()
+    
+    key = json.dumps([after_slot_id, page_end, fields, response_format, list(summary)])
+    return hashlib.md5(key.encode()).hexdigest()[:16]
+
+def iter_slot_status_rows(conn, fields, after_slot_id, page_end):
+    """페이지 범위의 행을 커서에서 하나씩 딕셔너리로 반환 (slot_id가 NULL인 행이 먼저)"""
+    where, params = slot_status_range(after_slot_id, page_end)
+    cursor = conn.execute(f'''
+        SELECT {', '.join(fields)}
+        FROM slot_status
+        WHERE {where}
+        ORDER BY slot_id
+    ''', params)
+    
+    for row in cursor:
+        yield dict(zip(fields, row))
+
+def stream_json_array(rows):
+    """JSON 배열을 한 행씩 출력"""
+    yield '['
+    for index, row in enumerate(rows):
+        yield (',' if index else '') + json.dumps(row, ensure_ascii=False)
+    yield ']'
+
+def stream_ndjson(rows):
+    """한 줄에 한 행씩 NDJSON 출력"""
+    for row in rows:
+        yield json.dumps(row, ensure_ascii=False) + '\n'
 
 @app.route('/api/slot-status')
 def get_slot_status():
-    """슬롯 상태 조회 API"""
+    """슬롯 상태 조회 API
+    
+    ?after_slot_id=N&limit=M 으로 slot_id 순 페이지 조회 (다음 페이지는 X-Next-After-Slot-Id 헤더),
+    ?fields=a,b 로 필드 선택, ?format=ndjson 으로 줄 단위 스트리밍. ETag/If-None-Match 지원.
+    slot_id가 NULL인 행은 첫 페이지 맨 앞에 limit과 별도로 포함된다.
+    """
+    # 숫자가 아닌 값을 조용히 무시하면 전체 목록이 나가므로 400으로 거절
+    try:
+        after_slot_id = int(request.args['after_slot_id']) if 'after_slot_id' in request.args else None
+        limit = int(request.args['limit']) if 'limit' in request.args else None
+    except ValueError:
+        return jsonify({'success': False, 'error': "after_slot_id와 limit은 정수여야 합니다"}), 400
+    response_format = request.args.get('format', 'json')
+    
+    if request.args.get('fields'):
+        fields = [field.strip() for field in request.args['fields'].split(',') if field.strip()]
+    else:
+        fields = SLOT_STATUS_DEFAULT_FIELDS
+    
+    unknown_fields = [field for field in fields if field not in SLOT_STATUS_FIELDS]
+    if unknown_fields or not fields:
+        return jsonify({'success': False, 'error': f"알 수 없는 필드: {', '.join(unknown_fields)}"}), 400
+    if response_format not in ('json', 'ndjson'):
+        return jsonify({'success': False, 'error': f"지원하지 않는 형식: {response_format}"}), 400
+    if limit is not None and not 1 <= limit <= SLOT_STATUS_MAX_LIMIT:
+        return jsonify({'success': False, 'error': f"limit은 1~{SLOT_STATUS_MAX_LIMIT} 사이여야 합니다"}), 400
+    
     conn = get_db_connection()
-    status_data = conn.execute('''
-        SELECT slot_id, keyword, current_rank, start_rank, last_checked
-        FROM slot_status 
-        ORDER BY slot_id
-    ''').fetchall()
     
-    result = []
-    for row in status_data:
-        result.append({
-            'slot_id': row['slot_id'],
-            'keyword': row['keyword'],
-            'current_rank': row['current_rank'],
-            'start_rank': row['start_rank'],
-            'last_checked': row['last_checked']
-        })
+    # limit이 없으면 끝까지 (페이지 끝을 따로 조회하지 않음)
+    page_end = None
+    if limit:
+        page_end = get_slot_status_page_end(conn, after_slot_id, limit)
+        if page_end is None:
+            page_end = after_slot_id
+    
+    etag = get_slot_status_etag(conn, after_slot_id, page_end, fields, response_format)
+    headers = {'ETag': f'W/"{etag}"', 'Cache-Control': 'no-cache'}
+    
+    if page_end is not None:
+        has_more = conn.execute(
+            'SELECT 1 FROM slot_status WHERE slot_id > ? LIMIT 1', (page_end,)
+        ).fetchone()
+        if has_more:
+            headers['X-Next-After-Slot-Id'] = str(page_end)
     
-    conn.close()
-    return jsonify(result)
+    if request.if_none_match.contains_weak(etag):
+        return Response(status=304, headers=headers)
+    
+    rows = iter_slot_status_rows(conn, fields, after_slot_id, page_end)
+    
+    if response_format == 'ndjson':
+        return Response(stream_ndjson(rows), mimetype='application/x-ndjson', headers=headers)
+    
+    return Response(stream_json_array(rows), mimetype='application/json', headers=headers)
 
 @app.route('/')
 def home():
@@ -312,6 +423,10 @@ if __name__ == '__main__':
     print("http://localhost:3000 으로 접속하세요")
     print("="*60)
     
+    # 차트/상태 조회용 인덱스 (테이블이 있는 경우에만)
+    apply_migrations(RankStorage.open(DB_PATH))
+    install_rollups(RankStorage.open(DB_PATH))
+    
     app.run(host='0.0.0.0', port=3000, debug=True)
 
 
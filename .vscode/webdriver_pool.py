@@ -0,0 +1,360 @@
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+def driver_pid(driver):
+    """드라이버 서비스(chromedriver/geckodriver) 프로세스 ID (브라우저는 그 하위 프로세스)"""
+    service = getattr(driver, 'service', None)
+    process = getattr(service, 'process', None)
+    return getattr(process, 'pid', None)
+
+
+def process_tree_memory_mb(pid):
+    """프로세스와 모든 하위 프로세스의 메모리 사용량 합계 (MB, 확인할 수 없으면 None)"""
+    if psutil is None or pid is None:
+        return None
+
+    try:
+        root = psutil.Process(pid)
+        processes = [root] + root.children(recursive=True)
+    except psutil.Error:
+        return None
+
+    total = 0
+    for process in processes:
+        try:
+            total += process.memory_info().rss
+        except psutil.Error:
+            continue
+    return total / (1024 * 1024)
+
+
+def quit_driver(driver):
+    """드라이버와 브라우저 종료"""
+    driver.quit()
+
+
+def driver_is_alive(driver):
+    """브라우저가 응답하는지 (창이 하나라도 남아 있는지)"""
+    try:
+        return len(driver.window_handles) > 0
+    except Exception:
+        return False
+
+
+def reset_driver(driver, clear_cookies=True):
+    """다음 작업을 위해 쿠키를 정리하고 새 탭 하나만 남김"""
+    if clear_cookies:
+        # Chrome은 CDP로 전체 쿠키 삭제, 그 외에는 마지막으로 연 페이지 도메인의 쿠키만 삭제됨
+        if hasattr(driver, 'execute_cdp_cmd'):
+            driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+        else:
+            driver.delete_all_cookies()
+
+    old_handles = driver.window_handles
+    driver.switch_to.new_window('tab')
+    new_handle = driver.current_window_handle
+
+    for handle in old_handles:
+        driver.switch_to.window(handle)
+        driver.close()
+    driver.switch_to.window(new_handle)
+
+
+class PooledDriver:
+    """풀에 들어 있는 브라우저 하나와 사용 기록"""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.jobs = 0
+        self.created_at = time.time()
+
+
+class WebDriverPool:
+    """미리 띄워 둔 브라우저를 작업마다 빌려 주는 풀
+
+    factory()로 브라우저를 size개 만들어 두고, lease()로 하나를 빌려 쓴 뒤 돌려받으면
+    새 탭만 남기고 쿠키를 정리해 다음 작업에 재사용한다. max_jobs번 사용했거나
+    브라우저 프로세스 메모리가 max_memory_mb를 넘으면 종료하고 새로 만든다.
+    quit/reset/is_alive/pid를 바꾸면 WebDriver가 아닌 브라우저 프로세스에도 쓸 수 있다.
+    """
+
+    def __init__(self, factory, size=1, max_jobs=50, max_memory_mb=1500, quit=quit_driver,
+                 reset=reset_driver, is_alive=driver_is_alive, pid=driver_pid, log=print):
+        self.factory = factory
+        self.size = max(1, size)
+        self.max_jobs = max_jobs
+        self.max_memory_mb = max_memory_mb
+        self.quit = quit
+        self.reset = reset
+        self.is_alive = is_alive
+        self.pid = pid
+        self.log = log
+
+        self.idle = queue.Queue()
+        self.lock = threading.Lock()
+        self.started = False
+        self.closed = False
+        self.users = 0  # get_pool로 이 풀을 받아 간 사용자 수
+        self.stats = {'cold_starts': 0, 'jobs': 0, 'recycled': 0, 'cold_start_seconds': 0.0, 'wait_seconds': 0.0}
+
+    def create(self):
+        """브라우저 하나 생성 (소요 시간 기록)"""
+        start_time = time.perf_counter()
+        pooled = PooledDriver(self.factory())
+        elapsed = time.perf_counter() - start_time
+
+        with self.lock:
+            self.stats['cold_starts'] += 1
+            self.stats['cold_start_seconds'] += elapsed
+        return pooled
+
+    def _create_into_pool(self):
+        """브라우저를 만들어 대기열에 추가 (실패하면 잠시 후 다시 시도)"""
+        for attempt in range(3):
+            if self.closed:
+                return
+            try:
+                pooled = self.create()
+            except Exception as e:
+                self.log(f"브라우저 생성 실패 ({attempt + 1}/3): {e}")
+                time.sleep(2)
+                continue
+
+            # 생성하는 동안 풀이 닫혔으면 바로 종료
+            if self.closed:
+                self.quit(pooled.driver)
+            else:
+                self.idle.put(pooled)
+            return
+
+        # 풀 크기가 줄어든 채로 남지 않도록 빈 자리 표시
+        self.idle.put(None)
+
+    def start(self):
+        """브라우저 size개를 동시에 미리 실행"""
+        with self.lock:
+            if self.started:
+                return
+            self.started = True
+            self.closed = False
+
+        threads = [threading.Thread(target=self._create_into_pool, daemon=True) for _ in range(self.size)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.log(f"브라우저 풀 준비: {self.idle.qsize()}개")
+
+    def memory_mb(self, pooled):
+        """브라우저 프로세스 메모리 (MB)"""
+        return process_tree_memory_mb(self.pid(pooled.driver) if self.pid else None)
+
+    def discard(self, pooled, reason):
+        """브라우저 종료 후 새 브라우저를 백그라운드에서 생성"""
+        with self.lock:
+            self.stats['recycled'] += 1
+        self.log(f"브라우저 교체: {reason}")
+
+        try:
+            self.quit(pooled.driver)
+        except Exception as e:
+            self.log(f"브라우저 종료 오류: {e}")
+
+        threading.Thread(target=self._create_into_pool, daemon=True).start()
+
+    def acquire(self, timeout=None):
+        """브라우저 하나 빌리기 (응답이 없는 브라우저는 새로 만들어 반환)"""
+        self.start()
+
+        start_time = time.perf_counter()
+        pooled = self.idle.get(timeout=timeout)
+        with self.lock:
+            self.stats['wait_seconds'] += time.perf_counter() - start_time
+
+        if pooled is None or not self.is_alive(pooled.driver):
+            if pooled is not None:
+                self.log("응답 없는 브라우저 교체")
+                try:
+                    self.quit(pooled.driver)
+                except Exception:
+                    pass
+            try:
+                pooled = self.create()
+            except Exception:
+                # 꺼낸 자리를 돌려놓아 풀 크기가 줄지 않게 함 (다음 acquire에서 다시 생성 시도)
+                self.idle.put(None)
+                raise
+
+        return pooled
+
+    def release(self, pooled, broken=False):
+        """사용이 끝난 브라우저 반환 (교체 조건이면 새로 만들고, 아니면 정리 후 재사용)"""
+        pooled.jobs += 1
+        with self.lock:
+            self.stats['jobs'] += 1
+
+        if self.closed:
+            self.quit(pooled.driver)
+            return
+
+        if broken or not self.is_alive(pooled.driver):
+            self.discard(pooled, "브라우저 오류")
+            return
+
+        if self.max_jobs and pooled.jobs >= self.max_jobs:
+            self.discard(pooled, f"작업 {pooled.jobs}회 사용")
+            return
+
+        memory = self.memory_mb(pooled) if self.max_memory_mb else None
+        if memory is not None and memory > self.max_memory_mb:
+            self.discard(pooled, f"메모리 {memory:.0f}MB")
+            return
+
+        if self.reset:
+            try:
+                self.reset(pooled.driver)
+            except Exception as e:
+                self.discard(pooled, f"탭 정리 실패: {e}")
+                return
+
+        self.idle.put(pooled)
+
+    @contextmanager
+    def lease(self, timeout=None):
+        """작업 하나 동안 브라우저 빌리기
+
+        with pool.lease() as driver:
+            driver.get(url)
+        """
+        pooled = self.acquire(timeout=timeout)
+        broken = False
+        try:
+            yield pooled.driver
+        except Exception:
+            # 작업 예외 후 브라우저가 응답하지 않으면 교체
+            broken = not self.is_alive(pooled.driver)
+            raise
+        finally:
+            self.release(pooled, broken=broken)
+
+    def summary(self):
+        """로그용 한 줄 요약"""
+        with self.lock:
+            stats = dict(self.stats)
+        average = stats['cold_start_seconds'] / stats['cold_starts'] if stats['cold_starts'] else 0.0
+        return (f"브라우저 풀: 작업 {stats['jobs']}건, 브라우저 생성 {stats['cold_starts']}회 "
+                f"(평균 {average:.1f}초), 교체 {stats['recycled']}회, 대기 {stats['wait_seconds']:.1f}초")
+
+    def close(self):
+        """대기 중인 브라우저 모두 종료 (사용 중인 브라우저는 반환될 때 종료)"""
+        self.closed = True
+        with self.lock:
+            self.started = False
+
+        while True:
+            try:
+                pooled = self.idle.get_nowait()
+            except queue.Empty:
+                break
+            if pooled is not None:
+                try:
+                    self.quit(pooled.driver)
+                except Exception as e:
+                    self.log(f"브라우저 종료 오류: {e}")
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(name, factory, **kwargs):
+    """이름별로 프로세스에서 하나의 풀만 생성해 재사용 (닫힌 풀은 새로 생성)
+
+    받아 간 쪽은 다 쓴 뒤 pool.close() 대신 release_pool(pool)을 호출한다.
+    같은 풀을 쓰는 다른 인스턴스가 남아 있으면 닫지 않는다.
+    """
+    with _pools_lock:
+        pool = _pools.get(name)
+        if pool is None or pool.closed:
+            pool = WebDriverPool(factory, **kwargs)
+            _pools[name] = pool
+        pool.users += 1
+        return pool
+
+
+def release_pool(pool):
+    """get_pool로 받은 풀 반납 (마지막 사용자가 반납하면 풀 종료)"""
+    with _pools_lock:
+        pool.users = max(0, pool.users - 1)
+        if pool.users:
+            return
+        for name, registered in list(_pools.items()):
+            if registered is pool:
+                del _pools[name]
+    pool.close()
+
+
+def run_with_pooled_driver(checker, function, *args, **kwargs):
+    """checker.driver_pool에서 브라우저를 빌려 checker.driver로 설정하고 function 실행"""
+    with checker.driver_pool.lease() as driver:
+        checker.driver = driver
+        try:
+            return function(*args, **kwargs)
+        finally:
+            checker.driver = None
+
+
+def close_pools():
+    """생성한 모든 풀 종료"""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
+
+
+def main():
+    """가짜 브라우저(생성 1초)로 풀 재사용과 교체 확인"""
+    print("WebDriver Pool Check")
+    print("=" * 50)
+
+    class FakeDriver:
+        def __init__(self):
+            time.sleep(1.0)  # 브라우저 실행 시간
+            self.window_handles = ['tab-1']
+
+        def quit(self):
+            self.window_handles = []
+
+    pool = WebDriverPool(FakeDriver, size=2, max_jobs=5, reset=None, pid=None)
+
+    start_time = time.perf_counter()
+    pool.start()
+    print(f"미리 실행: {time.perf_counter() - start_time:.2f}초")
+
+    def job(index):
+        with pool.lease() as driver:
+            time.sleep(0.05)  # 검색 작업
+
+    start_time = time.perf_counter()
+    threads = [threading.Thread(target=job, args=(index,)) for index in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    print(f"작업 20건: {time.perf_counter() - start_time:.2f}초 (작업마다 새로 실행하면 약 {20 * 1.05 / 2:.1f}초)")
+
+    print(pool.summary())
+    pool.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -10,14 +10,21 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.keys import Keys
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import TimeoutException
 from webdriver_manager.chrome import ChromeDriverManager
 from pathlib import Path
+from webdriver_pool import get_pool, release_pool, run_with_pooled_driver
+from dom_product_extractor import extract_products
 
 class WhaleBrowserAutomation:
-    def __init__(self, profile_path=None):
+    def __init__(self, profile_path=None, pool_size=0, max_jobs=50, max_memory_mb=1500):
         self.profile_path = profile_path or self.get_whale_profile_path()
         self.driver = None
+        self.driver_pool = None
+        if pool_size:
+            # 브라우저를 미리 띄워 두고 키워드마다 정리된 새 탭으로 재사용
+            self.driver_pool = get_pool(self.__class__.__name__, self.create_whale_driver, size=pool_size,
+                                        max_jobs=max_jobs, max_memory_mb=max_memory_mb)
         
     def get_whale_profile_path(self):
         """Whale 프로파일 경로 생성"""
@@ -27,6 +34,15 @@ class WhaleBrowserAutomation:
     
     def setup_whale_driver(self):
         """Whale 브라우저 드라이버 설정"""
+        try:
+            self.driver = self.create_whale_driver()
+            return True
+        except Exception as e:
+            print(f"Driver setup failed: {e}")
+            return False
+    
+    def create_whale_driver(self):
+        """Whale 브라우저 드라이버 생성 (실패하면 예외)"""
         chrome_options = Options()
         
         # 임시로 일반 Chrome으로 설정 (실제 Whale 드라이버 사용시 변경 필요)
@@ -39,15 +55,11 @@ class WhaleBrowserAutomation:
         # 헤드리스 모드 해제 (디버깅용)
         # chrome_options.add_argument('--headless')
         
-        try:
-            # ChromeDriver 자동 설치 및 설정
-            service = Service(ChromeDriverManager().install())
-            self.driver = webdriver.Chrome(service=service, options=chrome_options)
-            self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-            return True
-        except Exception as e:
-            print(f"Driver setup failed: {e}")
-            return False
+        # ChromeDriver 자동 설치 및 설정
+        service = Service(ChromeDriverManager().install())
+        driver = webdriver.Chrome(service=service, options=chrome_options)
+        driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        return driver
     
     def search_coupang_product(self, keyword, target_url):
         """쿠팡에서 상품 검색하고 순위 확인"""
@@ -110,19 +122,10 @@ class WhaleBrowserAutomation:
             if not product_id:
                 return None
             
-            # 상품 리스트에서 해당 ID 찾기
-            product_items = self.driver.find_elements(By.CSS_SELECTOR, "li.search-product")
-            
-            for index, item in enumerate(product_items, 1):
-                try:
-                    link_element = item.find_element(By.CSS_SELECTOR, "a.search-product-link")
-                    href = link_element.get_attribute("href")
-                    
-                    if product_id in href:
-                        return index
-                        
-                except NoSuchElementException:
-                    continue
+            # 상품 리스트에서 해당 ID 찾기 (카드 전체를 스크립트 한 번으로 추출)
+            for product in extract_products(self.driver):
+                if product_id == product['product_id'] or product_id in product['url']:
+                    return product['rank']
             
             return None
             
@@ -141,13 +144,16 @@ class WhaleBrowserAutomation:
     
     def close_browser(self):
         """브라우저 종료"""
+        if self.driver_pool is not None:
+            # 빌린 브라우저는 풀에 반환되므로 여기서 종료하지 않음
+            return
         if self.driver:
             self.driver.quit()
             self.driver = None
             
 class CoupanRankCheckerWithWhale:
     def __init__(self):
-        self.automation = WhaleBrowserAutomation()
+        self.automation = WhaleBrowserAutomation(pool_size=1)
         self.setup_files()
         
     def setup_files(self):
@@ -171,22 +177,21 @@ class CoupanRankCheckerWithWhale:
         print(f"Checking rank for: {keyword}")
         print(f"Target URL: {target_url}")
         
+        if self.automation.driver_pool is not None:
+            # 미리 띄워 둔 브라우저를 빌려 검색 (키워드마다 브라우저를 새로 띄우지 않음)
+            try:
+                return run_with_pooled_driver(self.automation, self.search_rank, keyword, target_url)
+            except Exception as e:
+                print(f"Rank check error: {e}")
+                return None
+        
         # Whale 브라우저 설정
         if not self.automation.setup_whale_driver():
             print("Failed to setup browser driver")
             return None
         
         try:
-            # 검색 및 순위 확인
-            rank = self.automation.search_coupang_product(keyword, target_url)
-            
-            if rank:
-                print(f"✅ Product found at rank: {rank}")
-            else:
-                print(f"❌ Product not found in search results")
-                rank = 0  # 검색되지 않음
-            
-            return rank
+            return self.search_rank(keyword, target_url)
             
         except Exception as e:
             print(f"Rank check error: {e}")
@@ -195,6 +200,26 @@ class CoupanRankCheckerWithWhale:
             # 브라우저 종료
             self.automation.close_browser()
     
+    def search_rank(self, keyword, target_url):
+        """검색 후 순위 반환 (검색되지 않으면 0)"""
+        rank = self.automation.search_coupang_product(keyword, target_url)
+        
+        if rank:
+            print(f"✅ Product found at rank: {rank}")
+        else:
+            print(f"❌ Product not found in search results")
+            rank = 0  # 검색되지 않음
+        
+        return rank
+    
+    def close(self):
+        """브라우저 풀 정리"""
+        if self.automation.driver_pool is not None:
+            print(self.automation.driver_pool.summary())
+            # 같은 클래스의 다른 인스턴스가 쓰는 중이면 풀은 유지됨
+            release_pool(self.automation.driver_pool)
+            self.automation.driver_pool = None
+    
     def simulate_prevention_bypass(self):
         """쿠팡 봇 탐지 우회 시뮬레이션"""
         # 실제 구현에서는 다음과 같은 방법들을 사용할 수 있습니다:
@@ -231,8 +256,11 @@ def main():
         'url': 'https://www.coupang.com/vp/products/8473798698?itemId=24519876305&vendorItemId=89369126187'
     }
     
-    rank = checker.check_rank(test_keyword)
-    print(f"Final result: Rank {rank}")
+    try:
+        rank = checker.check_rank(test_keyword)
+        print(f"Final result: Rank {rank}")
+    finally:
+        checker.close()
 
 if __name__ == "__main__":
     main()
@@ -10,11 +10,14 @@ import json
 from datetime import datetime
 import requests
 from urllib.parse import quote
-import re
+from search_result_parser import parse_search_results
+from page_load_profile import apply_chrome_profile, load_search_page
+from browser_wait import BrowserWaiter
 
 class WhaleCoupangRankChecker:
     def __init__(self):
         self.driver = None
+        self.waiter = BrowserWaiter()
         self.setup_driver()
         
     def setup_driver(self):
@@ -52,6 +55,9 @@ class WhaleCoupangRankChecker:
         chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
         chrome_options.add_experimental_option('useAutomationExtension', False)
         
+        # DOMContentLoaded에서 바로 반환, 이미지/동영상/광고 요청 차단
+        apply_chrome_profile(chrome_options)
+        
         try:
             service = Service(ChromeDriverManager().install())
             self.driver = webdriver.Chrome(service=service, options=chrome_options)
@@ -98,9 +104,9 @@ class WhaleCoupangRankChecker:
             search_url = f"https://www.coupang.com/np/search?q={quote(keyword)}"
             print(f"Direct URL: {search_url}")
             
-            # 페이지 로드
-            self.driver.get(search_url)
-            time.sleep(5)  # 페이지 로딩 대기
+            # 페이지 로드 (불필요한 리소스 차단, 상품 목록이 나타날 때까지 대기)
+            if not load_search_page(self.driver, search_url, self.waiter):
+                print("Product list not found within timeout")
             
             # 페이지 제목 확인
             page_title = self.driver.title
@@ -124,82 +130,9 @@ class WhaleCoupangRankChecker:
     
     def extract_product_info(self, page_source):
         """검색 결과에서 상품 정보 추출"""
-        products = []
-        
         try:
-            # 상품 링크 패턴
-            product_pattern = r'/products/(\d+)'
-            product_ids = re.findall(product_pattern, page_source)
-            
-            # 상품 제목 패턴 (여러 패턴 시도)
-            title_patterns = [
-                r'<dt class="name">.*?<a[^>]*>([^<]+)</a>',
-                r'<a[^>]*class="[^"]*name[^"]*"[^>]*>([^<]+)</a>',
-                r'data-product-id="[^"]*"[^>]*>([^<]+)</a>',
-                r'<span class="name">([^<]+)</span>',
-                r'<div class="name">([^<]+)</div>'
-            ]
-            
-            titles = []
-            for pattern in title_patterns:
-                found_titles = re.findall(pattern, page_source, re.DOTALL)
-                if found_titles:
-                    titles = found_titles
-                    print(f"Found {len(titles)} titles with pattern: {pattern}")
-                    break
-            
-            # 가격 패턴 (여러 패턴 시도)
-            price_patterns = [
-                r'<strong class="price-value">([^<]+)</strong>',
-                r'<span class="price-value">([^<]+)</span>',
-                r'data-price="([^"]*)"',
-                r'<em class="price-value">([^<]+)</em>',
-                r'<div class="price-value">([^<]+)</div>'
-            ]
-            
-            prices = []
-            for pattern in price_patterns:
-                found_prices = re.findall(pattern, page_source)
-                if found_prices:
-                    prices = found_prices
-                    print(f"Found {len(prices)} prices with pattern: {pattern}")
-                    break
-            
-            # 리뷰 수 패턴
-            review_patterns = [
-                r'<span class="rating-total-count">\(([^)]+)\)</span>',
-                r'<em class="rating-total-count">\(([^)]+)\)</em>',
-                r'<div class="rating-total-count">\(([^)]+)\)</div>'
-            ]
-            
-            reviews = []
-            for pattern in review_patterns:
-                found_reviews = re.findall(pattern, page_source)
-                if found_reviews:
-                    reviews = found_reviews
-                    print(f"Found {len(reviews)} reviews with pattern: {pattern}")
-                    break
-            
-            print(f"Found {len(product_ids)} product IDs")
-            print(f"Found {len(titles)} titles")
-            print(f"Found {len(prices)} prices")
-            print(f"Found {len(reviews)} reviews")
-            
-            # 상품 정보 조합
-            max_items = min(len(product_ids), len(titles), len(prices))
-            
-            for i in range(max_items):
-                product_info = {
-                    'rank': i + 1,
-                    'product_id': product_ids[i],
-                    'title': titles[i].strip() if i < len(titles) else 'N/A',
-                    'price': prices[i].strip() if i < len(prices) else 'N/A',
-                    'reviews': reviews[i].strip() if i < len(reviews) else '0',
-                    'timestamp': datetime.now().isoformat()
-                }
-                
-                products.append(product_info)
-            
+            products = parse_search_results(page_source)
+            print(f"Found {len(products)} products")
             return products
             
         except Exception as e:
@@ -253,6 +186,10 @@ class WhaleCoupangRankChecker:
     
     def close(self):
         """브라우저 종료"""
+        # 페이지 대기 시간 통계
+        for line in self.waiter.stats.summary():
+            print(f"Wait {line}")
+        
         if self.driver:
             self.driver.quit()
             print("Whale browser closed")
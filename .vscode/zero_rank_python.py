@@ -8,6 +8,26 @@ from datetime import datetime
 import configparser
 import random
 from pathlib import Path
+from rank_batch_engine import RankBatchEngine
+from rank_result_sink import RankResultSink
+from webdriver_pool import close_pools, get_pool
+
+class ZeroRankWorker:
+    """워커별 Whale 프로파일을 갖는 순위 체크 작업자"""
+    
+    def __init__(self, checker, index, exclusive=False):
+        self.checker = checker
+        self.index = index
+        self.exclusive = exclusive
+        self.profile_path = checker.get_whale_profile_path(index)
+    
+    def check(self, keyword_data):
+        """키워드 하나의 순위 체크"""
+        if self.exclusive:
+            # 워커가 하나뿐이면 키워드마다 IP 변경 (브라우저는 풀에서 계속 재사용)
+            self.checker.prepare_next_search()
+        
+        return self.checker.search_with_whale(keyword_data, self.profile_path)
 
 class ZeroRankChecker:
     def __init__(self):
@@ -18,6 +38,9 @@ class ZeroRankChecker:
         self.api_base_url = self.config.get('api', 'base_url', fallback='http://localhost:8000')
         self.login_id = self.config.get('login', 'id')
         
+        # 동시 워커 수
+        self.worker_count = int(self.config.get('worker', 'count', fallback='1'))
+        
         # 파일 경로 설정
         self.log_dir = Path("log")
         self.log_dir.mkdir(exist_ok=True)
@@ -25,6 +48,16 @@ class ZeroRankChecker:
         # 로그 파일
         self.log_file = self.log_dir / f"log_{datetime.now().strftime('%m%d')}.txt"
         
+        # 결과 전송 버퍼 (모아서 일괄 전송, 서버 장애 시 저널 보관)
+        self.result_sink = RankResultSink(
+            self.api_base_url,
+            self.login_id,
+            journal_path=self.log_dir / "pending_results.jsonl",
+            batch_size=int(self.config.get('result', 'batch_size', fallback='50')),
+            flush_interval=float(self.config.get('result', 'flush_interval', fallback='5')),
+            log=self.log
+        )
+        
         # 초기화 로그
         self.log("# Zero Rank Checker Python Version Starting...")
         self.log("# PC 키워드 작업 추가")
@@ -40,6 +73,7 @@ class ZeroRankChecker:
             self.config['login'] = {'id': 'pcworker1'}
             self.config['delay'] = {'app_reload': '10000'}
             self.config['api'] = {'base_url': 'http://localhost:8000'}
+            self.config['worker'] = {'count': '1'}
             
             with open(config_file, 'w') as f:
                 self.config.write(f)
@@ -194,27 +228,20 @@ class ZeroRankChecker:
         except Exception as e:
             self.log(f"Data toggle error: {e}")
     
-    def run_whale_browser_search(self, keyword_data):
-        """Whale 브라우저로 검색 실행"""
+    def search_with_whale(self, keyword_data, whale_profile=None):
+        """Whale 브라우저로 검색하고 순위 반환 (결과 전송은 호출 측에서)"""
         keyword = keyword_data.get('search', '')
         target_url = keyword_data.get('url', '')
-        keyword_id = keyword_data.get('id')
         
         self.log(f"Processing keyword: {keyword}")
         
-        try:
-            # Whale 프로파일 경로
-            whale_profile = self.get_whale_profile_path()
-            
-            # Whale 브라우저 실행
-            whale_cmd = f'whale.exe --user-data-dir="{whale_profile}" --disable-web-security --disable-features=VizDisplayCompositor https://www.coupang.com'
-            
-            self.log("Run whale...")
-            
-            # 브라우저 시작
-            browser_process = subprocess.Popen(whale_cmd, shell=True)
-            time.sleep(5)  # 브라우저 로딩 대기
-            
+        # Whale 프로파일 경로
+        whale_profile = whale_profile or self.get_whale_profile_path()
+        
+        # 프로파일별로 띄워 둔 Whale 브라우저 사용 (없거나 종료되었으면 새로 실행)
+        pool = self.get_whale_pool(whale_profile)
+        
+        with pool.lease():
             # 페이지 로드 확인
             self.log("Get current page")
             time.sleep(2)
@@ -227,13 +254,67 @@ class ZeroRankChecker:
             rank = self.check_product_rank(keyword, target_url)
             
             self.log(f"Keyword {keyword} rank check completed")
+            self.log("Close current tab")
             
-            # 결과 전송
-            self.send_rank_result(keyword_id, rank)
+            return rank
+    
+    def launch_whale(self, whale_profile):
+        """Whale 브라우저 실행 (로딩 대기 후 프로세스 반환)"""
+        # 셸을 거치지 않고 직접 실행해야 pid/terminate가 cmd.exe가 아닌 whale.exe를 가리킴
+        whale_cmd = [
+            'whale.exe',
+            f'--user-data-dir={whale_profile}',
+            '--disable-web-security',
+            '--disable-features=VizDisplayCompositor',
+            'https://www.coupang.com'
+        ]
+        
+        self.log("Run whale...")
+        browser_process = subprocess.Popen(whale_cmd)
+        time.sleep(5)  # 브라우저 로딩 대기
+        return browser_process
+    
+    def quit_whale(self, browser_process):
+        """풀에서 교체하는 Whale 브라우저와 하위 프로세스(렌더러 등) 종료"""
+        try:
+            children = psutil.Process(browser_process.pid).children(recursive=True)
+        except psutil.Error:
+            children = []
+        
+        for proc in children:
+            try:
+                proc.terminate()
+            except psutil.Error:
+                pass
+        browser_process.terminate()
+        
+        try:
+            browser_process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            browser_process.kill()
+    
+    def get_whale_pool(self, whale_profile):
+        """프로파일별 Whale 브라우저 풀 (키워드마다 브라우저를 새로 띄우지 않고 재사용, main_loop 끝에서 close_pools로 종료)"""
+        return get_pool(
+            f"whale:{whale_profile}",
+            lambda: self.launch_whale(whale_profile),
+            size=1,
+            max_jobs=int(self.config.get('browser', 'max_jobs', fallback='30')),
+            max_memory_mb=int(self.config.get('browser', 'max_memory_mb', fallback='1500')),
+            quit=self.quit_whale,
+            reset=None,
+            is_alive=lambda process: process.poll() is None,
+            pid=lambda process: process.pid,
+            log=self.log
+        )
+    
+    def run_whale_browser_search(self, keyword_data):
+        """Whale 브라우저로 검색 실행"""
+        try:
+            rank = self.search_with_whale(keyword_data)
             
-            # 브라우저 종료
-            browser_process.terminate()
-            self.log("Close current tab")
+            # 결과 전송
+            self.send_rank_result(keyword_data.get('id'), rank)
             
             return rank
             
@@ -241,10 +322,11 @@ class ZeroRankChecker:
             self.log(f"Whale browser error: {e}")
             return None
     
-    def get_whale_profile_path(self):
-        """Whale 프로파일 경로 반환"""
+    def get_whale_profile_path(self, worker_index=0):
+        """Whale 프로파일 경로 반환 (워커마다 별도 프로파일)"""
         # 기본 프로파일 디렉토리
-        profile_dir = Path("WhaleProfileCp")
+        profile_name = "WhaleProfileCp" if worker_index == 0 else f"WhaleProfileCp{worker_index + 1}"
+        profile_dir = Path(profile_name)
         profile_dir.mkdir(exist_ok=True)
         return str(profile_dir)
     
@@ -271,31 +353,52 @@ class ZeroRankChecker:
             return None
     
     def send_rank_result(self, keyword_id, rank):
-        """순위 결과 서버에 전송"""
+        """순위 결과 서버에 전송 (버퍼에 추가, 일괄 전송)"""
         try:
-            url = f"{self.api_base_url}/api/rank-checker/result"
+            self.result_sink.add(keyword_id, rank)
             
-            data = {
-                'keyword_id': keyword_id,
-                'rank': rank or 0,
-                'timestamp': datetime.now().isoformat(),
-                'worker_id': self.login_id
-            }
-            
-            response = requests.post(url, json=data, timeout=30)
-            
-            if response.status_code == 200:
-                self.log("Rank result sent successfully")
-            else:
-                self.log(f"Send result failed: {response.status_code}")
-                
         except Exception as e:
             self.log(f"Send result error: {e}")
     
+    def prepare_next_search(self):
+        """다음 검색 전 IP 변경, 지연 (Whale은 종료하지 않고 풀에서 재사용, 교체는 풀이 담당)"""
+        # IP 변경 시도
+        self.log("IP 변경 시도...")
+        self.change_ip_via_adb()
+        
+        # 대기 시간
+        self.log("코든 검색 작업이 너무 빨리 진행되어 지연")
+        sleep_time = int(self.config.get('delay', 'app_reload', fallback='10'))
+        self.log(f"{sleep_time}초 후 다음 작업...")
+        
+        time.sleep(sleep_time)
+    
+    def create_batch_engine(self):
+        """워커 풀 배치 엔진 생성"""
+        exclusive = self.worker_count == 1
+        
+        # 워커가 여러 개면 작업 간 지연은 워커별로 적용
+        job_delay = 0 if exclusive else int(self.config.get('delay', 'app_reload', fallback='10'))
+        
+        return RankBatchEngine(
+            worker_factory=lambda index: ZeroRankWorker(self, index, exclusive=exclusive),
+            submit_result=lambda keyword_data, rank: self.send_rank_result(keyword_data.get('id'), rank),
+            num_workers=self.worker_count,
+            job_delay=job_delay,
+            log=self.log
+        )
+    
     def main_loop(self):
         """메인 실행 루프"""
         self.log("# Zero Rank Checker Main Loop Starting")
+        self.log(f"워커 수: {self.worker_count}")
+        
+        # 이전 실행에서 남은 Whale 정리 (이후로는 풀이 띄운 브라우저를 계속 재사용)
+        self.log("Kill Whale...")
+        self.kill_process("whale.exe")
         
+        engine = self.create_batch_engine()
+        self.result_sink.start()
         cycle_count = 0
         
         while True:
@@ -311,30 +414,23 @@ class ZeroRankChecker:
                     time.sleep(10)
                     continue
                 
-                # 키워드별 처리
-                for i, keyword_data in enumerate(keywords):
-                    self.log(f"{i+1}번째 검색 시작... {i+1}/{len(keywords)}")
-                    
-                    # Whale 브라우저 종료
-                    self.log("Kill Whale...")
-                    self.kill_process("whale.exe")
-                    
-                    # IP 변경 시도
+                self.log(f"{len(keywords)}개 키워드 검색 시작")
+                
+                if self.worker_count > 1:
+                    # IP 변경은 모든 워커에 영향을 주므로 사이클마다 한 번
                     self.log("IP 변경 시도...")
                     self.change_ip_via_adb()
-                    
-                    # 대기 시간
-                    self.log("코든 검색 작업이 너무 빨리 진행되어 지연")
-                    sleep_time = int(self.config.get('delay', 'app_reload', fallback='10'))
-                    self.log(f"{sleep_time}초 후 다음 작업... {i+1}/{len(keywords)}")
-                    
-                    time.sleep(sleep_time)
-                    
-                    # 순위 체크 실행
-                    ranks = self.run_whale_browser_search(keyword_data)
-                    
-                    if ranks is None:
-                        self.log(f"No 데이터 전송할 게시료 있음 계속 간행")
+                
+                # 워커 풀로 키워드 처리
+                submitted = engine.run_batch(keywords)
+                
+                if len(submitted) < len(keywords):
+                    self.log(f"No 데이터 전송할 게시료 있음 계속 간행 ({len(keywords) - len(submitted)}건 실패)")
+                
+                engine.log_stats()
+                
+                # 사이클 결과는 대기 전에 바로 전송
+                self.result_sink.flush()
                 
                 self.log("모든 검색 작업 완료. 10초 대기...")
                 time.sleep(10)
@@ -345,6 +441,10 @@ class ZeroRankChecker:
             except Exception as e:
                 self.log(f"Main loop error: {e}")
                 time.sleep(5)
+        
+        engine.close()
+        close_pools()
+        self.result_sink.close()
 
 def main():
     """메인 실행 함수"""